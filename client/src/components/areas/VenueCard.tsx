@@ -14,7 +14,7 @@ const VenueCard: FC<AreaCardProps> = ({ id, title, priceRange, image, images, de
   const displayImage = useMemo(() => {
     if (Array.isArray(images) && images.length > 0) {
       if (typeof images[0] === 'object' && images[0] !== null && 'area_image' in images[0]) {
-        return images[0].area_image;
+        return images[0].thumbnail || images[0].area_image;
       }
     }
     return image;
@@ -118,6 +118,7 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
             price: item.price,
             image: item.image,
             image_mime: item.image_mime,
+            image_url: item.image_url,
             category_id: item.category_id,
             category_name: item.category_name,
             quantity: item.quantity
@@ -350,7 +351,7 @@ const OrderFoodModal: FC<OrderFoodModalProps> = ({ bookingId, isOpen, onClose })
                                                             >
                                                                 <div className="relative">
                                                                     <img
-                                                                        src={`data:${item.image_mime};base64,${item.image}`}
+                                                                        src={item.image_url || `data:${item.image_mime};base64,${item.image}`}
                                                                         alt={item.name}
                                                                         className="w-full h-36 object-cover"
                                                                     />
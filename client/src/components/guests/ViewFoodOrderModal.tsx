@@ -20,26 +20,23 @@ const ViewFoodOrderModal: FC<ViewFoodOrderModalProps> = ({ orderId, visible, onC
 
     const order: FoodOrder = data?.data?.find((o: FoodOrder) => o.order_id === orderId);
 
-    const getItemImageData = (item: FoodItem) => {
+    const getItemImageSrc = (item: FoodItem) => {
+        if (item.image_url) {
+            return item.image_url;
+        }
         if (item.image && item.image.trim() !== '') {
-            return {
-                image: item.image,
-                image_mime: item.image_mime || 'image/jpeg'
-            };
+            return `data:${item.image_mime || 'image/jpeg'};base64,${item.image}`;
         }
 
         // Otherwise, try to find it in the food data
         if (foodData?.data) {
             const foodItem = foodData.data.find((food: FoodItem) => food.item_id === item.item_id);
-            if (foodItem && foodItem.image) {
-                return {
-                    image: foodItem.image,
-                    image_mime: foodItem.image_mime || 'image/jpeg'
-                };
+            if (foodItem && foodItem.image_url) {
+                return foodItem.image_url;
             }
         }
 
-        return { image: null, image_mime: null };
+        return null;
     };
 
     const formatDate = (dateString: string) => {
@@ -141,12 +138,12 @@ const ViewFoodOrderModal: FC<ViewFoodOrderModalProps> = ({ orderId, visible, onC
                                     <h3 className="font-semibold text-gray-700 mb-3">Ordered Items ({order.items.length})</h3>
                                     <div className="space-y-3">
                                         {order.items.map((item, idx) => {
-                                            const imageData = getItemImageData(item);
+                                            const imageSrc = getItemImageSrc(item);
                                             return (
                                                 <div key={idx} className="flex items-center gap-3 p-3 bg-gray-50 rounded-lg">
-                                                    {imageData.image ? (
+                                                    {imageSrc ? (
                                                         <img
-                                                            src={`data:${imageData.image_mime};base64,${imageData.image}`}
+                                                            src={imageSrc}
                                                             alt={item.name}
                                                             className="w-16 h-16 rounded-lg object-cover flex-shrink-0"
                                                             onError={(e) => {
@@ -12,7 +12,7 @@ const RoomCard: FC<RoomCardProps> = ({ id, name, image, images, title, price, de
   const displayImage = useMemo(() => {
     if (Array.isArray(images) && images.length > 0) {
       if (typeof images[0] === 'object' && images[0] !== null && 'room_image' in images[0]) {
-        return images[0].room_image;
+        return images[0].thumbnail || images[0].room_image;
       }
     }
     return image;
@@ -17,8 +17,8 @@ import { useUserContext } from "../contexts/AuthContext";
 import useWebSockets from "../hooks/useWebSockets";
 import SlotNavButton from "../motions/CustomNavbar";
 import { logout } from "../services/Auth";
-import { getGuestDetails, getGuestNotifications, markAllNotificationsAsRead, markNotificationAsRead } from "../services/Guest";
-import { NotificationMessage, webSocketService } from "../services/websockets";
+import { getGuestDetails, getGuestNotifications, getUnreadNotificationCount, markAllNotificationsAsRead, markNotificationAsRead } from "../services/Guest";
+import { FoodOrderStatusChange, NotificationMessage, webSocketService } from "../services/websockets";
 
 interface NotificationType {
   id: string;
@@ -83,6 +83,18 @@ const Navbar: FC = () => {
 
       const currentNotifications = old.notifications || [];
 
+      // Same id means the server upgraded or resurfaced an existing row
+      if (currentNotifications.some((existingNotif: NotificationType) => existingNotif.id === notification.id)) {
+        return {
+          ...old,
+          notifications: [
+            notification,
+            ...currentNotifications.filter((existingNotif: NotificationType) => existingNotif.id !== notification.id)
+          ],
+          unread_count
+        };
+      }
+
       const notificationExists = currentNotifications.some(
         (existingNotif: NotificationType) =>
           existingNotif.id === notification.id ||
@@ -104,6 +116,28 @@ const Navbar: FC = () => {
     setUnreadCount(unread_count);
   };
 
+  const handleFoodOrderStatus = ({ orders }: { orders: FoodOrderStatusChange[] }) => {
+    const statuses = new Map(orders.map((change) => [String(change.order_id), change.status]));
+    let hasNewOrder = false;
+
+    queryClient.setQueryData(['guestFoodOrders'], (old: any) => {
+      if (!old?.data) return old;
+      const known = new Set(old.data.map((order: any) => String(order.order_id)));
+      hasNewOrder = [...statuses.keys()].some((orderId) => !known.has(orderId));
+      return {
+        ...old,
+        data: old.data.map((order: any) =>
+          statuses.has(String(order.order_id)) ? { ...order, status: statuses.get(String(order.order_id)) } : order
+        )
+      };
+    });
+
+    if (hasNewOrder) {
+      queryClient.invalidateQueries({ queryKey: ['guestFoodOrders'] });
+    }
+    queryClient.invalidateQueries({ queryKey: ['foodOrderDetails'] });
+  };
+
   const handleCountUpdate = ({ count }: { count: number }) => {
     queryClient.setQueryData(['guestNotifications'], (old: any) => ({
       ...old,
@@ -139,7 +173,11 @@ const Navbar: FC = () => {
         if (!isWebSocketConnected || !webSocketService.isConnected) {
           webSocketService.connect(userDetails.id.toString());
         }
-        await queryClient.invalidateQueries({ queryKey: ["guestNotifications"] });
+        const { unread_count } = await getUnreadNotificationCount();
+        if (unread_count !== unreadCount) {
+          setUnreadCount(unread_count);
+          await queryClient.invalidateQueries({ queryKey: ["guestNotifications"] });
+        }
       }
       return null;
     },
@@ -154,6 +192,7 @@ const Navbar: FC = () => {
     new_notification: handleNewNotification,
     unread_update: handleCountUpdate,
     initial_count: handleCountUpdate,
+    food_order_status: handleFoodOrderStatus,
   });
 
   useEffect(() => {
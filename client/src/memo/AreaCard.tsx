@@ -20,7 +20,7 @@ export const AreaCard: FC<AreaCardProps> = memo(
     }) => {
         const firstImage =
             Array.isArray(area.images) && area.images.length > 0
-                ? area.images[0].area_image
+                ? area.images[0].thumbnail || area.images[0].area_image
                 : null;
         const areaImageProps = useMemo(
             () => ({
@@ -21,7 +21,7 @@ export const RoomCard: FC<RoomCardProps> = memo(
         // Show the first image from room.images if available, else fallback to a placeholder
         const firstImage =
             Array.isArray(room.images) && room.images.length > 0
-                ? room.images[0].room_image
+                ? room.images[0].thumbnail || room.images[0].room_image
                 : null;
         const roomImageProps = useMemo(() => ({
             src: firstImage,
@@ -13,12 +13,15 @@ import useWebSockets from "../../hooks/useWebSockets";
 import GuestBookingsError from "../../motions/error-fallback/GuestBookingsError";
 import ManageBookingSkeleton from "../../motions/skeletons/ManageBookingSkeleton";
 import { getAllBookings, recordPayment, updateBookingStatus } from "../../services/Admin";
-import { webSocketAdminActives, WebSocketEvent } from "../../services/websockets";
+import { BookingDeltaEvent, webSocketAdminActives, WebSocketEvent } from "../../services/websockets";
 import { BookingResponse } from "../../types/BookingClient";
 import { BookingQuery } from "../../types/BookingsAdmin";
 import { formatDate, getBookingPrice } from "../../utils/formatters";
 import { adminRejectionReasons } from "../../constants/Dropdown";
 
+// Statuses carried by the bookings feed; rows moving into any other status only arrive as `remove`
+const LISTED_STATUSES = ["pending", "reserved", "confirmed", "checked_in", "missed_reservation"];
+
 const ManageBookings: FC = () => {
   const { userDetails } = useUserContext();
 
@@ -38,20 +41,73 @@ const ManageBookings: FC = () => {
     queryFn: () => getAllBookings(currentPage, pageSize, statusFilter),
   });
 
+  const isFeedFilter = statusFilter === "all" || LISTED_STATUSES.includes(statusFilter);
+
+  const applyBookingDeltas = (events: BookingDeltaEvent[]) => {
+    // Hidden-status views (cancelled, checked out, ...) can't be patched from the feed, so refetch them
+    if (!isFeedFilter) {
+      if (events.length) queryClient.invalidateQueries({ queryKey: ["adminBookings"] });
+      return;
+    }
+    queryClient.setQueriesData<BookingQuery>({ queryKey: ["adminBookings"] }, (oldData) => {
+      if (!oldData) return oldData;
+
+      let rows = [...oldData.data];
+      let totalItems = oldData.pagination?.total_items ?? rows.length;
+
+      events.forEach((event) => {
+        const index = rows.findIndex((row) => Number(row.id) === event.booking_id);
+        const matchesFilter = event.op === "upsert" && (statusFilter === "all" || event.booking?.status === statusFilter);
+
+        if (index >= 0 && matchesFilter) {
+          rows[index] = event.booking;
+        } else if (index >= 0) {
+          rows = rows.filter((_, i) => i !== index);
+          totalItems = Math.max(0, totalItems - 1);
+        } else if (matchesFilter) {
+          if (rows.length < pageSize) rows = [...rows, event.booking];
+          totalItems += 1;
+        }
+      });
+
+      return {
+        ...oldData,
+        data: rows,
+        pagination: oldData.pagination && {
+          ...oldData.pagination,
+          total_items: totalItems,
+          total_pages: Math.max(1, Math.ceil(totalItems / pageSize)),
+        },
+      };
+    });
+  };
+
   useWebSockets(webSocketAdminActives, userDetails?.id, {
-    bookings_data_update: (data: WebSocketEvent) => {
-      if (data.type === "bookings_data_update") {
-        queryClient.setQueryData(['adminBookings', currentPage, pageSize], (oldData: BookingQuery | undefined) => ({
-          ...oldData!,
-          data: data.bookings,
-          pagination: {
-            ...oldData?.pagination,
-            total_items: data.count,
-            total_pages: Math.ceil(data.count / pageSize),
-          }
-        }));
+    bookings_delta: (data: WebSocketEvent) => {
+      if (data.type === "bookings_delta") applyBookingDeltas([data]);
+    },
+    bookings_delta_batch: (data: WebSocketEvent) => {
+      if (data.type === "bookings_delta_batch") applyBookingDeltas(data.events);
+    },
+    bookings_snapshot: (data: WebSocketEvent) => {
+      if (data.type !== "bookings_snapshot") return;
+      // The snapshot only holds listed (active) bookings; other filters go back to REST
+      if (!isFeedFilter) {
+        queryClient.invalidateQueries({ queryKey: ["adminBookings"] });
+        return;
       }
-    }
+      const rows = data.bookings.filter((booking) => statusFilter === "all" || booking.status === statusFilter);
+      queryClient.setQueryData<BookingQuery>(["adminBookings", currentPage, pageSize, statusFilter], (oldData) => ({
+        ...oldData,
+        data: rows.slice((currentPage - 1) * pageSize, currentPage * pageSize),
+        pagination: {
+          total_pages: Math.max(1, Math.ceil(rows.length / pageSize)),
+          current_page: currentPage,
+          total_items: rows.length,
+          page_size: pageSize,
+        },
+      }));
+    },
   })
 
   const updateBookingStatusMutation = useMutation({
@@ -90,8 +146,9 @@ const ManageBookings: FC = () => {
       }
     },
     onSuccess: (data) => {
-      queryClient.invalidateQueries({ queryKey: ["adminBookings"] });
+      // Listed booking rows are kept current by the bookings_delta websocket feed
       queryClient.invalidateQueries({ queryKey: ["stats"] });
+      if (!isFeedFilter) queryClient.invalidateQueries({ queryKey: ["adminBookings"] });
 
       const { status } = data;
 
@@ -310,9 +310,9 @@ const GuestFoodOrders = () => {
                                                 {order.items.map((item, itemIndex) => (
                                                     <div key={itemIndex} className="flex justify-between items-center text-sm bg-gray-50 rounded p-2">
                                                         <div className="flex items-center gap-2 flex-1 min-w-0">
-                                                            {item.image && item.image.trim() !== '' ? (
+                                                            {item.image_url || (item.image && item.image.trim() !== '') ? (
                                                                 <img
-                                                                    src={`data:${item.image_mime};base64,${item.image}`}
+                                                                    src={item.image_url || `data:${item.image_mime};base64,${item.image}`}
                                                                     alt={item.name}
                                                                     className="w-8 h-8 rounded object-cover flex-shrink-0"
                                                                     onError={(e) => {
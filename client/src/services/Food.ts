@@ -111,3 +111,18 @@ export const getReviewableFoodOrders = async () => {
     throw error;
   }
 };
+
+export const getFoodOrderReviewSummary = async () => {
+  try {
+    const response = await booking.get("/user/food_order_review_summary", {
+      headers: {
+        "Content-Type": "application/json",
+      },
+      withCredentials: true,
+    });
+    return response.data;
+  } catch (error) {
+    console.error(`Failed to fetch food order review summary: ${error}`);
+    throw error;
+  }
+};
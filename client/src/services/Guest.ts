@@ -99,6 +99,18 @@ export const getGuestNotifications = async (offset: number, limit: number) => {
   }
 };
 
+export const getUnreadNotificationCount = async () => {
+  try {
+    const response = await guest.get("/notifications/unread_count", {
+      withCredentials: true,
+    });
+    return response.data;
+  } catch (error) {
+    console.error(`Failed to fetch unread notification count: ${error}`);
+    throw error;
+  }
+};
+
 export const markNotificationAsRead = async (id: string) => { 
   try {
     const response = await guest.patch(`/notifications/${id}/read`, {}, {
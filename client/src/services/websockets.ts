@@ -8,6 +8,12 @@ export interface NotificationMessage {
   booking_id?: string;
 }
 
+export interface FoodOrderStatusChange {
+  order_id: number;
+  status: string;
+  previous_status: string | null;
+}
+
 export type WebSocketEvent =
   | { type: "initial_count"; count: number }
   | { type: "unread_update"; count: number }
@@ -17,8 +23,20 @@ export type WebSocketEvent =
   | { type: "initial_data"; count: number; bookings: any[] }
   | { type: "bookings_data_update"; count: number; bookings: any[] }
   | { type: "active_count_update"; count: number }
+  | { type: "bookings_delta"; epoch: string; seq: number; op: "upsert" | "remove"; booking_id: number; booking: any | null }
+  | { type: "bookings_delta_batch"; epoch: string; seq: number; events: BookingDeltaEvent[] }
+  | { type: "bookings_snapshot"; epoch: string; seq: number; count: number; bookings: any[] }
+  | { type: "bookings_feed_position"; epoch: string; seq: number }
+  | { type: "food_order_status"; booking_id: number; orders: FoodOrderStatusChange[] }
   | { type: "connection_test"; message: string };
 
+export type BookingDeltaEvent = Extract<WebSocketEvent, { type: "bookings_delta" }>;
+
+interface FeedPosition {
+  epoch: string;
+  seq: number;
+}
+
 export class WebSocketService {
   private socket: WebSocket | null = null;
   private callbacks: Map<string, (data: any) => void> = new Map();
@@ -31,8 +49,10 @@ export class WebSocketService {
   private connecting: boolean = false;
   private reconnectTimer?: NodeJS.Timeout;
   private lastConnectTime: number = 0;
+  private feedPosition: FeedPosition | null = null;
+  private resyncing: boolean = false;
 
-  constructor(public socketPath: string) {
+  constructor(public socketPath: string, private resumable: boolean = false) {
     this.reconnect = this.reconnect.bind(this);
     this.connect = this.connect.bind(this);
     this.handleConnectionError = this.handleConnectionError.bind(this);
@@ -81,11 +101,39 @@ export class WebSocketService {
     this.retries = 0;
     this.startHeartbeat();
     this.send({ type: "authenticate", userId: this.currentUserId });
+
+    // Ask for the deltas missed while disconnected (or the current position on first connect)
+    if (this.resumable) this.resume();
+  }
+
+  private resume() {
+    this.send({
+      type: "resume",
+      epoch: this.feedPosition?.epoch ?? null,
+      last_seq: this.feedPosition?.seq ?? null,
+    });
   }
 
   private handleMessage(event: MessageEvent) {
     try {
       const data: WebSocketEvent = JSON.parse(event.data);
+      if (this.resumable && data.type === "bookings_delta" && this.feedPosition) {
+        const position = this.feedPosition;
+        // Duplicates (already replayed) are dropped
+        if (data.epoch === position.epoch && data.seq <= position.seq) return;
+        // Deltas are numbered by one sequence shared by all server processes and can
+        // arrive out of order; on a gap or new epoch, replay from the last applied one
+        if (this.resyncing) return;
+        if (data.epoch !== position.epoch || data.seq > position.seq + 1) {
+          this.resyncing = true;
+          this.resume();
+          return;
+        }
+      }
+      if (this.resumable && "seq" in data && "epoch" in data) {
+        this.feedPosition = { epoch: data.epoch, seq: data.seq };
+        if (data.type !== "bookings_delta") this.resyncing = false;
+      }
       this.triggerEvent(data.type, data);
     } catch (error) {
       console.error(`WebSocket: Message parsing error: ${error}`);
@@ -202,4 +250,4 @@ export class WebSocketService {
 }
 
 export const webSocketService = new WebSocketService("ws/notifications/");
-export const webSocketAdminActives = new WebSocketService("ws/admin_dashboard/active-bookings/");
+export const webSocketAdminActives = new WebSocketService("ws/admin_dashboard/active-bookings/", true);
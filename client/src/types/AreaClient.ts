@@ -2,6 +2,8 @@
 export interface AreaImage {
     id: number;
     area_image: string;
+    thumbnail?: string;
+    variants?: Record<string, string>;
 }
 
 export interface Area {
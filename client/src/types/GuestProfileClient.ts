@@ -2,8 +2,10 @@ export interface FoodItem {
   item_id: number;
   name: string;
   price: number;
-  image: string;
-  image_mime: string;
+  image?: string;
+  image_mime?: string;
+  image_url?: string | null;
+  image_urls?: Record<string, string> | null;
   quantity: number;
   category_id: number;
   category_name: string;
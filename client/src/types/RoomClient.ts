@@ -9,6 +9,8 @@ export interface Amenity {
 export interface RoomImage {
   id: number;
   room_image: string;
+  thumbnail?: string;
+  variants?: Record<string, string>;
 }
 
 export interface Room {
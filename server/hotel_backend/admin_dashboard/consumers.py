@@ -1,7 +1,10 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from booking.models import Bookings
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from .service.broadcast import get_active_booking_count
+from .service.booking_feed import booking_feed, build_bookings_snapshot
 
 class PendingBookingConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -26,6 +29,9 @@ class PendingBookingConsumer(AsyncWebsocketConsumer):
             'bookings': bookings
         }))
 
+    async def bookings_delta(self, event):
+        await self.send(text_data=json.dumps(event, cls=DjangoJSONEncoder))
+
     async def active_count_update(self, event):
         count = event['count']
         await self.send(text_data=json.dumps({
@@ -64,17 +70,56 @@ class PendingBookingConsumer(AsyncWebsocketConsumer):
                     'count': count,
                 }))
                 
+            elif message_type == 'resume':
+                await self.resume_bookings_feed(
+                    text_data_json.get('epoch'),
+                    text_data_json.get('last_seq')
+                )
+                
             elif message_type == 'heartbeat':
                 pass
                 
         except Exception as e:
             raise f"Error processing message: {e}"
 
+    async def resume_bookings_feed(self, epoch, last_seq):
+        """
+        Replay the deltas a reconnecting client missed. Clients without a
+        position only get the current one; a snapshot is sent when the gap is
+        no longer in the replay buffer.
+        """
+        if last_seq is None:
+            await self.send(text_data=json.dumps({
+                'type': 'bookings_feed_position',
+                **await sync_to_async(booking_feed.position)(),
+            }))
+            return
+
+        try:
+            last_seq = int(last_seq)
+        except (TypeError, ValueError):
+            last_seq = None
+
+        events = await sync_to_async(booking_feed.since)(epoch, last_seq)
+        if events is None:
+            snapshot = await self.get_bookings_snapshot()
+            await self.send(text_data=json.dumps(snapshot, cls=DjangoJSONEncoder))
+            return
+
+        await self.send(text_data=json.dumps({
+            'type': 'bookings_delta_batch',
+            'epoch': epoch,
+            'seq': events[-1]['seq'] if events else last_seq,
+            'events': events,
+        }, cls=DjangoJSONEncoder))
+
+    @database_sync_to_async
+    def get_bookings_snapshot(self):
+        return build_bookings_snapshot()
+
     @database_sync_to_async
     def get_active_count(self):
         try:
-            include_statuses = ['pending', 'reserved', 'checked_in']
-            count = Bookings.objects.filter(status__in=include_statuses).count()
-            return count
+            return get_active_booking_count()
         except Exception as e:
             raise f"Error in the get_active_count: {e}"
\ No newline at end of file
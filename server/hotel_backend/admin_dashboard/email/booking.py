@@ -1,4 +1,4 @@
-from django.core.mail import EmailMultiAlternatives
+from admin_dashboard.service.outbox import enqueue_email
 import os
 from dotenv import load_dotenv
 from datetime import datetime
@@ -88,9 +88,7 @@ def send_booking_confirmation_email(email, booking_details):
         """
         
         email_from = os.getenv('EMAIL_HOST_USER')
-        message = EmailMultiAlternatives(subject, text_message, email_from, [email])
-        message.attach_alternative(email_html, "text/html")
-        message.send()
+        enqueue_email(subject, text_message, [email], html_body=email_html, from_email=email_from, category='booking_confirmation')
         
         return True
     except Exception as e:
@@ -188,9 +186,7 @@ def send_booking_rejection_email(email, booking_details):
         """
         
         email_from = os.getenv('EMAIL_HOST_USER')
-        message = EmailMultiAlternatives(subject, text_message, email_from, [email])
-        message.attach_alternative(email_html, "text/html")
-        message.send()
+        enqueue_email(subject, text_message, [email], html_body=email_html, from_email=email_from, category='booking_rejection')
         
         return True
     except Exception:
@@ -282,104 +278,8 @@ def send_checkout_e_receipt(email, booking_details):
         """
         
         email_from = os.getenv('EMAIL_HOST_USER')
-        message = EmailMultiAlternatives(subject, text_message, email_from, [email])
-        message.attach_alternative(email_html, "text/html")
-        message.send()
+        enqueue_email(subject, text_message, [email], html_body=email_html, from_email=email_from, category='checkout_receipt')
         
         return True
     except Exception as e:
         return False
-
-def send_checkout_e_receipt(email, booking_details):
-    try:
-        subject = "Azurea Hotel - Your Check-Out E-Receipt"
-        
-        booking_id = booking_details.get('id', 'N/A')
-        check_in = booking_details.get('check_in_date', 'N/A')
-        check_out = booking_details.get('check_out_date', 'N/A')
-        property_type = "Venue" if booking_details.get('is_venue_booking') else "Room"
-        property_name = booking_details.get('area_details', {}).get('area_name', '') if booking_details.get('is_venue_booking') else booking_details.get('room_details', {}).get('room_name', '')
-        
-        total_amount = booking_details.get('total_amount', 0)
-        
-        user_data = booking_details.get('user', {})
-        guest_name = f"{user_data.get('first_name', '')} {user_data.get('last_name', '')}".strip() or "Guest"
-        
-        email_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8" />
-            <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-            <meta http-equiv="X-UA-Compatible" content="ie=edge" />
-            <title>Check-Out Receipt</title>
-            <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600&display=swap" rel="stylesheet" />
-        </head>
-        <body style="margin: 0; font-family: 'Poppins', sans-serif; background: #ffffff; font-size: 14px;">
-            <div style="max-width: 680px; margin: 0 auto; padding: 45px 30px 60px; background: #f4f7ff; background-image: url(https://archisketch-resources.s3.ap-northeast-2.amazonaws.com/vrstyler/1661497957196_595865/email-template-background-banner); background-repeat: no-repeat; background-size: 800px 452px; background-position: top center; font-size: 14px; color: #434343;">
-                <main>
-                    <div style="margin: 0; margin-top: 70px; padding: 92px 30px 115px; background: #ffffff; border-radius: 30px; text-align: center;">
-                        <div style="width: 100%; max-width: 489px; margin: 0 auto;">
-                            <h1 style="margin: 0; font-size: 24px; font-weight: 500; color: #1f1f1f;">Check-Out Receipt</h1>
-                            <p style="margin: 0; margin-top: 17px; font-size: 16px; font-weight: 500;">Hello {guest_name},</p>
-                            <p style="margin: 0; margin-top: 17px; font-weight: 500; letter-spacing: 0.56px;">
-                                Thank you for staying with us at Azurea Hotel. Here's your e-receipt for your booking:
-                            </p>
-                            
-                            <div style="margin-top: 30px; padding: 20px; background-color: #f8f9fa; border-radius: 10px; text-align: left;">
-                                <p style="margin: 10px 0;"><strong>Guest Name:</strong> {guest_name}</p>
-                                <p style="margin: 10px 0;"><strong>Booking ID:</strong> {booking_id}</p>
-                                <p style="margin: 10px 0;"><strong>Property Type:</strong> {property_type}</p>
-                                <p style="margin: 10px 0;"><strong>Property Name:</strong> {property_name}</p>
-                                <p style="margin: 10px 0;"><strong>Check-in Date:</strong> {check_in}</p>
-                                <p style="margin: 10px 0;"><strong>Check-out Date:</strong> {check_out}</p>
-                                <p style="margin: 10px 0;"><strong>Status:</strong> <span style="color: #3182ce; font-weight: 600;">CHECKED OUT</span></p>
-                                <p style="margin: 10px 0;"><strong>Total Amount:</strong> <span style="font-weight: 600;">₱{float(total_amount):,.2f}</span></p>
-                            </div>
-                            
-                            <p style="margin: 0; margin-top: 30px; font-weight: 500; letter-spacing: 0.56px;">
-                                We hope you enjoyed your stay and look forward to welcoming you back soon!
-                            </p>
-                            
-                            <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #e5e7eb;">
-                                <p style="margin: 0; color: #6b7280; font-size: 12px;">
-                                    &copy; {datetime.now().year} Azurea Hotel. All rights reserved.
-                                </p>
-                            </div>
-                        </div>
-                    </div>
-                </main>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_message = f"""
-        Check-Out Receipt
-        
-        Hello {guest_name},
-        
-        Thank you for staying with us at Azurea Hotel. Here's your e-receipt for your booking:
-        
-        Guest Name: {guest_name}
-        Booking ID: {booking_id}
-        Property Type: {property_type}
-        Property Name: {property_name}
-        Check-in Date: {check_in}
-        Check-out Date: {check_out}
-        Status: CHECKED OUT
-        Total Amount: ₱{float(total_amount):,.2f}
-        
-        We hope you enjoyed your stay and look forward to welcoming you back soon!
-        
-        © {datetime.now().year} Azurea Hotel. All rights reserved.
-        """
-        
-        email_from = os.getenv('EMAIL_HOST_USER')
-        message = EmailMultiAlternatives(subject, text_message, email_from, [email])
-        message.attach_alternative(email_html, "text/html")
-        message.send()
-        
-        return True
-    except Exception as e:
-        return False
\ No newline at end of file
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from admin_dashboard.service.pdf_documents import render_receipts_pdf
+from booking.receipts import HOTEL_INFO
+
+def _sample_receipt(index: int) -> dict:
+    return {
+        'id': index,
+        'user': {'first_name': 'Sample', 'last_name': f'Guest {index}'},
+        'property_type': 'Room',
+        'property_name': f'Deluxe Room {index % 20 + 1}',
+        'check_in_date': '2025-01-10',
+        'check_out_date': '2025-01-12',
+        'duration': '2 nights',
+        'number_of_guests': 2,
+        'receipt_data': {
+            'receipt_number': f'REC-{index}-20250112',
+            'generated_at': '2025-01-12T10:00:00',
+            'hotel_info': HOTEL_INFO,
+        },
+        'payment_breakdown': {
+            'total_amount': 5400.0,
+            'down_payment': 2700.0,
+            'remaining_balance': 2700.0,
+            'payment_method': 'GCash',
+            'payment_status': 'paid',
+        },
+    }
+
+class Command(BaseCommand):
+    help = 'Measure PDF receipt rendering throughput (pages per second) for different process pool sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=120, help='Receipt pages rendered per run')
+        parser.add_argument('--workers', default='1,2,4', help='Comma-separated process pool sizes')
+        parser.add_argument('--chunk-size', type=int, default=10, help='Pages per render task')
+
+    def handle(self, *args, **options):
+        pages = options['pages']
+        chunk_size = options['chunk_size']
+        receipts = [_sample_receipt(index) for index in range(1, pages + 1)]
+        chunks = [receipts[i:i + chunk_size] for i in range(0, pages, chunk_size)]
+        worker_counts = [int(count) for count in options['workers'].split(',') if count.strip()]
+
+        self.stdout.write(f"Rendering {pages} receipt pages in {len(chunks)} tasks (CPU count: {os.cpu_count()})")
+        baseline = None
+        with tempfile.TemporaryDirectory() as output_dir:
+            for workers in worker_counts:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                    # Warm the workers so interpreter and matplotlib start-up is not measured
+                    list(pool.map(render_receipts_pdf, [[receipts[0]]] * workers, [
+                        os.path.join(output_dir, f'warm_{workers}_{i}.pdf') for i in range(workers)
+                    ]))
+
+                    started = time.perf_counter()
+                    rendered = sum(pool.map(render_receipts_pdf, chunks, [
+                        os.path.join(output_dir, f'bench_{workers}_{i}.pdf') for i in range(len(chunks))
+                    ]))
+                    elapsed = time.perf_counter() - started
+
+                rate = rendered / elapsed if elapsed else 0
+                baseline = baseline or rate
+                self.stdout.write(
+                    f"workers={workers}: {rendered} pages in {elapsed:.2f}s, "
+                    f"{rate:.1f} pages/s ({rate / baseline:.2f}x)"
+                )
+
+        self.stdout.write(self.style.SUCCESS("PDF rendering benchmark complete"))
@@ -0,0 +1,105 @@
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+class Command(BaseCommand):
+    help = (
+        'Run short simulated requests against a database alias with its connection pool disabled '
+        'and then enabled, and report how much of each request is spent opening connections'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alias', default='default', help='Database alias to test')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent request threads')
+        parser.add_argument('--requests', type=int, default=400, help='Requests per phase')
+        parser.add_argument('--query', default='SELECT 1', help='Statement each request runs')
+
+    def _run_phase(self, alias: str, threads: int, requests: int, query: str) -> dict:
+        remaining = iter(range(requests))
+        lock = threading.Lock()
+        timings = []
+
+        def worker():
+            connection = connections[alias]
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    started = time.perf_counter()
+                    connection.ensure_connection()
+                    connected = time.perf_counter()
+                    with connection.cursor() as cursor:
+                        cursor.execute(query)
+                        cursor.fetchall()
+                    # What Django does when a request finishes with CONN_MAX_AGE = 0
+                    connection.close()
+                    finished = time.perf_counter()
+                    with lock:
+                        timings.append(((connected - started) * 1000, (finished - started) * 1000))
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        connect_ms = sorted(timing[0] for timing in timings)
+        total_ms = sorted(timing[1] for timing in timings)
+        return {
+            'elapsed': elapsed,
+            'rate': len(timings) / elapsed if elapsed else 0.0,
+            'avg_ms': sum(total_ms) / len(total_ms) if total_ms else 0.0,
+            'p95_ms': _percentile(total_ms, 95),
+            'connect_avg_ms': sum(connect_ms) / len(connect_ms) if connect_ms else 0.0,
+            'connect_share': sum(connect_ms) / sum(total_ms) if total_ms else 0.0,
+        }
+
+    def handle(self, *args, **options):
+        alias = options['alias']
+        if alias not in connections:
+            raise CommandError(f"Unknown database alias '{alias}'")
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            raise CommandError(f"'{alias}' does not use a pooled backend (set OPTIONS['pool'])")
+
+        connections[alias].close()
+        pool.clear()
+        self.stdout.write(
+            f"{options['requests']} requests per phase on '{alias}' with {options['threads']} threads "
+            f"(pool size {pool.max_size})"
+        )
+
+        results = {}
+        for phase, enabled in (('unpooled', False), ('pooled', True)):
+            pool.enabled = enabled
+            before = pool.get_metrics()
+            results[phase] = self._run_phase(alias, options['threads'], options['requests'], options['query'])
+            after = pool.get_metrics()
+            result = results[phase]
+            self.stdout.write(
+                f"{phase}: {result['rate']:.1f} req/s, avg {result['avg_ms']:.2f}ms, p95 {result['p95_ms']:.2f}ms, "
+                f"connect avg {result['connect_avg_ms']:.2f}ms ({result['connect_share']:.0%} of request time)"
+            )
+            if enabled:
+                self.stdout.write(
+                    f"  pool: {after['created'] - before['created']} connections opened, "
+                    f"{after['reused'] - before['reused']} reused, "
+                    f"wait avg {after['wait_ms_avg']:.2f}ms max {after['wait_ms_max']:.2f}ms, "
+                    f"{after['timeouts'] - before['timeouts']} timeouts"
+                )
+
+        pool.enabled = True
+        speedup = results['pooled']['rate'] / results['unpooled']['rate'] if results['unpooled']['rate'] else 0.0
+        self.stdout.write(self.style.SUCCESS(f"Pooled throughput {speedup:.2f}x unpooled"))
@@ -0,0 +1,32 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from admin_dashboard.service.media_uploads import media_upload_worker
+
+class Command(BaseCommand):
+    help = 'Push staged payment proofs and property images to the media backend'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the upload queue once and exit')
+        parser.add_argument('--batch-size', type=int, default=None, help='Uploads claimed per batch')
+        parser.add_argument('--interval', type=float, default=None, help='Seconds between polls')
+        parser.add_argument('--retry-failed', action='store_true', help='Requeue failed uploads whose staged file still exists')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or media_upload_worker.poll_interval
+
+        if options['retry_failed']:
+            requeued = media_upload_worker.retry_failed()
+            self.stdout.write(f"Requeued {requeued} failed uploads")
+
+        while True:
+            totals = media_upload_worker.drain(options['batch_size'])
+            if totals['claimed']:
+                self.stdout.write(
+                    f"Uploaded {totals['done']}, retrying {totals['retry']}, failed {totals['failed']}"
+                )
+            if options['once']:
+                self.stdout.write(self.style.SUCCESS("Media upload queue drained"))
+                return
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from admin_dashboard.service.pdf_render import pdf_render_service
+
+class Command(BaseCommand):
+    help = 'Resubmit queued PDF jobs and fail running ones left behind by a stopped process'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-after', type=int, default=None, help='Seconds before a job counts as stale')
+
+    def handle(self, *args, **options):
+        result = pdf_render_service.recover_stale_jobs(options['stale_after'])
+        self.stdout.write(
+            f"Requeued {len(result['requeued'])} job(s), failed {len(result['failed'])} interrupted job(s)"
+        )
+        # Wait for the requeued jobs instead of exiting with them half-rendered
+        pdf_render_service.shutdown(wait=True)
+        self.stdout.write(self.style.SUCCESS("PDF jobs recovered"))
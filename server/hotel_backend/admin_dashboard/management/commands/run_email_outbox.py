@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from admin_dashboard.service.outbox import email_outbox_worker
+
+class Command(BaseCommand):
+    help = 'Send queued emails from the outbox in batches over a reused mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails sent per connection')
+        parser.add_argument('--interval', type=float, default=None, help='Seconds between polls')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or email_outbox_worker.poll_interval
+
+        while True:
+            totals = email_outbox_worker.drain(options['batch_size'])
+            if totals['claimed']:
+                self.stdout.write(
+                    f"Sent {totals['sent']}, retrying {totals['retry']}, failed {totals['failed']}"
+                )
+            if options['once']:
+                self.stdout.write(self.style.SUCCESS("Email outbox drained"))
+                return
+            close_old_connections()
+            time.sleep(interval)
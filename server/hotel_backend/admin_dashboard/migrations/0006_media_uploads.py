@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0005_pdf_render_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.CharField(choices=[('payment_proof', 'Booking Payment Proof'), ('room_image', 'Room Image'), ('area_image', 'Area Image')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('staged_path', models.CharField(max_length=500)),
+                ('original_name', models.CharField(blank=True, default='', max_length=255)),
+                ('content_type', models.CharField(blank=True, default='', max_length=100)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('uploading', 'Uploading'), ('retry', 'Retry'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('result', models.CharField(blank=True, max_length=255, null=True)),
+                ('next_attempt_at', models.DateTimeField()),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'media_uploads',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='media_uploads_due_idx'), models.Index(fields=['target_type', 'object_id'], name='media_uploads_target_idx')],
+            },
+        ),
+    ]
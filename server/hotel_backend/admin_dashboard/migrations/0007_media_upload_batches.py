@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0006_media_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaupload',
+            name='batch',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=32),
+        ),
+    ]
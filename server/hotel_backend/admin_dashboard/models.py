@@ -13,3 +13,94 @@ class ArchivedUser(models.Model):
     
     class Meta:
         db_table = 'archived_users'
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('retry', 'Retry'),
+        ('failed', 'Failed'),
+    ]
+    category = models.CharField(max_length=50, blank=True, default='')
+    subject = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=255, null=True, blank=True)
+    to = models.JSONField(default=list)
+    text_body = models.TextField()
+    html_body = models.TextField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    next_attempt_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'email_outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_outbox_due_idx'),
+        ]
+
+class PdfRenderJob(models.Model):
+    KIND_CHOICES = [
+        ('receipt', 'Receipt'),
+        ('monthly_receipts', 'Monthly Receipts'),
+        ('monthly_report', 'Monthly Report'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    requested_by = models.ForeignKey('user_roles.CustomUsers', on_delete=models.SET_NULL, null=True, blank=True)
+    file_path = models.CharField(max_length=500, null=True, blank=True)
+    pages = models.PositiveIntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    render_ms = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'pdf_render_jobs'
+
+class MediaUpload(models.Model):
+    TARGET_CHOICES = [
+        ('payment_proof', 'Booking Payment Proof'),
+        ('room_image', 'Room Image'),
+        ('area_image', 'Area Image'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('uploading', 'Uploading'),
+        ('retry', 'Retry'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    target_type = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    object_id = models.PositiveIntegerField()
+    batch = models.CharField(max_length=32, blank=True, default='', db_index=True)
+    staged_path = models.CharField(max_length=500)
+    original_name = models.CharField(max_length=255, blank=True, default='')
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    size = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    result = models.CharField(max_length=255, null=True, blank=True)
+    next_attempt_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'media_uploads'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='media_uploads_due_idx'),
+            models.Index(fields=['target_type', 'object_id'], name='media_uploads_target_idx'),
+        ]
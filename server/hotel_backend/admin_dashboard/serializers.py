@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from user_roles.models import CustomUsers
+from .models import PdfRenderJob
 
 class AdminDetailSerializer(serializers.ModelSerializer):
     profile_image = serializers.SerializerMethodField()
@@ -11,4 +12,20 @@ class AdminDetailSerializer(serializers.ModelSerializer):
     def get_profile_image(self, obj):
         if obj.profile_image:
             return obj.profile_image.url
-        return ""
\ No newline at end of file
+        return ""
+
+
+class PdfRenderJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PdfRenderJob
+        fields = [
+            'id',
+            'kind',
+            'params',
+            'status',
+            'pages',
+            'error',
+            'render_ms',
+            'created_at',
+            'finished_at',
+        ]
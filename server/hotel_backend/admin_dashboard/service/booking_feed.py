@@ -0,0 +1,143 @@
+import json
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from .broadcast import ADMIN_GROUP, broadcast_coalescer
+
+# Mirrors the default listing in `admin_bookings`
+HIDDEN_BOOKING_STATUSES = ['cancelled', 'rejected', 'no_show', 'checked_out']
+
+FEED_EPOCH_KEY = 'booking_feed:epoch'
+FEED_SEQ_KEY = 'booking_feed:{epoch}:seq'
+FEED_EVENT_KEY = 'booking_feed:{epoch}:event:{seq}'
+
+class BookingDeltaFeed:
+    """
+    Versioned stream of admin booking changes. Every change is an `upsert` or
+    `remove` event carrying a monotonically increasing `seq`; recent events
+    are kept so reconnecting clients can replay what they missed.
+
+    The epoch, the sequence counter and the replay buffer live in the Django
+    cache, so with `CACHE_BACKEND=redis` every Daphne/worker process numbers
+    its events from one shared sequence. A new epoch starts when the counter
+    is lost (cache flush or eviction), and positions from an old epoch are
+    answered with a snapshot instead.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(BookingDeltaFeed, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.max_replay = getattr(settings, 'BOOKING_FEED_MAX_REPLAY', 200)
+            self.replay_ttl = getattr(settings, 'BOOKING_FEED_REPLAY_TTL', 3600)
+            BookingDeltaFeed._initialized = True
+
+    def _epoch(self) -> str:
+        epoch = cache.get(FEED_EPOCH_KEY)
+        if epoch is None:
+            candidate = uuid.uuid4().hex[:12]
+            if cache.add(FEED_EPOCH_KEY, candidate, None):
+                cache.set(FEED_SEQ_KEY.format(epoch=candidate), 0, None)
+            epoch = cache.get(FEED_EPOCH_KEY, candidate)
+        return epoch
+
+    def position(self) -> dict:
+        epoch = self._epoch()
+        return {'epoch': epoch, 'seq': cache.get(FEED_SEQ_KEY.format(epoch=epoch), 0)}
+
+    def record(self, op: str, booking_id: int, booking: dict = None) -> dict:
+        epoch = self._epoch()
+        try:
+            seq = cache.incr(FEED_SEQ_KEY.format(epoch=epoch))
+        except ValueError:
+            # The counter was lost; restarting it in the same epoch would reuse seqs
+            # clients have already applied, so move everyone to a new epoch
+            cache.delete(FEED_EPOCH_KEY)
+            epoch = self._epoch()
+            seq = cache.incr(FEED_SEQ_KEY.format(epoch=epoch))
+
+        event = {
+            'type': 'bookings_delta',
+            'epoch': epoch,
+            'seq': seq,
+            'op': op,
+            'booking_id': booking_id,
+            'booking': booking,
+        }
+        cache.set(FEED_EVENT_KEY.format(epoch=epoch, seq=seq), event, self.replay_ttl)
+        return event
+
+    def since(self, epoch: str, last_seq: int):
+        """
+        Events after `last_seq`, or None when the client's position cannot be
+        replayed from the buffer and a snapshot has to be sent instead.
+        """
+        current = self.position()
+        if epoch != current['epoch'] or last_seq is None or last_seq > current['seq']:
+            return None
+        if last_seq == current['seq']:
+            return []
+        if current['seq'] - last_seq > self.max_replay:
+            return None
+
+        keys = [FEED_EVENT_KEY.format(epoch=epoch, seq=seq) for seq in range(last_seq + 1, current['seq'] + 1)]
+        events = cache.get_many(keys)
+        # A missing event expired, or its sender has not stored it yet
+        if len(events) != len(keys):
+            return None
+        return [events[key] for key in keys]
+
+def _json_safe(data):
+    # Serializer output can hold Decimals; channel layers only carry plain types.
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+def is_listed_booking(booking) -> bool:
+    return booking is not None and booking.status not in HIDDEN_BOOKING_STATUSES
+
+def _delta_event(booking_id: int, removed: bool = False):
+    from booking.models import Bookings
+    from booking.serializers import BookingSerializer
+
+    booking = None if removed else Bookings.objects.filter(id=booking_id).first()
+    if is_listed_booking(booking):
+        return booking_feed.record('upsert', booking_id, _json_safe(BookingSerializer(booking).data))
+    return booking_feed.record('remove', booking_id)
+
+def queue_booking_delta(booking_id: int, removed: bool = False):
+    """
+    Schedule a delta for one booking. Several saves of the same booking in one
+    coalescing window collapse into a single event built from its final state.
+    """
+    broadcast_coalescer.schedule(
+        ADMIN_GROUP,
+        lambda: _delta_event(booking_id, removed),
+        key=f'bookings_delta:{booking_id}'
+    )
+
+def build_bookings_snapshot() -> dict:
+    from booking.models import Bookings
+    from booking.serializers import BookingSerializer
+
+    # Take the position first: anything recorded while serializing is sent live
+    # afterwards, and upserts are idempotent on the client.
+    position = booking_feed.position()
+    bookings = Bookings.objects.exclude(
+        status__in=HIDDEN_BOOKING_STATUSES
+    ).select_related('user', 'room', 'area').order_by('created_at')
+    data = _json_safe(BookingSerializer(bookings, many=True).data)
+    return {
+        'type': 'bookings_snapshot',
+        'epoch': position['epoch'],
+        'seq': position['seq'],
+        'count': len(data),
+        'bookings': data,
+    }
+
+# Create singleton instance
+booking_feed = BookingDeltaFeed()
@@ -0,0 +1,209 @@
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from asgiref.sync import SyncToAsync, async_to_sync
+
+logger = logging.getLogger(__name__)
+
+ADMIN_GROUP = 'admin_notifications'
+ACTIVE_BOOKING_STATUSES = ['pending', 'reserved', 'confirmed', 'checked_in']
+
+def _asgi_event_loop():
+    """
+    The server's event loop when called from it, or from sync code it runs
+    through sync_to_async (views, model signals); None in plain sync processes
+    such as management commands.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    # The same lookup async_to_sync uses to get back onto the outer loop
+    if getattr(SyncToAsync.threadlocal, 'main_event_loop_pid', None) != os.getpid():
+        return None
+    loop = getattr(SyncToAsync.threadlocal, 'main_event_loop', None)
+    return loop if loop is not None and loop.is_running() else None
+
+class BroadcastCoalescer:
+    """
+    Collects channel layer group sends over a short window and only sends the
+    latest payload per (group, key) once the window closes.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(BroadcastCoalescer, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.window = getattr(settings, 'BROADCAST_COALESCE_WINDOW', 0.25)
+            self._lock = threading.Lock()
+            self._pending = {}
+            self._timer = None
+            self._flush_task = None
+            self._metrics = {}
+            BroadcastCoalescer._initialized = True
+
+    def _group_metrics(self, group: str) -> dict:
+        if group not in self._metrics:
+            self._metrics[group] = {
+                'scheduled': 0,
+                'coalesced': 0,
+                'sent': 0,
+                'failed': 0,
+                'flushes': 0,
+                'last_flush_at': None,
+                'last_flush_ms': 0.0,
+            }
+        return self._metrics[group]
+
+    def schedule(self, group: str, message, key: str = None):
+        """
+        Queue a message for `group`. `message` is either the event dict or a
+        callable returning it, evaluated once at flush time so expensive
+        payloads (counts, serializers) are only built for the surviving send.
+        """
+        if key is None:
+            key = message['type'] if isinstance(message, dict) else getattr(message, '__name__', 'message')
+
+        with self._lock:
+            metrics = self._group_metrics(group)
+            metrics['scheduled'] += 1
+            if (group, key) in self._pending:
+                metrics['coalesced'] += 1
+            self._pending[(group, key)] = message
+
+            if self._timer is None:
+                loop = _asgi_event_loop()
+                if loop is not None:
+                    # Consumers (and the in-memory channel layer's queues) live on the server
+                    # loop, so the flush must run there rather than on a timer thread
+                    self._timer = loop
+                    # A fresh context, so the flush does not inherit the calling request's
+                    # sync_to_async state (which would make its DB call look re-entrant)
+                    loop.call_soon_threadsafe(self._arm_on_loop, loop, context=contextvars.Context())
+                else:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    def _arm_on_loop(self, loop):
+        loop.call_later(self.window, self._start_flush_task, loop)
+
+    def _start_flush_task(self, loop):
+        # Keep a reference so the task is not garbage collected mid-flush
+        self._flush_task = loop.create_task(self._flush_async())
+
+    def _take_pending(self) -> dict:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._timer = None
+        return pending
+
+    def _record_flush(self, flushed_groups: dict):
+        with self._lock:
+            now = time.time()
+            for group, stats in flushed_groups.items():
+                metrics = self._group_metrics(group)
+                metrics['sent'] += stats['sent']
+                metrics['failed'] += stats['failed']
+                metrics['flushes'] += 1
+                metrics['last_flush_at'] = now
+                metrics['last_flush_ms'] = round(stats['ms'], 3)
+
+    async def _flush_async(self):
+        pending = self._take_pending()
+        if not pending:
+            return
+
+        channel_layer = get_channel_layer()
+        flushed_groups = {}
+        for (group, key), message in pending.items():
+            started = time.perf_counter()
+            try:
+                # Payload callables may query the database, which cannot run on the loop
+                event = await database_sync_to_async(message)() if callable(message) else message
+                if event is None:
+                    continue
+                await channel_layer.group_send(group, event)
+                sent, failed = 1, 0
+            except Exception as e:
+                logger.error(f"Error sending coalesced '{key}' broadcast to {group}: {str(e)}")
+                sent, failed = 0, 1
+
+            stats = flushed_groups.setdefault(group, {'sent': 0, 'failed': 0, 'ms': 0.0})
+            stats['sent'] += sent
+            stats['failed'] += failed
+            stats['ms'] += (time.perf_counter() - started) * 1000
+
+        self._record_flush(flushed_groups)
+
+    def flush(self):
+        """
+        Send every pending message from sync code: the timer thread used when no
+        server loop is running, or directly (e.g. on shutdown).
+        """
+        pending = self._take_pending()
+        if not pending:
+            return
+
+        channel_layer = get_channel_layer()
+        flushed_groups = {}
+        try:
+            for (group, key), message in pending.items():
+                started = time.perf_counter()
+                try:
+                    event = message() if callable(message) else message
+                    if event is None:
+                        continue
+                    async_to_sync(channel_layer.group_send)(group, event)
+                    sent, failed = 1, 0
+                except Exception as e:
+                    logger.error(f"Error sending coalesced '{key}' broadcast to {group}: {str(e)}")
+                    sent, failed = 0, 1
+
+                stats = flushed_groups.setdefault(group, {'sent': 0, 'failed': 0, 'ms': 0.0})
+                stats['sent'] += sent
+                stats['failed'] += failed
+                stats['ms'] += (time.perf_counter() - started) * 1000
+        finally:
+            # Flushes run on a timer thread, so release any DB connection it opened.
+            close_old_connections()
+
+        self._record_flush(flushed_groups)
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            return {
+                'window_seconds': self.window,
+                'pending': len(self._pending),
+                'groups': {group: dict(values) for group, values in self._metrics.items()},
+            }
+
+def get_active_booking_count() -> int:
+    from booking.models import Bookings
+    return Bookings.objects.filter(status__in=ACTIVE_BOOKING_STATUSES).count()
+
+def _active_count_event() -> dict:
+    return {
+        'type': 'active_count_update',
+        'count': get_active_booking_count(),
+    }
+
+def queue_active_count_update():
+    """Schedule a single `active_count_update` for the admin dashboard group."""
+    broadcast_coalescer.schedule(ADMIN_GROUP, _active_count_event, key='active_count_update')
+
+# Create singleton instance
+broadcast_coalescer = BroadcastCoalescer()
@@ -0,0 +1,119 @@
+import io
+import os
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+FORMAT_EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+FORMAT_CONTENT_TYPES = {'WEBP': 'image/webp', 'JPEG': 'image/jpeg'}
+
+@dataclass
+class NormalizedImage:
+    content: bytes
+    extension: str
+    content_type: str
+    width: int
+    height: int
+
+def _output_format() -> str:
+    fmt = getattr(settings, 'IMAGE_OUTPUT_FORMAT', 'WEBP').upper()
+    return fmt if fmt in FORMAT_EXTENSIONS else 'JPEG'
+
+def thumbnail_sizes() -> dict:
+    """Variant name to maximum edge in pixels, e.g. {'thumb': 320, 'medium': 960}."""
+    return getattr(settings, 'IMAGE_THUMBNAIL_SIZES', {'thumb': 320, 'medium': 960})
+
+def _open(source):
+    image = Image.open(source)
+    # JPEGs decode at a reduced scale when the target is much smaller, cutting decode memory
+    max_dimension = getattr(settings, 'IMAGE_MAX_DIMENSION', 1920)
+    image.draft(None, (max_dimension, max_dimension))
+    image.load()
+    # Bake the EXIF orientation into the pixels before the metadata is dropped
+    return ImageOps.exif_transpose(image)
+
+def _encode(image, max_dimension: int) -> NormalizedImage:
+    fmt = _output_format()
+    image = image.copy()
+    # Palette and greyscale images keep transparency in `info`, not in an alpha band
+    if image.mode in ('P', 'PA', 'LA') or 'transparency' in image.info:
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+    if image.mode == 'RGBA' and fmt == 'JPEG':
+        # JPEG has no alpha; transparent areas would otherwise come out black
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    # A fresh save without exif/icc_profile arguments writes no metadata
+    options = {'quality': getattr(settings, 'IMAGE_QUALITY', 80)}
+    if fmt == 'JPEG':
+        options.update(optimize=True, progressive=True)
+    else:
+        options.update(method=4)
+    image.save(buffer, fmt, **options)
+    return NormalizedImage(
+        content=buffer.getvalue(),
+        extension=FORMAT_EXTENSIONS[fmt],
+        content_type=FORMAT_CONTENT_TYPES[fmt],
+        width=image.width,
+        height=image.height,
+    )
+
+def normalize_image(source, with_variants: bool = False):
+    """
+    Re-encode an image file or path: orientation applied, metadata stripped,
+    longest edge capped at `IMAGE_MAX_DIMENSION`, saved as `IMAGE_OUTPUT_FORMAT`.
+    Returns `(main, variants)`, or `(None, {})` when `source` is not an image
+    (e.g. a PDF payment proof), which callers then store unchanged.
+    """
+    try:
+        image = _open(source)
+    except (UnidentifiedImageError, OSError):
+        return None, {}
+
+    main = _encode(image, getattr(settings, 'IMAGE_MAX_DIMENSION', 1920))
+    variants = {}
+    if with_variants:
+        for name, size in thumbnail_sizes().items():
+            if size < max(image.size):
+                variants[name] = _encode(image, size)
+    return main, variants
+
+def render_sizes(source, sizes: dict) -> dict:
+    """
+    Encode `source` once per `{name: max_edge}` entry. Images smaller than a
+    size are re-encoded at their own size rather than upscaled. Returns an
+    empty dict when `source` is not an image.
+    """
+    try:
+        image = _open(source)
+    except (UnidentifiedImageError, OSError):
+        return {}
+    return {name: _encode(image, size) for name, size in sizes.items()}
+
+def normalize_upload(uploaded_file):
+    """Normalized copy of an uploaded image, or the upload itself if it is not an image."""
+    if not getattr(settings, 'IMAGE_NORMALIZE', True):
+        return uploaded_file
+
+    uploaded_file.seek(0)
+    main, _ = normalize_image(uploaded_file)
+    uploaded_file.seek(0)
+    if main is None or len(main.content) >= uploaded_file.size:
+        return uploaded_file
+
+    name = f"{os.path.splitext(uploaded_file.name or 'image')[0]}.{main.extension}"
+    return InMemoryUploadedFile(
+        io.BytesIO(main.content),
+        field_name=getattr(uploaded_file, 'field_name', None),
+        name=name,
+        content_type=main.content_type,
+        size=len(main.content),
+        charset=None,
+    )
@@ -0,0 +1,520 @@
+import glob
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from .image_processing import normalize_image
+
+logger = logging.getLogger(__name__)
+
+DUE_STATUSES = ['pending', 'retry']
+OPEN_STATUSES = ['pending', 'uploading', 'retry']
+
+class CloudinaryMediaBackend:
+    def upload(self, path: str, name: str) -> dict:
+        import cloudinary.uploader
+
+        options = {
+            'resource_type': 'image',
+            'type': 'upload',
+            'timeout': getattr(settings, 'MEDIA_UPLOAD_TIMEOUT', 60),
+        }
+        chunk_size = getattr(settings, 'MEDIA_UPLOAD_CHUNK_SIZE', 6 * 1024 * 1024)
+        if os.path.getsize(path) > chunk_size:
+            # `upload` reads the whole file into the request body; `upload_large` sends it a chunk at a time
+            return cloudinary.uploader.upload_large(path, chunk_size=chunk_size, **options)
+        return cloudinary.uploader.upload(path, **options)
+
+    def stored_value(self, result: dict) -> str:
+        return _cloudinary_value(result)
+
+    def delete(self, result: dict):
+        import cloudinary.uploader
+
+        cloudinary.uploader.destroy(
+            result['public_id'],
+            resource_type=result.get('resource_type', 'image'),
+            type=result.get('type', 'upload'),
+            invalidate=True,
+        )
+
+class LocalMediaBackend:
+    """
+    Copies files under `MEDIA_UPLOAD_LOCAL_ROOT` and answers with a
+    Cloudinary-shaped result whose URLs point at `MEDIA_UPLOAD_LOCAL_URL`,
+    where the `local_media` view serves them. Used in tests and offline
+    development.
+    """
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip('/') + '/'
+
+    def upload(self, path: str, name: str) -> dict:
+        os.makedirs(self.root, exist_ok=True)
+        file_id = uuid.uuid4().hex
+        extension = os.path.splitext(name)[1].lstrip('.').lower() or 'jpg'
+        destination = os.path.join(self.root, f"{file_id}.{extension}")
+        shutil.copyfile(path, destination)
+        return {
+            'public_id': f"local/{file_id}",
+            'version': int(time.time()),
+            'format': extension,
+            'type': 'upload',
+            'resource_type': 'image',
+            'secure_url': f"{self.base_url}{file_id}.{extension}",
+            'path': destination,
+        }
+
+    def stored_value(self, result: dict) -> str:
+        # CloudinaryField hands full URLs back unchanged, minus the extension; `find` accepts both forms
+        return result['secure_url']
+
+    def find(self, name: str):
+        """Path of the file behind `name` (with or without its extension), or None."""
+        file_id = name.split('.', 1)[0]
+        if not re.fullmatch(r'[0-9a-f]{32}', file_id):
+            return None
+        matches = glob.glob(os.path.join(self.root, f"{file_id}.*"))
+        return matches[0] if matches else None
+
+    def delete(self, result: dict):
+        try:
+            os.remove(result['path'])
+        except (KeyError, OSError):
+            pass
+
+def get_local_media_backend():
+    return LocalMediaBackend(
+        getattr(settings, 'MEDIA_UPLOAD_LOCAL_ROOT', os.path.join(settings.BASE_DIR, 'media', 'local_uploads')),
+        getattr(settings, 'MEDIA_UPLOAD_LOCAL_URL', 'http://localhost:8000/master/local_media/'),
+    )
+
+def get_media_backend():
+    if getattr(settings, 'MEDIA_UPLOAD_BACKEND', 'cloudinary') == 'local':
+        return get_local_media_backend()
+    return CloudinaryMediaBackend()
+
+def _target_model(target_type: str):
+    from booking.models import Bookings
+    from property.models import Rooms, Areas
+
+    return {'payment_proof': Bookings, 'room_image': Rooms, 'area_image': Areas}[target_type]
+
+def _cloudinary_value(result: dict) -> str:
+    from cloudinary import CloudinaryResource
+
+    return CloudinaryResource(
+        result['public_id'],
+        format=result.get('format'),
+        version=result.get('version'),
+        type=result.get('type', 'upload'),
+        resource_type=result.get('resource_type', 'image'),
+        metadata=result,
+    ).get_prep_value()
+
+def _variant_urls(result: dict) -> dict:
+    return {name: variant['secure_url'] for name, variant in result.get('variants', {}).items()}
+
+def refresh_media_status(target_type: str, object_id: int) -> str:
+    """Recompute `media_status` on the booking, room or area behind an upload."""
+    from admin_dashboard.models import MediaUpload
+
+    model = _target_model(target_type)
+    siblings = [kind for kind, _ in MediaUpload.TARGET_CHOICES if _target_model(kind) is model]
+    uploads = MediaUpload.objects.filter(target_type__in=siblings, object_id=object_id)
+
+    if uploads.filter(status__in=OPEN_STATUSES).exists():
+        media_status = 'pending'
+    elif uploads.filter(status='failed').exists():
+        media_status = 'failed'
+    else:
+        media_status = 'ready'
+    model.objects.filter(id=object_id).update(media_status=media_status)
+    return media_status
+
+class MediaUploadWorker:
+    """
+    Pushes staged files to the media backend. Requests only write the file to
+    `MEDIA_UPLOAD_STAGING_ROOT` and queue a `MediaUpload` row, so booking and
+    property writes no longer wait on Cloudinary. Rows are claimed under
+    row locks and uploaded on a pool of `MEDIA_UPLOAD_WORKERS`
+    threads, so a batch of photos takes about as long as its slowest upload;
+    failures back off exponentially until `MEDIA_UPLOAD_MAX_ATTEMPTS`.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MediaUploadWorker, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.workers = getattr(settings, 'MEDIA_UPLOAD_WORKERS', 8)
+            self.max_attempts = getattr(settings, 'MEDIA_UPLOAD_MAX_ATTEMPTS', 5)
+            self.retry_base = getattr(settings, 'MEDIA_UPLOAD_RETRY_BASE', 15)
+            self.poll_interval = getattr(settings, 'MEDIA_UPLOAD_POLL_INTERVAL', 10)
+            self.lock_timeout = getattr(settings, 'MEDIA_UPLOAD_LOCK_TIMEOUT', 300)
+            self.staging_root = getattr(settings, 'MEDIA_UPLOAD_STAGING_ROOT', os.path.join(settings.BASE_DIR, 'media', 'staging'))
+            self._wake = threading.Event()
+            self._lock = threading.Lock()
+            self._thread = None
+            self._pool = None
+            MediaUploadWorker._initialized = True
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.retry_base * (2 ** max(attempts - 1, 0)), 3600))
+
+    def stage(self, target_type: str, instance, uploaded_file, batch: str = ''):
+        """
+        Write an uploaded file to the staging area, queue it against
+        `instance` and mark the instance's media as pending. Uploads sharing
+        a `batch` are uploaded in parallel and attached all-or-nothing.
+        """
+        from admin_dashboard.models import MediaUpload
+
+        os.makedirs(self.staging_root, exist_ok=True)
+        extension = os.path.splitext(uploaded_file.name or '')[1].lower()
+        staged_path = os.path.join(self.staging_root, f"{uuid.uuid4().hex}{extension}")
+        with open(staged_path, 'wb') as destination:
+            for chunk in uploaded_file.chunks():
+                destination.write(chunk)
+
+        upload = MediaUpload.objects.create(
+            target_type=target_type,
+            object_id=instance.id,
+            batch=batch,
+            staged_path=staged_path,
+            original_name=uploaded_file.name or '',
+            content_type=getattr(uploaded_file, 'content_type', None) or '',
+            size=uploaded_file.size or 0,
+            next_attempt_at=timezone.now(),
+        )
+        type(instance).objects.filter(id=instance.id).update(media_status='pending')
+        instance.media_status = 'pending'
+
+        self.ensure_started()
+        transaction.on_commit(self.wake)
+        return upload
+
+    def stage_many(self, target_type: str, instance, uploaded_files) -> list:
+        batch = uuid.uuid4().hex
+        return [self.stage(target_type, instance, uploaded_file, batch) for uploaded_file in uploaded_files]
+
+    def claim_batch(self, batch_size: int = None):
+        """
+        Claim due uploads, plus rows in `uploading` whose worker died. A staged
+        batch is always claimed whole, so it can be attached in one go: rows
+        are locked with `SKIP LOCKED`, and a batch is left alone when any of
+        its rows is locked, being uploaded by another worker or has failed.
+        """
+        from admin_dashboard.models import MediaUpload
+
+        now = timezone.now()
+        stale = now - timedelta(seconds=self.lock_timeout)
+        limit = batch_size or self.workers * 2
+        stale_uploading = Q(status='uploading', locked_at__lt=stale)
+        locking = MediaUpload.objects.select_for_update(
+            skip_locked=connections[MediaUpload.objects.db].features.has_select_for_update_skip_locked
+        )
+
+        with transaction.atomic():
+            rows = list(
+                locking.filter(Q(status__in=DUE_STATUSES, next_attempt_at__lte=now) | stale_uploading)
+                .order_by('next_attempt_at', 'id')[:limit]
+            )
+            claimed = {row.id for row in rows if not row.batch}
+
+            batches = {row.batch for row in rows if row.batch}
+            if batches:
+                locked = {}
+                for upload_id, batch in locking.filter(batch__in=batches).filter(
+                    Q(status__in=DUE_STATUSES) | stale_uploading
+                ).values_list('id', 'batch'):
+                    locked.setdefault(batch, set()).add(upload_id)
+                open_counts = dict(
+                    MediaUpload.objects.filter(batch__in=batches, status__in=OPEN_STATUSES + ['failed'])
+                    .values_list('batch').annotate(count=Count('id'))
+                )
+                for batch, upload_ids in locked.items():
+                    if len(upload_ids) == open_counts.get(batch):
+                        claimed |= upload_ids
+
+            MediaUpload.objects.filter(id__in=claimed).update(status='uploading', locked_at=now)
+
+        return list(MediaUpload.objects.filter(id__in=claimed).order_by('id'))
+
+    def _attach(self, group, values) -> bool:
+        """
+        Store the uploaded `(value, variant_urls)` pairs on the target. Returns
+        False if the target is gone.
+        """
+        from booking.models import Bookings
+        from property.models import RoomImages, AreaImages, Rooms, Areas
+
+        target_type, object_id = group[0].target_type, group[0].object_id
+        if target_type == 'payment_proof':
+            return Bookings.objects.filter(id=object_id).update(payment_proof=values[-1][0]) > 0
+        if target_type == 'room_image':
+            if not Rooms.objects.filter(id=object_id).exists():
+                return False
+            RoomImages.objects.bulk_create([
+                RoomImages(room_id=object_id, room_image=value, variants=variants) for value, variants in values
+            ])
+            return True
+        if target_type == 'area_image':
+            if not Areas.objects.filter(id=object_id).exists():
+                return False
+            AreaImages.objects.bulk_create([
+                AreaImages(area_id=object_id, area_image=value, variants=variants) for value, variants in values
+            ])
+            return True
+        raise ValueError(f"Unknown media target: {target_type}")
+
+    def _discard_file(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _record_failure(self, upload, error: str):
+        upload.attempts += 1
+        upload.last_error = error
+        upload.locked_at = None
+        if upload.attempts >= self.max_attempts or not os.path.exists(upload.staged_path):
+            upload.status = 'failed'
+            upload.finished_at = timezone.now()
+        else:
+            upload.status = 'retry'
+            upload.next_attempt_at = timezone.now() + self.backoff(upload.attempts)
+        upload.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at', 'finished_at'])
+        refresh_media_status(upload.target_type, upload.object_id)
+
+    def _fail_batch(self, group):
+        """
+        Mark every still-open member of a batch failed once one of them has
+        failed for good, so the rest are never attached as a partial batch.
+        """
+        from admin_dashboard.models import MediaUpload
+
+        finished_at = timezone.now()
+        MediaUpload.objects.filter(batch=group[0].batch, status__in=OPEN_STATUSES).update(
+            status='failed', locked_at=None, finished_at=finished_at,
+        )
+        for upload in group:
+            if upload.status != 'failed':
+                upload.status = 'failed'
+                upload.locked_at = None
+                upload.finished_at = finished_at
+        refresh_media_status(group[0].target_type, group[0].object_id)
+
+    def _normalized_files(self, upload) -> list:
+        """
+        `(variant, path, name)` for every file to push: the normalized image
+        (variant None) plus thumbnails for property photos. Files that are not
+        images, or when `IMAGE_NORMALIZE` is off, go up as staged.
+        """
+        if not getattr(settings, 'IMAGE_NORMALIZE', True):
+            return [(None, upload.staged_path, upload.original_name)]
+
+        main, variants = normalize_image(upload.staged_path, with_variants=upload.target_type != 'payment_proof')
+        if main is None:
+            return [(None, upload.staged_path, upload.original_name)]
+
+        base_name = os.path.splitext(upload.original_name or 'image')[0]
+        files = []
+        for variant, image in [(None, main)] + list(variants.items()):
+            path = f"{upload.staged_path}.{variant or 'main'}.{image.extension}"
+            with open(path, 'wb') as destination:
+                destination.write(image.content)
+            files.append((variant, path, f"{base_name}.{image.extension}"))
+        return files
+
+    def _upload_one(self, upload, backend):
+        # Runs on the upload pool; only touches files and the backend, never the database
+        files, uploaded = [], []
+        try:
+            files = self._normalized_files(upload)
+            result, variants = None, {}
+            for variant, path, name in files:
+                variant_result = backend.upload(path, name)
+                uploaded.append(variant_result)
+                if variant:
+                    variants[variant] = variant_result
+                else:
+                    result = variant_result
+            result['variants'] = variants
+            return result, None
+        except Exception as e:
+            self._roll_back(backend, uploaded)
+            return None, e
+        finally:
+            for _, path, _ in files:
+                if path != upload.staged_path:
+                    self._discard_file(path)
+
+    def _roll_back(self, backend, results):
+        for result in results:
+            for asset in [result] + list(result.get('variants', {}).values()):
+                try:
+                    backend.delete(asset)
+                except Exception as e:
+                    logger.error(f"Media upload could not remove orphaned asset {asset.get('public_id')}: {str(e)}")
+
+    def _finish_group(self, members, backend) -> list:
+        """
+        Persist one staged batch (all images from a single request) once every
+        upload in it has landed: images are bulk-inserted in one transaction.
+        If any upload failed, the ones that succeeded are deleted from the
+        backend and the whole batch is retried together, or failed together
+        once any upload in it has failed for good.
+        """
+        from admin_dashboard.models import MediaUpload
+
+        group = [upload for upload, _ in members]
+        results = [result for _, (result, _) in members if result is not None]
+        errors = {upload.id: str(error) for upload, (_, error) in members if error is not None}
+
+        if not errors:
+            try:
+                values = [(backend.stored_value(result), _variant_urls(result)) for _, (result, _) in members]
+                with transaction.atomic():
+                    attached = self._attach(group, values)
+                    finished_at = timezone.now()
+                    for upload, (value, _) in zip(group, values):
+                        upload.attempts += 1
+                        upload.status = 'done'
+                        upload.result = value
+                        upload.last_error = None if attached else "Target was deleted before the upload finished"
+                        upload.locked_at = None
+                        upload.finished_at = finished_at
+                    MediaUpload.objects.bulk_update(group, ['attempts', 'status', 'result', 'last_error', 'locked_at', 'finished_at'])
+                    refresh_media_status(group[0].target_type, group[0].object_id)
+                for upload in group:
+                    self._discard_file(upload.staged_path)
+                return [upload.status for upload in group]
+            except Exception as e:
+                errors = {upload.id: str(e) for upload in group}
+
+        for upload_id, error in errors.items():
+            logger.error(f"Media upload #{upload_id} ({group[0].target_type}) failed: {error}")
+        self._roll_back(backend, results)
+        for upload in group:
+            try:
+                self._record_failure(
+                    upload,
+                    errors.get(upload.id, f"Rolled back: {len(errors)} of {len(group)} uploads in the batch failed"),
+                )
+            except Exception as record_error:
+                # Left in `uploading`; reclaimed once the lock goes stale
+                logger.error(f"Media upload #{upload.id} could not record failure: {str(record_error)}")
+        if group[0].batch and any(upload.status == 'failed' for upload in group):
+            try:
+                self._fail_batch(group)
+            except Exception as fail_error:
+                logger.error(f"Media upload batch {group[0].batch} could not be failed: {str(fail_error)}")
+        return [upload.status for upload in group]
+
+    def process_rows(self, rows, backend=None) -> list:
+        """
+        Upload claimed rows in parallel on the bounded pool, then persist each
+        staged batch. Returns the resulting status of every row.
+        """
+        backend = backend or get_media_backend()
+        outcomes = list(self._executor().map(lambda upload: self._upload_one(upload, backend), rows))
+
+        groups = {}
+        for upload, outcome in zip(rows, outcomes):
+            groups.setdefault(upload.batch or f"upload-{upload.id}", []).append((upload, outcome))
+
+        statuses = []
+        for members in groups.values():
+            statuses += self._finish_group(members, backend)
+        return statuses
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='media-upload')
+            return self._pool
+
+    def process_batch(self, batch_size: int = None) -> dict:
+        """Upload one batch concurrently. Returns counts per resulting status."""
+        rows = self.claim_batch(batch_size)
+        result = {'claimed': len(rows), 'done': 0, 'retry': 0, 'failed': 0}
+        if not rows:
+            return result
+
+        for outcome in self.process_rows(rows):
+            result[outcome] += 1
+        return result
+
+    def drain(self, batch_size: int = None) -> dict:
+        """Process batches until nothing is due."""
+        totals = {'claimed': 0, 'done': 0, 'retry': 0, 'failed': 0}
+        while True:
+            result = self.process_batch(batch_size)
+            for key, value in result.items():
+                totals[key] += value
+            if result['claimed'] == 0:
+                return totals
+
+    def retry_failed(self) -> int:
+        """
+        Requeue failed uploads whose staged file is still on disk. A batch is
+        only requeued whole, once every one of its staged files is still there.
+        """
+        from admin_dashboard.models import MediaUpload
+
+        groups = {}
+        for upload in MediaUpload.objects.filter(status='failed'):
+            groups.setdefault(upload.batch or f"upload-{upload.id}", []).append(upload)
+
+        requeued = 0
+        for group in groups.values():
+            if not all(os.path.exists(upload.staged_path) for upload in group):
+                continue
+            for upload in group:
+                upload.status = 'pending'
+                upload.attempts = 0
+                upload.next_attempt_at = timezone.now()
+                upload.finished_at = None
+                upload.save(update_fields=['status', 'attempts', 'next_attempt_at', 'finished_at'])
+                requeued += 1
+            refresh_media_status(group[0].target_type, group[0].object_id)
+        return requeued
+
+    def wake(self):
+        self._wake.set()
+
+    def ensure_started(self):
+        if not getattr(settings, 'MEDIA_UPLOAD_WORKER', True):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='media-upload-dispatch', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception as e:
+                logger.error(f"Media upload worker error: {str(e)}")
+            finally:
+                close_old_connections()
+
+# Create singleton instance
+media_upload_worker = MediaUploadWorker()
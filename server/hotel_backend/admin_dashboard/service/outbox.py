@@ -0,0 +1,219 @@
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DUE_STATUSES = ['pending', 'retry']
+
+# Mails carrying one-time codes; their bodies are not kept once the row is done
+SENSITIVE_CATEGORIES = ['otp', 'reset_password']
+
+class EmailOutboxWorker:
+    """
+    Sends queued `EmailOutbox` rows in batches over one SMTP connection per
+    batch. Failed rows are retried with exponential backoff until
+    `EMAIL_OUTBOX_MAX_ATTEMPTS`, then marked `failed`. Rows are claimed with a
+    conditional update, so several processes can run workers side by side.
+
+    OTP and reset password rows are blanked as soon as they are sent or fail
+    for good, and deleted after `EMAIL_OUTBOX_SENSITIVE_RETENTION` seconds
+    whatever their state, so codes do not linger in the database.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(EmailOutboxWorker, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.batch_size = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 20)
+            self.max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+            self.retry_base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE', 30)
+            self.poll_interval = getattr(settings, 'EMAIL_OUTBOX_POLL_INTERVAL', 15)
+            self.lock_timeout = getattr(settings, 'EMAIL_OUTBOX_LOCK_TIMEOUT', 300)
+            self.sensitive_retention = getattr(settings, 'EMAIL_OUTBOX_SENSITIVE_RETENTION', 600)
+            self._wake = threading.Event()
+            self._lock = threading.Lock()
+            self._thread = None
+            EmailOutboxWorker._initialized = True
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.retry_base * (2 ** max(attempts - 1, 0)), 3600))
+
+    def claim_batch(self, batch_size: int = None):
+        from admin_dashboard.models import EmailOutbox
+
+        now = timezone.now()
+        stale = now - timedelta(seconds=self.lock_timeout)
+        candidates = list(
+            EmailOutbox.objects.filter(status__in=DUE_STATUSES, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size or self.batch_size]
+        )
+        # Rows left in `sending` by a worker that died mid-batch
+        candidates += list(
+            EmailOutbox.objects.filter(status='sending', locked_at__lt=stale)
+            .values_list('id', flat=True)[:batch_size or self.batch_size]
+        )
+
+        claimed = []
+        for outbox_id in candidates:
+            updated = EmailOutbox.objects.filter(
+                id=outbox_id, status__in=DUE_STATUSES + ['sending']
+            ).exclude(status='sending', locked_at__gte=stale).update(status='sending', locked_at=now)
+            if updated:
+                claimed.append(outbox_id)
+
+        return list(EmailOutbox.objects.filter(id__in=claimed).order_by('id'))
+
+    def _build_message(self, row, connection):
+        message = EmailMultiAlternatives(
+            row.subject,
+            row.text_body,
+            row.from_email or settings.EMAIL_HOST_USER,
+            row.to,
+            connection=connection,
+        )
+        if row.html_body:
+            message.attach_alternative(row.html_body, "text/html")
+        return message
+
+    def _scrub_fields(self, row) -> list:
+        if row.category not in SENSITIVE_CATEGORIES:
+            return []
+        row.text_body = ''
+        row.html_body = None
+        return ['text_body', 'html_body']
+
+    def _record_failure(self, row, error: str):
+        row.attempts += 1
+        row.last_error = error
+        row.locked_at = None
+        update_fields = ['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at']
+        if row.attempts >= self.max_attempts:
+            row.status = 'failed'
+            update_fields += self._scrub_fields(row)
+        else:
+            row.status = 'retry'
+            row.next_attempt_at = timezone.now() + self.backoff(row.attempts)
+        row.save(update_fields=update_fields)
+
+    def purge_sensitive(self) -> int:
+        """
+        Delete OTP and reset password rows older than the retention window.
+        By then the code has expired, so unsent rows are useless as well.
+        """
+        from admin_dashboard.models import EmailOutbox
+
+        cutoff = timezone.now() - timedelta(seconds=self.sensitive_retention)
+        deleted, _ = EmailOutbox.objects.filter(
+            category__in=SENSITIVE_CATEGORIES, created_at__lt=cutoff
+        ).exclude(status='sending', locked_at__gte=cutoff).delete()
+        return deleted
+
+    def process_batch(self, batch_size: int = None) -> dict:
+        """Send one batch. Returns counts of sent, retried and failed rows."""
+        rows = self.claim_batch(batch_size)
+        result = {'claimed': len(rows), 'sent': 0, 'retry': 0, 'failed': 0}
+        if not rows:
+            return result
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Email outbox could not open a mail connection: {str(e)}")
+            for row in rows:
+                self._record_failure(row, f"connection: {str(e)}")
+                result[row.status] += 1
+            return result
+
+        try:
+            for row in rows:
+                try:
+                    connection.send_messages([self._build_message(row, connection)])
+                    row.attempts += 1
+                    row.status = 'sent'
+                    row.sent_at = timezone.now()
+                    row.locked_at = None
+                    row.last_error = None
+                    row.save(update_fields=[
+                        'attempts', 'status', 'sent_at', 'locked_at', 'last_error', *self._scrub_fields(row)
+                    ])
+                    result['sent'] += 1
+                except Exception as e:
+                    logger.error(f"Email outbox failed to send #{row.id} ({row.category}): {str(e)}")
+                    self._record_failure(row, str(e))
+                    result[row.status] += 1
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+        return result
+
+    def drain(self, batch_size: int = None) -> dict:
+        """Send batches until nothing is due."""
+        self.purge_sensitive()
+        totals = {'claimed': 0, 'sent': 0, 'retry': 0, 'failed': 0}
+        while True:
+            result = self.process_batch(batch_size)
+            for key, value in result.items():
+                totals[key] += value
+            if result['claimed'] == 0:
+                return totals
+
+    def wake(self):
+        self._wake.set()
+
+    def ensure_started(self):
+        if not getattr(settings, 'EMAIL_OUTBOX_WORKER', True):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception as e:
+                logger.error(f"Email outbox worker error: {str(e)}")
+            finally:
+                close_old_connections()
+
+def enqueue_email(subject: str, text_body: str, to, html_body: str = None, from_email: str = None, category: str = ''):
+    """
+    Store an email in the outbox and return the row. The in-process worker is
+    woken after the surrounding transaction commits; `run_email_outbox` picks
+    up anything it misses.
+    """
+    from admin_dashboard.models import EmailOutbox
+
+    row = EmailOutbox.objects.create(
+        category=category,
+        subject=subject,
+        from_email=from_email,
+        to=[to] if isinstance(to, str) else list(to),
+        text_body=text_body,
+        html_body=html_body,
+        next_attempt_at=timezone.now(),
+    )
+    email_outbox_worker.ensure_started()
+    transaction.on_commit(email_outbox_worker.wake)
+    return row
+
+# Create singleton instance
+email_outbox_worker = EmailOutboxWorker()
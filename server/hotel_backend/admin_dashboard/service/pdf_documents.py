@@ -0,0 +1,112 @@
+# PDF layouts for receipts and monthly reports. These run inside the render
+# process pool, so they only take plain data and never touch Django.
+import matplotlib
+matplotlib.use('Agg')
+
+from matplotlib import pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+PAGE_SIZE = (8.27, 11.69)  # A4 in inches
+BRAND_COLOR = '#ba3d4f'
+
+def _money(value) -> str:
+    try:
+        return f"PHP {float(value or 0):,.2f}"
+    except (TypeError, ValueError):
+        return "PHP 0.00"
+
+def _new_page(title: str, subtitle: str = ''):
+    figure = plt.figure(figsize=PAGE_SIZE)
+    figure.text(0.08, 0.95, title, fontsize=18, fontweight='bold', color=BRAND_COLOR)
+    if subtitle:
+        figure.text(0.08, 0.925, subtitle, fontsize=9, color='#6b7280')
+    return figure
+
+def _draw_rows(figure, rows, top: float, line_height: float = 0.028):
+    y = top
+    for label, value in rows:
+        figure.text(0.08, y, label, fontsize=10, fontweight='bold', color='#1f1f1f')
+        figure.text(0.42, y, str(value if value not in (None, '') else 'N/A'), fontsize=10, color='#434343')
+        y -= line_height
+    return y
+
+def _draw_receipt(pdf, receipt: dict):
+    receipt_data = receipt.get('receipt_data') or {}
+    hotel = receipt_data.get('hotel_info') or {}
+    payment = receipt.get('payment_breakdown') or {}
+    user = receipt.get('user') or {}
+    guest_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() or 'Guest'
+
+    figure = _new_page(
+        hotel.get('name', 'Azurea Hotel'),
+        f"{hotel.get('address', '')}  |  {hotel.get('phone', '')}  |  {hotel.get('email', '')}"
+    )
+    figure.text(0.08, 0.87, 'Check-Out E-Receipt', fontsize=14, fontweight='bold')
+
+    y = _draw_rows(figure, [
+        ('Receipt Number', receipt_data.get('receipt_number')),
+        ('Issued', receipt_data.get('generated_at', '')[:19].replace('T', ' ')),
+        ('Guest Name', guest_name),
+        ('Booking ID', receipt.get('id')),
+        ('Property Type', receipt.get('property_type')),
+        ('Property Name', receipt.get('property_name')),
+        ('Check-in Date', receipt.get('check_in_date')),
+        ('Check-out Date', receipt.get('check_out_date')),
+        ('Duration', receipt.get('duration')),
+        ('Guests', receipt.get('number_of_guests')),
+    ], top=0.83)
+
+    figure.text(0.08, y - 0.02, 'Payment Breakdown', fontsize=12, fontweight='bold')
+    _draw_rows(figure, [
+        ('Total Amount', _money(payment.get('total_amount'))),
+        ('Down Payment', _money(payment.get('down_payment'))),
+        ('Remaining Balance', _money(payment.get('remaining_balance'))),
+        ('Payment Method', payment.get('payment_method')),
+        ('Payment Status', payment.get('payment_status')),
+    ], top=y - 0.055)
+
+    figure.text(0.08, 0.06, 'Thank you for staying with us at Azurea Hotel.', fontsize=9, color='#6b7280')
+    pdf.savefig(figure)
+    plt.close(figure)
+
+def render_receipts_pdf(receipts: list, output_path: str) -> int:
+    """One page per receipt payload. Returns the number of pages written."""
+    with PdfPages(output_path) as pdf:
+        for receipt in receipts:
+            _draw_receipt(pdf, receipt)
+    return len(receipts)
+
+def render_monthly_report_pdf(report: dict, output_path: str) -> int:
+    """Summary page plus a daily revenue chart. Returns the number of pages written."""
+    title = f"Monthly Revenue Report - {report['month_name']} {report['year']}"
+    with PdfPages(output_path) as pdf:
+        figure = _new_page('Azurea Hotel', title)
+        y = _draw_rows(figure, [
+            ('Total Revenue', _money(report.get('total_revenue'))),
+            ('Room Revenue', _money(report.get('room_revenue'))),
+            ('Venue Revenue', _money(report.get('area_revenue'))),
+            ('Bookings Created', report.get('total_bookings')),
+            ('Checked Out', report.get('checked_out')),
+            ('Cancelled', report.get('cancelled')),
+            ('Rejected', report.get('rejected')),
+        ], top=0.87)
+
+        top_properties = report.get('top_properties') or []
+        if top_properties:
+            figure.text(0.08, y - 0.02, 'Top Properties by Revenue', fontsize=12, fontweight='bold')
+            _draw_rows(figure, [
+                (item['name'], _money(item['revenue'])) for item in top_properties
+            ], top=y - 0.055)
+        pdf.savefig(figure)
+        plt.close(figure)
+
+        daily = report.get('daily_revenue') or []
+        figure = _new_page('Daily Revenue', title)
+        axes = figure.add_axes([0.1, 0.35, 0.82, 0.5])
+        axes.bar(range(1, len(daily) + 1), daily, color=BRAND_COLOR)
+        axes.set_xlabel('Day of month')
+        axes.set_ylabel('Revenue (PHP)')
+        axes.grid(axis='y', alpha=0.3)
+        pdf.savefig(figure)
+        plt.close(figure)
+    return 2
@@ -0,0 +1,218 @@
+import calendar
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from .pdf_documents import render_receipts_pdf, render_monthly_report_pdf
+
+logger = logging.getLogger(__name__)
+
+def _month_bounds(year: int, month: int):
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, 1), date(year, month, last_day)
+
+def collect_receipts(booking_ids) -> list:
+    from booking.models import Bookings
+    from booking.receipts import get_or_create_receipt
+
+    bookings = Bookings.objects.filter(
+        id__in=booking_ids, status='checked_out'
+    ).select_related('user', 'room', 'area').order_by('check_out_date', 'id')
+    return [get_or_create_receipt(booking).payload for booking in bookings]
+
+def monthly_receipt_booking_ids(year: int, month: int) -> list:
+    from booking.models import Bookings
+
+    start, end = _month_bounds(year, month)
+    return list(Bookings.objects.filter(
+        status='checked_out', check_out_date__range=(start, end)
+    ).values_list('id', flat=True))
+
+def build_monthly_report(year: int, month: int) -> dict:
+    from booking.models import Bookings, Transactions
+
+    start, end = _month_bounds(year, month)
+    transactions = Transactions.objects.filter(
+        status='completed', transaction_date__date__range=(start, end)
+    )
+
+    daily_revenue = [0.0] * end.day
+    for transaction_date, amount in transactions.values_list('transaction_date', 'amount'):
+        daily_revenue[transaction_date.day - 1] += float(amount)
+
+    room_revenue = transactions.filter(booking__is_venue_booking=False).aggregate(total=Sum('amount'))['total'] or 0
+    area_revenue = transactions.filter(booking__is_venue_booking=True).aggregate(total=Sum('amount'))['total'] or 0
+
+    top_properties = []
+    for name_field in ['booking__room__room_name', 'booking__area__area_name']:
+        rows = transactions.exclude(**{f'{name_field}__isnull': True}).values(name_field).annotate(revenue=Sum('amount'))
+        top_properties += [{'name': row[name_field], 'revenue': float(row['revenue'] or 0)} for row in rows]
+    top_properties.sort(key=lambda item: item['revenue'], reverse=True)
+
+    bookings = Bookings.objects.filter(created_at__date__range=(start, end))
+    return {
+        'year': year,
+        'month': month,
+        'month_name': calendar.month_name[month],
+        'daily_revenue': daily_revenue,
+        'total_revenue': sum(daily_revenue),
+        'room_revenue': float(room_revenue),
+        'area_revenue': float(area_revenue),
+        'total_bookings': bookings.count(),
+        'checked_out': bookings.filter(status='checked_out').count(),
+        'cancelled': bookings.filter(status='cancelled').count(),
+        'rejected': bookings.filter(status='rejected').count(),
+        'top_properties': top_properties[:10],
+    }
+
+class PdfRenderService:
+    """
+    Renders PDFs off the request thread. Data for a job is collected on a
+    small thread pool (it needs the ORM), then the layout work runs on a
+    `ProcessPoolExecutor` so matplotlib never holds Daphne's GIL. Job state
+    lives in `PdfRenderJob` rows so any process can answer status requests.
+
+    Jobs are only handed to a process in memory, so a restart loses whatever
+    was queued or running. `recover_stale_jobs` (run when a process first
+    starts its pools, and by `recover_pdf_jobs`) resubmits queued jobs older
+    than `PDF_RENDER_STALE_AFTER` and fails running ones that started before
+    it. A job is claimed with a conditional update, so resubmitting one that
+    is still waiting in another process never renders it twice.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PdfRenderService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.workers = getattr(settings, 'PDF_RENDER_WORKERS', 2)
+            self.output_dir = getattr(settings, 'PDF_RENDER_ROOT', os.path.join(settings.BASE_DIR, 'media', 'pdf_jobs'))
+            self.stale_after = getattr(settings, 'PDF_RENDER_STALE_AFTER', 600)
+            self._lock = threading.Lock()
+            self._processes = None
+            self._collectors = None
+            PdfRenderService._initialized = True
+
+    def _pools(self, recover: bool = True):
+        started = False
+        with self._lock:
+            if self._processes is None:
+                # Spawned workers do not inherit Daphne's threads or open DB sockets
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+                self._collectors = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pdf-collect')
+                started = True
+            pools = self._processes, self._collectors
+        if started and recover:
+            try:
+                self.recover_stale_jobs()
+            except Exception as e:
+                logger.error(f"Could not recover stale PDF jobs: {str(e)}")
+        return pools
+
+    def recover_stale_jobs(self, stale_after: int = None) -> dict:
+        """
+        Resubmit queued jobs and fail running jobs left behind by a process
+        that stopped. Returns the ids of both.
+        """
+        from admin_dashboard.models import PdfRenderJob
+
+        cutoff = timezone.now() - timedelta(seconds=self.stale_after if stale_after is None else stale_after)
+        interrupted = list(PdfRenderJob.objects.filter(
+            status='running', started_at__lt=cutoff
+        ).values_list('id', flat=True))
+        if interrupted:
+            PdfRenderJob.objects.filter(id__in=interrupted, status='running').update(
+                status='failed',
+                error='Interrupted before it finished; request the PDF again',
+                finished_at=timezone.now(),
+            )
+
+        requeued = list(PdfRenderJob.objects.filter(
+            status='queued', created_at__lt=cutoff
+        ).values_list('id', flat=True))
+        if requeued:
+            _, collectors = self._pools(recover=False)
+            for job_id in requeued:
+                collectors.submit(self._run, job_id)
+
+        return {'requeued': requeued, 'failed': interrupted}
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            processes, collectors = self._processes, self._collectors
+            self._processes = self._collectors = None
+        if collectors is not None:
+            collectors.shutdown(wait=wait)
+            processes.shutdown(wait=wait)
+
+    def submit(self, kind: str, params: dict, requested_by=None):
+        from admin_dashboard.models import PdfRenderJob
+
+        job = PdfRenderJob.objects.create(kind=kind, params=params, requested_by=requested_by)
+        _, collectors = self._pools()
+        transaction.on_commit(lambda: collectors.submit(self._run, job.id))
+        return job
+
+    def _collect(self, job):
+        params = job.params
+        if job.kind == 'receipt':
+            return render_receipts_pdf, collect_receipts([params['booking_id']])
+        if job.kind == 'monthly_receipts':
+            return render_receipts_pdf, collect_receipts(monthly_receipt_booking_ids(params['year'], params['month']))
+        if job.kind == 'monthly_report':
+            return render_monthly_report_pdf, build_monthly_report(params['year'], params['month'])
+        raise ValueError(f"Unknown PDF job kind: {job.kind}")
+
+    def _run(self, job_id: int):
+        from admin_dashboard.models import PdfRenderJob
+
+        # Another process (or an earlier resubmit) may already have this job
+        claimed = PdfRenderJob.objects.filter(id=job_id, status='queued').update(
+            status='running', started_at=timezone.now()
+        )
+        if not claimed:
+            close_old_connections()
+            return
+
+        job = PdfRenderJob.objects.get(id=job_id)
+        try:
+            renderer, data = self._collect(job)
+            if job.kind != 'monthly_report' and not data:
+                raise ValueError("No checked-out bookings to render")
+
+            os.makedirs(self.output_dir, exist_ok=True)
+            output_path = os.path.join(self.output_dir, f"{job.kind}_{job.id}.pdf")
+
+            processes, _ = self._pools()
+            started = time.perf_counter()
+            pages = processes.submit(renderer, data, output_path).result()
+
+            job.status = 'done'
+            job.file_path = output_path
+            job.pages = pages
+            job.render_ms = round((time.perf_counter() - started) * 1000, 2)
+        except Exception as e:
+            logger.error(f"PDF job {job_id} failed: {str(e)}")
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.finished_at = timezone.now()
+            job.save()
+            close_old_connections()
+
+# Create singleton instance
+pdf_render_service = PdfRenderService()
@@ -1,13 +1,12 @@
 import logging
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from booking.models import Bookings
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 from firebase_admin import db as firebase_db
-from channels.layers import get_channel_layer
+from admin_dashboard.service.broadcast import queue_active_count_update
+from admin_dashboard.service.booking_feed import queue_booking_delta
 from service.firebase import firebase_service
-from user_roles.models import Notification as UserNotification
+from user_roles.inbox import record_generic_booking_notification
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -115,47 +114,37 @@ def booking_post_save(sender, instance: Bookings, created: bool, **kwargs):
         # Persist an internal Notification DB record for audit/admin views
         try:
             if user is not None:
-                notif_type = 'booking_update'
-                UserNotification.objects.create(
-                    user=user,
-                    notification_type=notif_type,
-                    booking=instance,
-                    message=f'Booking #{booking_id} status updated to {curr_status}.',
+                record_generic_booking_notification(
+                    user,
+                    instance,
+                    curr_status,
+                    f'Booking #{booking_id} status updated to {curr_status}.',
                 )
         except Exception:
             logger.exception('Failed to create internal Notification record for booking ID %s', booking_id)
             
-        # Push active count update to channels group (admin dashboard realtime)
-        try:
-            if get_channel_layer is not None and async_to_sync is not None:
-                channel_layer = get_channel_layer()
-                include_statuses = ['pending', 'reserved', 'checked_in']
-                count = Bookings.objects.filter(status__in=include_statuses).count()
-                async_to_sync(channel_layer.group_send)(
-                    'admin_notifications',
-                    {
-                        'type': 'active_count_update',
-                        'count': count
-                    }
-                )
-        except Exception:
-            logger.exception('Failed to update Firebase Realtime Database for booking ID %s', booking_id)
     except Exception:
         logger.exception('Error in booking_post_save signal for booking ID %s', instance.id)
 
 @receiver(post_save, sender=Bookings)
 def send_active_count_update(sender, instance, created, **kwargs):
+    # Coalesced: a burst of saves results in one count query and one frame per window.
     try:
-        channel_layer = get_channel_layer()
-        include_statuses = ['pending', 'reserved', 'checked_in']
-        count = Bookings.objects.filter(status__in=include_statuses).count()
-        
-        async_to_sync(channel_layer.group_send)(
-            'admin_notifications',
-            {
-                'type': 'active_count_update',
-                'count': count
-            }
-        )
-    except Exception as e:
-        raise f"Error in send_active_count_update: {e}"
\ No newline at end of file
+        queue_active_count_update()
+    except Exception:
+        logger.exception('Failed to queue active count update for booking ID %s', instance.id)
+
+@receiver(post_save, sender=Bookings)
+def send_bookings_delta(sender, instance, created, **kwargs):
+    try:
+        queue_booking_delta(instance.id)
+    except Exception:
+        logger.exception('Failed to queue bookings delta for booking ID %s', instance.id)
+
+@receiver(post_delete, sender=Bookings)
+def send_bookings_delta_on_delete(sender, instance, **kwargs):
+    try:
+        queue_booking_delta(instance.id, removed=True)
+        queue_active_count_update()
+    except Exception:
+        logger.exception('Failed to queue bookings delta for deleted booking ID %s', instance.id)
@@ -57,6 +57,18 @@ urlpatterns = [
     path('booking/<int:booking_id>/status', views.update_booking_status, name='update_booking_status'),
     path('booking/<int:booking_id>/payment', views.record_payment, name='record_payment'),
     
+    # PDF rendering
+    path('pdf_jobs', views.create_pdf_job, name='create_pdf_job'),
+    path('pdf_jobs/<int:job_id>', views.pdf_job_status, name='pdf_job_status'),
+    path('pdf_jobs/<int:job_id>/download', views.download_pdf_job, name='download_pdf_job'),
+    
+    # Uploaded media when MEDIA_UPLOAD_BACKEND=local
+    path('local_media/<str:name>', views.local_media, name='local_media'),
+    
+    # Realtime
+    path('broadcast_metrics', views.broadcast_metrics, name='broadcast_metrics'),
+    path('db_pool_metrics', views.db_pool_metrics, name='db_pool_metrics'),
+    
     # Commission Tracking
     
 ]
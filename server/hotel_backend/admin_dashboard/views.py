@@ -1,42 +1,37 @@
 from django.utils import timezone
 from django.core.validators import ValidationError
-from django.core.files.uploadedfile import InMemoryUploadedFile
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from property.models import Areas, Rooms, Amenities, RoomImages, AreaImages
+from property.models import Areas, Rooms, Amenities
 from property.serializers import AreaSerializer, RoomSerializer, AmenitySerializer
 from booking.models import Bookings, Transactions
 from booking.serializers import BookingSerializer
+from booking.receipts import get_or_create_receipt
 from user_roles.models import CustomUsers, Notification
 from user_roles.serializers import CustomUserSerializer
 from user_roles.views import create_booking_notification
+from user_roles.presence import get_fanout_metrics
+from hotel_backend.db_pool import get_pool_metrics
+from hotel_backend.uploads import copy_request_data
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.db.models import Q, Sum, Count, Avg, Max
 from datetime import datetime, date, timedelta
 from .email.booking import send_booking_confirmation_email, send_booking_rejection_email, send_checkout_e_receipt
+from .service.broadcast import broadcast_coalescer, queue_active_count_update
+from .service.pdf_render import pdf_render_service
+from .service.media_uploads import media_upload_worker, get_local_media_backend
+from .models import PdfRenderJob
+from .serializers import PdfRenderJobSerializer
+from django.conf import settings
+from django.http import FileResponse, Http404
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import traceback
-import io
+import os
 from django.db.models import Sum, Count, Avg
 
-def convert_tempfile_to_inmemory(file):
-    if hasattr(file, 'temporary_file_path'):
-        file.seek(0)
-        content = file.read()
-        memfile = io.BytesIO(content)
-        return InMemoryUploadedFile(
-            memfile,
-            field_name=file.field_name,
-            name=file.name,
-            content_type=file.content_type,
-            size=file.size,
-            charset=file.charset,
-        )
-    return file
-
 def notify_user_for_verification(user, notification_type, message):
     try:
         notification = {
@@ -208,7 +203,7 @@ def fetch_rooms(request):
 @permission_classes([IsAuthenticated])
 def add_new_room(request):
     try:
-        data = request.data.copy()
+        data = copy_request_data(request.data)
 
         if 'room_price' in data and isinstance(data['room_price'], str):
             try:
@@ -241,10 +236,9 @@ def add_new_room(request):
             amenities = [int(a) for a in amenities]
             instance.amenities.set(amenities)
 
-            # Always use getlist for images
+            # Always use getlist for images; they are uploaded by the media worker
             images = request.FILES.getlist('images')
-            for img in images:
-                image_obj = RoomImages.objects.create(room=instance, room_image=img)
+            media_upload_worker.stage_many('room_image', instance, images)
             
             data = RoomSerializer(instance).data
             return Response({
@@ -307,7 +301,7 @@ def edit_room(request, room_id):
                 filtered_data['max_guests'] = 2
         serializer = RoomSerializer(room, data=filtered_data, partial=True)
     else:
-        data = request.data.copy()
+        data = copy_request_data(request.data)
         if 'room_price' in data and isinstance(data['room_price'], str):
             try:
                 price_str = data['room_price'].replace('₱', '').replace(',', '')
@@ -347,8 +341,7 @@ def edit_room(request, room_id):
             if img.room_image.url not in existing_image_url:
                 img.delete()
 
-        for img in new_images:
-            RoomImages.objects.create(room=instance, room_image=img)
+        media_upload_worker.stage_many('room_image', instance, new_images)
 
         return Response({
             "message": "Room updated successfully",
@@ -422,7 +415,7 @@ def fetch_areas(request):
 @permission_classes([IsAuthenticated])
 def add_new_area(request):
     try:
-        data = request.data.copy()
+        data = copy_request_data(request.data)
                 
         if 'price_per_hour' in data and isinstance(data['price_per_hour'], str):
             try:
@@ -444,9 +437,7 @@ def add_new_area(request):
             instance = serializer.save()
             
             images = request.FILES.getlist('images')
-            
-            for img in images:
-                image_obj = AreaImages.objects.create(area=instance, area_image=img)
+            media_upload_worker.stage_many('area_image', instance, images)
             
             data = AreaSerializer(instance).data
             
@@ -486,7 +477,7 @@ def edit_area(request, area_id):
         area = Areas.objects.get(id=area_id)
     except Areas.DoesNotExist:
         return Response({"error": "Area not found"}, status=status.HTTP_404_NOT_FOUND)
-    data = request.data.copy()
+    data = copy_request_data(request.data)
 
     if 'discount_percent' in data:
         try:
@@ -509,8 +500,7 @@ def edit_area(request, area_id):
             if img.area_image.url not in existing_image_urls:
                 img.delete()
                 
-        for img in new_images:
-            AreaImages.objects.create(area=instance, area_image=img)
+        media_upload_worker.stage_many('area_image', instance, new_images)
                 
         return Response({
             "message": "Area updated successfully",
@@ -822,8 +812,9 @@ def update_booking_status(request, booking_id):
                 notification_message = f"You've been checked in to {property_name}."
             elif status_value == 'checked_out':
                 notification_message = f"You've been checked out from {property_name}."
+                receipt = get_or_create_receipt(booking, request.user)
                 user_email = booking.user.email
-                send_checkout_e_receipt(user_email, serializer.data)
+                send_checkout_e_receipt(user_email, receipt.payload)
             elif status_value == 'rejected':
                 reason = booking.cancellation_reason or "No reason provided"
                 notification_message = f"Your booking for {property_name} was rejected. Reason: {reason}"
@@ -855,17 +846,7 @@ def update_booking_status(request, booking_id):
             room.save()
     
     try:
-        channel_layer = get_channel_layer()
-        active_statuses = ['pending', 'reserved', 'confirmed', 'checked_in']
-        active_count = Bookings.objects.filter(status__in=active_statuses).count()
-        
-        async_to_sync(channel_layer.group_send)(
-            'admin_notifications',
-            {
-                'type': 'active_count_update',
-                'count': active_count
-            }
-        )
+        queue_active_count_update()
     except Exception as e:
         print(f"WebSocket notification error: {str(e)}")
     
@@ -874,6 +855,112 @@ def update_booking_status(request, booking_id):
         "data": serializer.data
     }, status=status.HTTP_200_OK)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def broadcast_metrics(request):
+    try:
+        return Response({
+            "data": {
+                **broadcast_coalescer.get_metrics(),
+                "notification_fanout": get_fanout_metrics(),
+            }
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def db_pool_metrics(request):
+    try:
+        return Response({
+            "data": get_pool_metrics()
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_pdf_job(request):
+    try:
+        kind = request.data.get('kind')
+        is_admin = request.user.role == 'admin' or request.user.is_staff
+        
+        if kind == 'receipt':
+            booking_id = request.data.get('booking_id')
+            booking = Bookings.objects.filter(id=booking_id).first()
+            if not booking:
+                return Response({"error": "Booking not found"}, status=status.HTTP_404_NOT_FOUND)
+            if not is_admin and booking.user_id != request.user.id:
+                return Response({"error": "You don't have permission to access this booking"}, status=status.HTTP_403_FORBIDDEN)
+            if booking.status != 'checked_out':
+                return Response({"error": "E-Receipt can only be generated for checked-out bookings"}, status=status.HTTP_400_BAD_REQUEST)
+            params = {'booking_id': booking.id}
+        elif kind in ['monthly_receipts', 'monthly_report']:
+            if not is_admin:
+                return Response({"error": "Only admins can generate monthly documents"}, status=status.HTTP_403_FORBIDDEN)
+            month = int(request.data.get('month', timezone.now().month))
+            year = int(request.data.get('year', timezone.now().year))
+            if not 1 <= month <= 12:
+                return Response({"error": "Invalid month"}, status=status.HTTP_400_BAD_REQUEST)
+            params = {'month': month, 'year': year}
+        else:
+            return Response({"error": "kind must be receipt, monthly_receipts or monthly_report"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        job = pdf_render_service.submit(kind, params, requested_by=request.user)
+        return Response({
+            "data": PdfRenderJobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def _get_pdf_job(request, job_id):
+    job = PdfRenderJob.objects.filter(id=job_id).first()
+    if job is None:
+        return None
+    if job.requested_by_id != request.user.id and not (request.user.role == 'admin' or request.user.is_staff):
+        return None
+    return job
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def pdf_job_status(request, job_id):
+    try:
+        job = _get_pdf_job(request, job_id)
+        if job is None:
+            return Response({"error": "PDF job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            "data": PdfRenderJobSerializer(job).data
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_pdf_job(request, job_id):
+    try:
+        job = _get_pdf_job(request, job_id)
+        if job is None:
+            return Response({"error": "PDF job not found"}, status=status.HTTP_404_NOT_FOUND)
+        if job.status != 'done' or not job.file_path or not os.path.exists(job.file_path):
+            return Response({"error": "PDF is not ready", "status": job.status}, status=status.HTTP_409_CONFLICT)
+        return FileResponse(
+            open(job.file_path, 'rb'),
+            as_attachment=True,
+            filename=os.path.basename(job.file_path),
+            content_type='application/pdf'
+        )
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def local_media(request, name):
+    # Files written by MEDIA_UPLOAD_BACKEND=local; Cloudinary serves its own
+    if getattr(settings, 'MEDIA_UPLOAD_BACKEND', 'cloudinary') != 'local':
+        raise Http404("Local media is disabled")
+    path = get_local_media_backend().find(name)
+    if path is None:
+        raise Http404("Media not found")
+    return FileResponse(open(path, 'rb'))
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def record_payment(request, booking_id):
@@ -0,0 +1,17 @@
+from hotel_backend.pooled_mysql import base
+from booking.craveon_guard import craveon_guard
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Pooled MySQL backend for the CraveOn alias. Connecting and every query go
+    through `craveon_guard`, so an unreachable or slow CraveOn trips the
+    circuit breaker and concurrency limit instead of stalling hotel requests.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(craveon_guard.execute_wrapper)
+
+    def get_new_connection(self, conn_params):
+        # Runs before Django wraps driver errors, so count the driver's own exceptions
+        with craveon_guard.guarded('connect', (self.Database.OperationalError, self.Database.InterfaceError)):
+            return super().get_new_connection(conn_params)
@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CraveOnUnavailable(Exception):
+    """Raised instead of calling CraveOn while its circuit is open or its concurrency limit is reached."""
+    def __init__(self, reason: str, retry_after: int):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"CraveOn is temporarily unavailable ({reason})")
+
+class CraveOnGuard:
+    """
+    Circuit breaker and bulkhead for the CraveOn database.
+
+    After `CRAVEON_BREAKER_FAILURE_THRESHOLD` consecutive connection or
+    timeout errors the circuit opens and calls fail immediately for
+    `CRAVEON_BREAKER_RESET_TIMEOUT` seconds. The first call after that is let
+    through as a probe: success closes the circuit, failure re-opens it.
+    At most `CRAVEON_MAX_CONCURRENCY` calls run at once; further callers wait
+    up to `CRAVEON_BULKHEAD_WAIT` seconds for a slot and are then rejected, so
+    a slow CraveOn cannot tie up every server thread.
+
+    A call is the outermost `guarded()` block on a thread. Queries outside one
+    are guarded one by one; multi-statement work such as placing an order
+    opens a block around its transaction, so it is admitted (or rejected)
+    once, holds a single slot, and is never cut off halfway by the breaker.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self.failure_threshold = getattr(settings, 'CRAVEON_BREAKER_FAILURE_THRESHOLD', 5)
+        self.reset_timeout = getattr(settings, 'CRAVEON_BREAKER_RESET_TIMEOUT', 30)
+        self.max_concurrency = getattr(settings, 'CRAVEON_MAX_CONCURRENCY', 8)
+        self.bulkhead_wait = getattr(settings, 'CRAVEON_BULKHEAD_WAIT', 0.5)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._in_flight = 0
+        self._local = threading.local()
+        self._metrics = {
+            'times_opened': 0,
+            'rejected_open': 0,
+            'rejected_bulkhead': 0,
+            'last_failure': None,
+            'last_failure_at': None,
+            'operations': {},
+        }
+        self._initialized = True
+
+    def _operation_metrics(self, operation: str) -> dict:
+        if operation not in self._metrics['operations']:
+            self._metrics['operations'][operation] = {
+                'calls': 0,
+                'failed': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+            }
+        return self._metrics['operations'][operation]
+
+    def _retry_after(self) -> int:
+        return max(1, int(self._opened_at + self.reset_timeout - time.time()))
+
+    def _admit(self) -> bool:
+        """Let a call through or raise; returns True when the call is the half-open probe."""
+        with self._lock:
+            if self._state == OPEN and time.time() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("CraveOn circuit half-open, probing")
+
+            if self._state == CLOSED:
+                return False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self._metrics['rejected_open'] += 1
+            raise CraveOnUnavailable('circuit_open', self._retry_after())
+
+    def _record(self, operation: str, elapsed_ms: float, error: Exception = None, probe: bool = False):
+        with self._lock:
+            metrics = self._operation_metrics(operation)
+            metrics['calls'] += 1
+            metrics['total_ms'] += elapsed_ms
+            metrics['max_ms'] = max(metrics['max_ms'], round(elapsed_ms, 3))
+            if probe:
+                self._probe_in_flight = False
+
+            # Calls admitted before the circuit opened may finish later; only the probe decides half-open
+            if error is None:
+                if probe:
+                    self._state = CLOSED
+                    logger.info("CraveOn circuit closed")
+                if self._state == CLOSED:
+                    self._failures = 0
+                return
+
+            metrics['failed'] += 1
+            self._failures += 1
+            self._metrics['last_failure'] = str(error)
+            self._metrics['last_failure_at'] = time.time()
+            if probe or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.time()
+                self._metrics['times_opened'] += 1
+                logger.warning(f"CraveOn circuit opened after {self._failures} failures: {str(error)}")
+
+    @contextmanager
+    def guarded(self, operation: str, failure_types: tuple = (OperationalError, InterfaceError)):
+        """
+        Run the block as one CraveOn call. Only `failure_types` (connection
+        refused, lost or timed out) count against the circuit; other errors
+        such as bad SQL still mean CraveOn answered. Blocks nested inside
+        another on the same thread run as part of the outer call.
+        """
+        if getattr(self._local, 'depth', 0):
+            yield
+            return
+
+        probe = self._admit()
+        if not self._slots.acquire(timeout=self.bulkhead_wait):
+            with self._lock:
+                if probe:
+                    self._probe_in_flight = False
+                self._metrics['rejected_bulkhead'] += 1
+            raise CraveOnUnavailable('bulkhead_full', 1)
+
+        with self._lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        self._local.depth = 1
+        try:
+            yield
+        except BaseException as e:
+            error = e if isinstance(e, failure_types) else None
+            self._record(operation, (time.perf_counter() - started) * 1000, error=error, probe=probe)
+            raise
+        else:
+            self._record(operation, (time.perf_counter() - started) * 1000, probe=probe)
+        finally:
+            self._local.depth = 0
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """`connection.execute_wrappers` hook; a query outside a `guarded()` block is a call of its own."""
+        operation = sql.lstrip().split(None, 1)[0].lower() if sql.strip() else 'query'
+        with self.guarded(operation):
+            return execute(sql, params, many, context)
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'in_flight': self._in_flight,
+                'max_concurrency': self.max_concurrency,
+                'retry_after': self._retry_after() if self._state == OPEN else 0,
+                **{key: value for key, value in self._metrics.items() if key != 'operations'},
+                'operations': {
+                    operation: {
+                        **values,
+                        'total_ms': round(values['total_ms'], 3),
+                        'avg_ms': round(values['total_ms'] / values['calls'], 3) if values['calls'] else 0.0,
+                    }
+                    for operation, values in self._metrics['operations'].items()
+                },
+            }
+
+def craveon_unavailable_response(error: CraveOnUnavailable) -> Response:
+    response = Response({
+        "error": "Food ordering is temporarily unavailable. Please try again shortly.",
+        "reason": error.reason,
+        "retry_after": error.retry_after,
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = str(error.retry_after)
+    return response
+
+# Create singleton instance
+craveon_guard = CraveOnGuard()
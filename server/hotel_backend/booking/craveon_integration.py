@@ -1,50 +1,95 @@
-from django.db import connections
-from .models import CraveOnItem
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connections, transaction
+from user_roles.models import CustomUsers
+from .models import CraveOnItem, CraveOnUserLink
+from .menu_catalog import menu_catalog
+from .craveon_guard import CraveOnUnavailable
 from typing import Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+FOOD_REVIEWS_CACHE_KEY = 'craveon:food_reviews:{user_id}'
+
 class CraveOnIntegration:
     @staticmethod
-    def get_or_create_craveon_user(hotel_user, booking) -> int:
+    def get_craveon_user_id(hotel_user):
         """
-        Get existing CraveOn user by email or create a new one.
-        Returns the CraveOn user_id (auto-incremented).
+        The guest's linked CraveOn user_id, or None if they have never ordered.
+        Only reads the hotel database.
         """
+        return CraveOnUserLink.objects.filter(
+            user_id=hotel_user.pk
+        ).values_list('craveon_user_id', flat=True).first()
+
+    @staticmethod
+    def _find_or_insert_craveon_user(hotel_user) -> int:
         cursor = connections['SystemInteg'].cursor()
+        cursor.execute(
+            "SELECT user_id FROM users WHERE email = %s AND is_archived = FALSE ORDER BY user_id",
+            [hotel_user.email]
+        )
+        candidate_ids = [row[0] for row in cursor.fetchall()]
+        # An account already linked to a different guest (e.g. after an email change) is not shared
+        linked_ids = set(CraveOnUserLink.objects.filter(
+            craveon_user_id__in=candidate_ids
+        ).values_list('craveon_user_id', flat=True))
+        for user_id in candidate_ids:
+            if user_id not in linked_ids:
+                logger.info(f"Found existing CraveOn user with ID: {user_id} for email: {hotel_user.email}")
+                return user_id
+
+        logger.info(f"Creating new CraveOn user for email: {hotel_user.email}")
+        cursor.execute(
+            """INSERT INTO users (first_name, last_name, email, contact, address, password, is_archived, status) 
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+            [
+                hotel_user.first_name,
+                hotel_user.last_name,
+                hotel_user.email,
+                getattr(hotel_user, 'phone_number', '') or '',
+                '',
+                'hotel_guest_temp_password',
+                False,
+                'Active'
+            ]
+        )
         
+        new_user_id = cursor.lastrowid
+        logger.info(f"Created new CraveOn user with ID: {new_user_id}")
+        return new_user_id
+
+    @staticmethod
+    def get_or_create_craveon_user(hotel_user, booking=None) -> int:
+        """
+        Get the guest's CraveOn user_id from the link table, or link them on
+        their first order: an existing CraveOn account with the same email is
+        reused, otherwise a new one is created.
+        The guest's row is locked while linking so concurrent first orders
+        cannot create two CraveOn users. Call this outside any CraveOn
+        transaction, so a new CraveOn user is committed before the link to it.
+        """
+        craveon_user_id = CraveOnIntegration.get_craveon_user_id(hotel_user)
+        if craveon_user_id:
+            return craveon_user_id
+
         try:
-            cursor.execute(
-                "SELECT user_id FROM users WHERE email = %s AND is_archived = FALSE", 
-                [hotel_user.email]
-            )
-            result = cursor.fetchone()
-            
-            if result:
-                logger.info(f"Found existing CraveOn user with ID: {result[0]} for email: {hotel_user.email}")
-                return result[0]
-            
-            logger.info(f"Creating new CraveOn user for email: {hotel_user.email}")
-            cursor.execute(
-                """INSERT INTO users (first_name, last_name, email, contact, address, password, is_archived, status) 
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
-                [
-                    hotel_user.first_name,
-                    hotel_user.last_name,
-                    hotel_user.email,
-                    getattr(hotel_user, 'phone_number', '') or '',
-                    '',
-                    'hotel_guest_temp_password',
-                    False,
-                    'Active'
-                ]
-            )
-            
-            new_user_id = cursor.lastrowid
-            logger.info(f"Created new CraveOn user with ID: {new_user_id}")
-            return new_user_id
-            
+            with transaction.atomic():
+                list(CustomUsers.objects.select_for_update().filter(pk=hotel_user.pk).values_list('pk', flat=True))
+                craveon_user_id = CraveOnIntegration.get_craveon_user_id(hotel_user)
+                if craveon_user_id:
+                    return craveon_user_id
+
+                craveon_user_id = CraveOnIntegration._find_or_insert_craveon_user(hotel_user)
+                CraveOnUserLink.objects.create(user_id=hotel_user.pk, craveon_user_id=craveon_user_id)
+                return craveon_user_id
+        except IntegrityError:
+            # Another request linked this guest first (databases without row locks)
+            craveon_user_id = CraveOnIntegration.get_craveon_user_id(hotel_user)
+            if craveon_user_id:
+                return craveon_user_id
+            raise
         except Exception as e:
             logger.error(f"Error managing CraveOn user: {str(e)}")
             raise
@@ -90,56 +135,69 @@ class CraveOnIntegration:
     @staticmethod
     def add_order_items(order_id: int, cart_items: list):
         """
-        Add items to the CraveOn order.
+        Add items to the CraveOn order with a single batched INSERT.
         """
         cursor = connections['SystemInteg'].cursor()
         
         try:
-            for item in cart_items:
-                cursor.execute(
-                    "INSERT INTO order_items (order_id, item_id, quantity) VALUES (%s, %s, %s)",
-                    [order_id, item.get('item_id'), item.get('quantity', 1)]
-                )
+            cursor.executemany(
+                "INSERT INTO order_items (order_id, item_id, quantity) VALUES (%s, %s, %s)",
+                [[order_id, item.get('item_id'), item.get('quantity', 1)] for item in cart_items]
+            )
                         
         except Exception as e:
             print(f"Error adding items to CraveOn order: {str(e)}")
             raise
     
+    @staticmethod
+    def merge_cart_lines(cart_items: list) -> Dict[int, int]:
+        """
+        Quantities per item ID in first-seen order, with repeated lines for
+        the same item added together.
+        """
+        quantities = {}
+        for item in cart_items:
+            try:
+                item_id = int(item.get('item_id') or 0)
+                quantity = int(item.get('quantity', 1))
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid item or quantity: {item}")
+
+            if not item_id or quantity <= 0:
+                raise ValueError(f"Invalid item or quantity: {item}")
+            quantities[item_id] = quantities.get(item_id, 0) + quantity
+        return quantities
+
     @staticmethod
     def validate_cart_items(cart_items: list) -> Dict[str, Any]:
         """
         Validate cart items and calculate total amount.
         Returns dict with validation results and total amount.
+        Prices come from the menu snapshot; `confirm_cart_prices` re-checks
+        them against CraveOn when the order is written.
         """
         
         total_amount = 0
         validated_items = []
         
         try:
-            for item in cart_items:
-                item_id = item.get('item_id')
-                quantity = int(item.get('quantity', 1))
-                
-                if not item_id or quantity <= 0:
-                    raise ValueError(f"Invalid item or quantity: {item}")
-                
-                craveon_item = CraveOnItem.objects.using('SystemInteg').filter(
-                    item_id=item_id,
-                    is_archived=False
-                ).first()
-                
-                if not craveon_item:
+            quantities = CraveOnIntegration.merge_cart_lines(cart_items)
+            menu_items = menu_catalog.get_items(quantities)
+
+            for item_id, quantity in quantities.items():
+                menu_item = menu_items.get(item_id)
+                if not menu_item:
                     raise ValueError(f"Item with ID {item_id} not found or archived")
                 
-                item_total = float(craveon_item.price) * quantity
+                item_total = menu_item['price'] * quantity
                 total_amount += item_total
                 
                 validated_items.append({
                     'item_id': item_id,
                     'quantity': quantity,
-                    'price': float(craveon_item.price),
+                    'price': menu_item['price'],
                     'item_total': item_total,
-                    'name': craveon_item.item_name
+                    'name': menu_item['name']
                 })
             
             return {
@@ -149,6 +207,8 @@ class CraveOnIntegration:
                 'item_count': len(validated_items)
             }
             
+        except CraveOnUnavailable:
+            raise
         except Exception as e:
             print(f"Cart validation error: {str(e)}")
             return {
@@ -159,6 +219,33 @@ class CraveOnIntegration:
                 'item_count': 0
             }
 
+    @staticmethod
+    def confirm_cart_prices(validated_items: list) -> list:
+        """
+        Re-read the ordered items from CraveOn in one query and list every line
+        whose item was archived or repriced since the menu snapshot was taken.
+        Called inside the order transaction, right before the order is written.
+        """
+        current = {
+            craveon_item.item_id: craveon_item
+            for craveon_item in CraveOnItem.objects.using('SystemInteg').filter(
+                item_id__in=[item['item_id'] for item in validated_items],
+                is_archived=False
+            ).only('item_id', 'item_name', 'price')
+        }
+
+        changes = []
+        for item in validated_items:
+            craveon_item = current.get(item['item_id'])
+            if not craveon_item:
+                changes.append(f"{item['name']} is no longer available")
+            elif float(craveon_item.price) != item['price']:
+                changes.append(f"{item['name']} now costs {float(craveon_item.price):.2f}")
+
+        if changes:
+            menu_catalog.invalidate()
+        return changes
+
     @staticmethod
     def get_order_details(order_id: int) -> Dict[str, Any]:
         """
@@ -218,6 +305,67 @@ class CraveOnIntegration:
             logger.error(f"Error getting order details: {str(e)}")
             return {'found': False, 'error': str(e)}
 
+    @staticmethod
+    def get_food_review_summary(hotel_user) -> Dict[str, list]:
+        """
+        The guest's reviewed and reviewable food orders, read with one CraveOn
+        query keyed on their linked user_id. Cached per guest until they review
+        an order or the order status feed sees one of their orders close.
+        """
+        cache_key = FOOD_REVIEWS_CACHE_KEY.format(user_id=hotel_user.pk)
+        summary = cache.get(cache_key)
+        if summary is not None:
+            return summary
+
+        summary = {'reviews': [], 'reviewable_orders': []}
+        craveon_user_id = CraveOnIntegration.get_craveon_user_id(hotel_user)
+        if craveon_user_id:
+            with connections['SystemInteg'].cursor() as cursor:
+                cursor.execute("""
+                    SELECT o.order_id, o.total_amount, o.guest_name, o.hotel_room_area, o.ordered_at, o.status,
+                           r.id, r.rating, r.comment, r.created_at
+                    FROM orders o
+                    LEFT JOIN reviews r ON r.order_id = o.order_id
+                    WHERE o.user_id = %s
+                    AND (r.id IS NOT NULL OR o.status = 'Completed')
+                    ORDER BY o.ordered_at DESC
+                """, [craveon_user_id])
+                rows = cursor.fetchall()
+
+            for (order_id, total_amount, guest_name, hotel_room_area, ordered_at, order_status,
+                 review_id, rating, comment, reviewed_at) in rows:
+                if review_id is None:
+                    summary['reviewable_orders'].append({
+                        'order_id': order_id,
+                        'total_amount': float(total_amount),
+                        'guest_name': guest_name,
+                        'hotel_room_area': hotel_room_area,
+                        'ordered_at': ordered_at,
+                        'status': order_status
+                    })
+                else:
+                    summary['reviews'].append({
+                        'id': review_id,
+                        'order_id': order_id,
+                        'rating': rating,
+                        'comment': comment,
+                        'created_at': reviewed_at,
+                        'order_details': {
+                            'total_amount': float(total_amount),
+                            'guest_name': guest_name,
+                            'hotel_room_area': hotel_room_area,
+                            'ordered_at': ordered_at
+                        }
+                    })
+            summary['reviews'].sort(key=lambda review: review['created_at'], reverse=True)
+
+        cache.set(cache_key, summary, getattr(settings, 'CRAVEON_FOOD_REVIEWS_CACHE_TIMEOUT', 300))
+        return summary
+
+    @staticmethod
+    def invalidate_food_review_summary(*user_ids):
+        cache.delete_many([FOOD_REVIEWS_CACHE_KEY.format(user_id=user_id) for user_id in user_ids])
+
     @staticmethod
     def update_order_status(order_id: int, new_status: str) -> bool:
         """
@@ -0,0 +1,243 @@
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models import CharField, F, Func
+from django.urls import reverse
+from admin_dashboard.service.image_processing import render_sizes
+
+logger = logging.getLogger(__name__)
+
+# Item images only change when CraveOn replaces the BLOB, which also changes its MD5
+FOOD_IMAGE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Renders are serialized per item through one of these locks
+ITEM_LOCK_STRIPES = 64
+
+_SIGNATURES = [
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'BM', 'image/bmp'),
+]
+
+CACHE_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/bmp': 'bmp',
+    'image/webp': 'webp',
+}
+CACHE_CONTENT_TYPES = {extension: mime for mime, extension in CACHE_EXTENSIONS.items()}
+
+def image_md5():
+    """MD5 of the `items.image` BLOB, computed by the database so the bytes never leave it."""
+    return Func(F('image'), function='MD5', output_field=CharField())
+
+def sniff_image_mime(data: bytes) -> str:
+    if not data:
+        return 'application/octet-stream'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    for signature, mime in _SIGNATURES:
+        if data.startswith(signature):
+            return mime
+    return 'image/jpeg'
+
+def image_digest(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+def image_version(digest: str) -> str:
+    return digest[:12]
+
+def food_image_url(request, item_id: int, digest: str, size: str = None) -> str:
+    """Versioned by digest, so clients can cache the URL for a year and still see replacements."""
+    url = f"{reverse('food_image', args=[item_id])}?v={image_version(digest)}"
+    if size:
+        url += f"&size={size}"
+    return request.build_absolute_uri(url) if request else url
+
+class FoodImageCache:
+    """
+    CraveOn item images rendered once per `(item_id, version, size)` and kept
+    on local disk as `{root}/{item_id}/{version}_{size}.{ext}`, where the
+    version is the start of the BLOB's MD5. Writing a new version drops the
+    item's older files, and once the cache outgrows
+    `CRAVEON_IMAGE_CACHE_MAX_BYTES` the least recently served files are removed
+    until it is back under 90% of the limit. File mtimes record last use.
+
+    Each process keeps its own index of the directory, so every store
+    re-scans it first: the size limit and LRU order then cover files written
+    and served by other processes too. Renders are serialized per item, so
+    concurrent misses read and render an image once per process.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._lock = threading.Lock()
+        self._item_locks = [threading.RLock() for _ in range(ITEM_LOCK_STRIPES)]
+        # (item_id, version, size) -> (path, bytes), ordered oldest use first
+        self._entries = None
+        self._total_bytes = 0
+        self._initialized = True
+
+    @property
+    def root(self) -> str:
+        return getattr(settings, 'CRAVEON_IMAGE_CACHE_ROOT', os.path.join(settings.BASE_DIR, 'media', 'craveon_images'))
+
+    @property
+    def max_bytes(self) -> int:
+        return getattr(settings, 'CRAVEON_IMAGE_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+
+    def sizes(self) -> dict:
+        return getattr(settings, 'CRAVEON_IMAGE_SIZES', {'thumb': 160, 'card': 480, 'full': 1024})
+
+    def _item_lock(self, item_id: int):
+        return self._item_locks[item_id % ITEM_LOCK_STRIPES]
+
+    def _load(self, rescan: bool = False):
+        """Index whatever is on disk, oldest use first."""
+        if self._entries is not None and not rescan:
+            return
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            item_dir = os.path.basename(dirpath)
+            if not item_dir.isdigit():
+                continue
+            for filename in filenames:
+                stem, ext = os.path.splitext(filename)
+                version, _, size = stem.partition('_')
+                if not size or ext[1:] not in CACHE_CONTENT_TYPES:
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, (int(item_dir), version, size), path, stat.st_size))
+
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        for _, key, path, nbytes in sorted(found):
+            self._entries[key] = (path, nbytes)
+            self._total_bytes += nbytes
+
+    def lookup(self, item_id: int, version: str, size: str):
+        """Path of a cached rendition, or None. A hit marks it as recently used."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get((item_id, version, size))
+            if entry is None:
+                return None
+            path = entry[0]
+            try:
+                os.utime(path)
+            except OSError:
+                # Evicted by another process
+                self._forget((item_id, version, size))
+                return None
+            self._entries.move_to_end((item_id, version, size))
+            return path
+
+    def fetch(self, item_id: int, version: str, size: str, read_image):
+        """
+        `(version, path)` of a rendition, rendering the image on a miss.
+        `read_image()` returns the item's current bytes (or None). Their digest
+        decides the version that is stored, since the expected `version` can
+        trail an image replacement. The path is None when there is no image.
+        """
+        path = self.lookup(item_id, version, size)
+        if path is not None:
+            return version, path
+
+        with self._item_lock(item_id):
+            # Another request may have rendered it while this one waited
+            path = self.lookup(item_id, version, size)
+            if path is None:
+                data = read_image()
+                if not data:
+                    return version, None
+                data = bytes(data)
+                version = image_version(image_digest(data))
+                path = self.lookup(item_id, version, size)
+                if path is None:
+                    self.store(item_id, version, data)
+                    path = self.lookup(item_id, version, size) or self.lookup(item_id, version, 'original')
+        return version, path
+
+    def store(self, item_id: int, version: str, data: bytes):
+        """
+        Write the original bytes plus every configured size for one image
+        version, replacing any older version of the item. Images Pillow cannot
+        read are kept as the original only, which callers fall back to.
+        """
+        with self._item_lock(item_id):
+            renditions = {'original': (data, CACHE_EXTENSIONS.get(sniff_image_mime(data), 'jpg'))}
+            for name, image in render_sizes(io.BytesIO(data), self.sizes()).items():
+                renditions[name] = (image.content, image.extension)
+
+            item_dir = os.path.join(self.root, str(item_id))
+            os.makedirs(item_dir, exist_ok=True)
+            for size, (content, extension) in renditions.items():
+                path = os.path.join(item_dir, f"{version}_{size}.{extension}")
+                # Write beside the target and rename, so readers never see a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=item_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as tmp:
+                    tmp.write(content)
+                os.replace(tmp_path, path)
+
+            with self._lock:
+                # Re-scan so files other processes wrote count toward the limit
+                self._load(rescan=True)
+                stale = [key for key in self._entries if key[0] == item_id and key[1] != version]
+                for key in stale:
+                    self._remove(key)
+                self._evict()
+
+    def _forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+        return entry
+
+    def _remove(self, key):
+        entry = self._forget(key)
+        if entry is not None:
+            try:
+                os.remove(entry[0])
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        while self._entries and self._total_bytes > target:
+            self._remove(next(iter(self._entries)))
+        logger.info(f"CraveOn image cache evicted down to {self._total_bytes} bytes")
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._entries = OrderedDict()
+            self._total_bytes = 0
+
+def content_type_for(path: str) -> str:
+    return CACHE_CONTENT_TYPES.get(os.path.splitext(path)[1][1:], 'application/octet-stream')
+
+# Create singleton instance
+food_image_cache = FoodImageCache()
@@ -0,0 +1,46 @@
+import os
+import re
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+SQL_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'sql', 'craveon_review_indexes.sql')
+CREATE_INDEX = re.compile(r'CREATE\s+INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)', re.IGNORECASE)
+
+class Command(BaseCommand):
+    help = 'Create the recommended CraveOn indexes (booking/sql/craveon_review_indexes.sql) that are missing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='List missing indexes without creating them')
+
+    def handle(self, *args, **options):
+        with open(SQL_PATH) as sql_file:
+            sql = '\n'.join(line for line in sql_file if not line.strip().startswith('--'))
+
+        connection = connections['SystemInteg']
+        created = 0
+        for statement in filter(None, (part.strip() for part in sql.split(';'))):
+            match = CREATE_INDEX.match(statement)
+            if not match:
+                continue
+            name, table, columns = match.group(1), match.group(2), [c.strip() for c in match.group(3).split(',')]
+
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(cursor, table)
+                existing = next(
+                    (
+                        index_name for index_name, details in constraints.items()
+                        if index_name == name or details['columns'] == columns
+                    ),
+                    None
+                )
+                if existing:
+                    self.stdout.write(f"{table}: {existing} already covers ({', '.join(columns)})")
+                    continue
+                if options['dry_run']:
+                    self.stdout.write(f"{table}: would create {name}")
+                    continue
+                cursor.execute(statement)
+            created += 1
+            self.stdout.write(f"{table}: created {name}")
+
+        self.stdout.write(self.style.SUCCESS(f"CraveOn indexes checked, {created} created"))
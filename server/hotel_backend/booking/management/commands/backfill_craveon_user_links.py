@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from booking.models import CraveOnUserLink
+from user_roles.models import CustomUsers
+
+class Command(BaseCommand):
+    help = (
+        'Link existing hotel guests to their CraveOn users by email, so food orders and reviews '
+        'can be looked up by CraveOn user_id'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Guests matched per CraveOn query')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be linked without writing')
+        parser.add_argument(
+            '--merge-duplicates',
+            action='store_true',
+            help='Move orders placed under duplicate CraveOn users with the same email onto the linked user'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        linked_ids = set(CraveOnUserLink.objects.values_list('craveon_user_id', flat=True))
+        unlinked = CustomUsers.objects.filter(
+            craveon_link__isnull=True
+        ).exclude(email='').order_by('pk').values_list('pk', 'email')
+
+        created = 0
+        unmatched = 0
+        duplicates = {}
+        last_pk = 0
+        while True:
+            batch = list(unlinked.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+
+            emails = {email.lower() for _, email in batch}
+            placeholders = ', '.join(['%s'] * len(emails))
+            with connections['SystemInteg'].cursor() as cursor:
+                cursor.execute(
+                    f"SELECT user_id, email FROM users WHERE LOWER(email) IN ({placeholders}) "
+                    f"AND is_archived = FALSE ORDER BY user_id",
+                    list(emails)
+                )
+                craveon_users = {}
+                for user_id, email in cursor.fetchall():
+                    craveon_users.setdefault(email.lower(), []).append(user_id)
+
+            links = []
+            for pk, email in batch:
+                candidates = [user_id for user_id in craveon_users.get(email.lower(), []) if user_id not in linked_ids]
+                if not candidates:
+                    unmatched += 1
+                    continue
+                # The oldest account is canonical; later ones came from the old email lookup race
+                links.append(CraveOnUserLink(user_id=pk, craveon_user_id=candidates[0]))
+                linked_ids.add(candidates[0])
+                if len(candidates) > 1:
+                    duplicates[candidates[0]] = candidates[1:]
+
+            if not dry_run and links:
+                CraveOnUserLink.objects.bulk_create(links, ignore_conflicts=True)
+            created += len(links)
+
+        merged_orders = 0
+        if duplicates and options['merge_duplicates'] and not dry_run:
+            with transaction.atomic(using='SystemInteg'), connections['SystemInteg'].cursor() as cursor:
+                for canonical_id, duplicate_ids in duplicates.items():
+                    placeholders = ', '.join(['%s'] * len(duplicate_ids))
+                    cursor.execute(
+                        f"UPDATE orders SET user_id = %s WHERE user_id IN ({placeholders})",
+                        [canonical_id, *duplicate_ids]
+                    )
+                    merged_orders += cursor.rowcount
+
+        prefix = "[dry run] " if dry_run else ""
+        self.stdout.write(f"{prefix}{created} guests linked, {unmatched} without a CraveOn user")
+        if duplicates:
+            duplicate_count = sum(len(ids) for ids in duplicates.values())
+            if options['merge_duplicates'] and not dry_run:
+                self.stdout.write(f"{merged_orders} orders moved from {duplicate_count} duplicate CraveOn users")
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f"{duplicate_count} duplicate CraveOn users share an email with a linked user; their orders "
+                    f"stay hidden from id-based lookups until run with --merge-duplicates"
+                ))
+        self.stdout.write(self.style.SUCCESS("CraveOn user backfill complete"))
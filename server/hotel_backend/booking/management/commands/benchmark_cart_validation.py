@@ -0,0 +1,90 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from booking.craveon_integration import CraveOnIntegration
+from booking.models import CraveOnItem
+
+def _per_line_validate(cart_items: list) -> float:
+    """The previous validation path: one item query per cart line."""
+    total_amount = 0
+    for item in cart_items:
+        craveon_item = CraveOnItem.objects.using('SystemInteg').filter(
+            item_id=item['item_id'],
+            is_archived=False
+        ).first()
+        total_amount += float(craveon_item.price) * int(item['quantity'])
+    return total_amount
+
+def _per_line_insert(order_id: int, cart_items: list):
+    """The previous insert path: one INSERT per cart line."""
+    cursor = connections['SystemInteg'].cursor()
+    for item in cart_items:
+        cursor.execute(
+            "INSERT INTO order_items (order_id, item_id, quantity) VALUES (%s, %s, %s)",
+            [order_id, item['item_id'], item['quantity']]
+        )
+
+def _snapshot_validate(cart_items: list) -> float:
+    """The current path: priced from the menu snapshot, so usually no queries at all."""
+    result = CraveOnIntegration.validate_cart_items(cart_items)
+    if not result['valid']:
+        raise CommandError(result['error'])
+    return result['total_amount']
+
+class Command(BaseCommand):
+    help = 'Compare per-line CraveOn cart validation and order-item inserts with the snapshot and batched paths'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', default='1,10,50', help='Comma-separated cart sizes')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per cart size and strategy')
+
+    def _measure(self, repeat: int, func, *args):
+        with CaptureQueriesContext(connections['SystemInteg']) as queries:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                func(*args)
+            elapsed = time.perf_counter() - started
+        return elapsed / repeat * 1000, len(queries) // repeat
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        item_ids = list(
+            CraveOnItem.objects.using('SystemInteg').filter(is_archived=False).values_list('item_id', flat=True)
+        )
+        if not item_ids:
+            raise CommandError("CraveOn has no active items to build carts from")
+
+        with connections['SystemInteg'].cursor() as cursor:
+            cursor.execute("SELECT MAX(order_id) FROM orders")
+            order_id = cursor.fetchone()[0]
+
+        for lines in [int(count) for count in options['lines'].split(',') if count.strip()]:
+            # Cycles through the menu, so carts longer than it include repeated items
+            cart_items = [{'item_id': item_ids[i % len(item_ids)], 'quantity': 1} for i in range(lines)]
+            merged = CraveOnIntegration.validate_cart_items(cart_items)['items']
+
+            per_line_ms, per_line_queries = self._measure(repeat, _per_line_validate, cart_items)
+            snapshot_ms, snapshot_queries = self._measure(repeat, _snapshot_validate, cart_items)
+            self.stdout.write(
+                f"{lines} lines, validate: per-line {per_line_ms:.2f}ms ({per_line_queries} queries), "
+                f"snapshot {snapshot_ms:.2f}ms ({snapshot_queries} queries)"
+            )
+
+            if order_id is None:
+                continue
+            # Inserts go into an existing order and are rolled back, so CraveOn data is left untouched
+            with transaction.atomic(using='SystemInteg'):
+                per_line_ms, per_line_queries = self._measure(repeat, _per_line_insert, order_id, cart_items)
+                batched_ms, batched_queries = self._measure(
+                    repeat, CraveOnIntegration.add_order_items, order_id, merged
+                )
+                transaction.set_rollback(True, using='SystemInteg')
+            self.stdout.write(
+                f"{lines} lines, insert: per-line {per_line_ms:.2f}ms ({per_line_queries} queries), "
+                f"batched {batched_ms:.2f}ms ({batched_queries} queries)"
+            )
+
+        if order_id is None:
+            self.stdout.write(self.style.WARNING("No CraveOn orders exist, so inserts were not measured"))
+        self.stdout.write(self.style.SUCCESS("Cart benchmark complete"))
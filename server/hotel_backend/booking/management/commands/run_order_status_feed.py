@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+from booking.craveon_guard import CraveOnUnavailable
+from booking.order_status_feed import order_status_feed
+
+class Command(BaseCommand):
+    help = (
+        'Poll CraveOn for new and changed hotel food orders and push status changes to guests '
+        'over websockets. Run a single instance.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Poll once and exit')
+        parser.add_argument('--interval', type=float, default=None, help='Seconds between polls')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or order_status_feed.poll_interval
+
+        while True:
+            delay = interval
+            try:
+                result = order_status_feed.poll()
+                if result['new'] or result['changed']:
+                    self.stdout.write(
+                        f"{result['new']} new and {result['changed']} changed orders, "
+                        f"{result['published']} booking updates sent (high-water order {result['high_water']})"
+                    )
+            except CraveOnUnavailable as e:
+                self.stderr.write(f"CraveOn unavailable ({e.reason}), retrying in {e.retry_after}s")
+                delay = max(interval, e.retry_after)
+            except DatabaseError as e:
+                # Failures count towards the circuit breaker; keep polling until it opens
+                self.stderr.write(f"Order status feed poll failed: {str(e)}")
+            if options['once']:
+                self.stdout.write(self.style.SUCCESS("Order status feed polled"))
+                return
+            close_old_connections()
+            time.sleep(delay)
@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from .food_images import image_md5
+from .models import CraveOnItem
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CACHE_KEY = 'craveon:menu_snapshot'
+ITEM_IMAGE_MD5_KEY = 'craveon:item_image_md5:{}'
+# Digests of items outside the snapshot (archived or unknown ids), so repeat requests skip MD5 over the BLOB
+ITEM_IMAGE_MD5_TIMEOUT = 300
+
+# One row that moves whenever an item or category is added, removed, renamed,
+# repriced, recategorized or (un)archived. Names go in as CRC32 checksums, so a
+# rename to a same-length name still moves it. Image replacements are not
+# covered; CRAVEON_MENU_MAX_AGE forces a full reload to pick those up.
+SIGNATURE_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM items),
+        (SELECT MAX(item_id) FROM items),
+        (SELECT SUM(price * item_id) FROM items),
+        (SELECT SUM(CRC32(item_name) * item_id) FROM items),
+        (SELECT SUM(category_id * item_id) FROM items),
+        (SELECT SUM(CASE WHEN is_archived THEN item_id ELSE 0 END) FROM items),
+        (SELECT COUNT(*) FROM categories),
+        (SELECT SUM(CRC32(category_name) * category_id) FROM categories)
+"""
+
+@dataclass
+class MenuSnapshot:
+    signature: str
+    loaded_at: float
+    # item_id -> {item_id, name, price, image_md5, category_id, category_name}, menu order
+    items: dict = field(default_factory=dict)
+
+class MenuCatalog:
+    """
+    Active CraveOn items held in memory and shared through the Django cache,
+    so menu reads and cart pricing do not query CraveOn. At most every
+    `CRAVEON_MENU_PROBE_INTERVAL` seconds a one-row signature query decides
+    whether the snapshot is still current; only a changed signature (or a
+    snapshot older than `CRAVEON_MENU_MAX_AGE`) reloads the items. Refreshes
+    run on a background thread and a caller waits at most
+    `CRAVEON_MENU_REFRESH_TIMEOUT` seconds before being served the
+    last-known-good snapshot.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='craveon-menu')
+        self._refresh = None
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._initialized = True
+
+    @property
+    def probe_interval(self) -> int:
+        return getattr(settings, 'CRAVEON_MENU_PROBE_INTERVAL', 30)
+
+    @property
+    def max_age(self) -> int:
+        return getattr(settings, 'CRAVEON_MENU_MAX_AGE', 600)
+
+    @property
+    def refresh_timeout(self) -> float:
+        return getattr(settings, 'CRAVEON_MENU_REFRESH_TIMEOUT', 2.0)
+
+    def _signature(self) -> str:
+        with connections['SystemInteg'].cursor() as cursor:
+            cursor.execute(SIGNATURE_SQL)
+            return ':'.join(str(value) for value in cursor.fetchone())
+
+    def _load(self, signature: str) -> MenuSnapshot:
+        items = CraveOnItem.objects.using('SystemInteg').filter(
+            is_archived=False
+        ).select_related('category').defer('image').annotate(image_md5=image_md5())
+        snapshot = MenuSnapshot(signature=signature, loaded_at=time.time())
+        for item in items:
+            snapshot.items[item.item_id] = {
+                'item_id': item.item_id,
+                'name': item.item_name,
+                'price': float(item.price),
+                'image_md5': item.image_md5,
+                'category_id': item.category.category_id if item.category else None,
+                'category_name': item.category.category_name if item.category else "",
+            }
+        return snapshot
+
+    def _run_refresh(self, force: bool = False) -> MenuSnapshot:
+        close_old_connections()
+        try:
+            signature = self._signature()
+            current = self._snapshot
+            if not force and current and current.signature == signature and time.time() - current.loaded_at < self.max_age:
+                snapshot = current
+            else:
+                # Another process may already have loaded this version
+                shared = cache.get(SNAPSHOT_CACHE_KEY)
+                if not force and shared and shared.signature == signature and time.time() - shared.loaded_at < self.max_age:
+                    snapshot = shared
+                else:
+                    snapshot = self._load(signature)
+                    cache.set(SNAPSHOT_CACHE_KEY, snapshot, None)
+                    logger.info(f"CraveOn menu snapshot reloaded with {len(snapshot.items)} items")
+
+            with self._lock:
+                self._snapshot = snapshot
+                self._checked_at = time.time()
+            return snapshot
+        finally:
+            close_old_connections()
+
+    def _start_refresh(self, force: bool = False):
+        """The in-flight refresh, and whether this call started it."""
+        with self._lock:
+            if self._refresh is None or self._refresh.done():
+                self._refresh = self._executor.submit(self._run_refresh, force)
+                return self._refresh, True
+            return self._refresh, False
+
+    def snapshot(self) -> MenuSnapshot:
+        """
+        Current menu. Blocks only when no snapshot exists yet in this process
+        or the shared cache; otherwise a slow or failing CraveOn yields the
+        last-known-good snapshot.
+        """
+        if self._snapshot is None:
+            shared = cache.get(SNAPSHOT_CACHE_KEY)
+            if shared is not None:
+                with self._lock:
+                    self._snapshot = self._snapshot or shared
+            else:
+                return self._start_refresh()[0].result()
+
+        if time.time() - self._checked_at < self.probe_interval:
+            return self._snapshot
+
+        refresh, started = self._start_refresh()
+        if not started:
+            # Someone is already waiting on this refresh; don't stall another request on it
+            return self._snapshot
+        try:
+            return refresh.result(timeout=self.refresh_timeout)
+        except FutureTimeoutError:
+            logger.warning("CraveOn menu refresh is slow; serving the last known snapshot")
+        except Exception as e:
+            logger.error(f"CraveOn menu refresh failed; serving the last known snapshot: {str(e)}")
+        return self._snapshot
+
+    def items(self) -> list:
+        return list(self.snapshot().items.values())
+
+    def get_items(self, item_ids) -> dict:
+        items = self.snapshot().items
+        return {item_id: items[item_id] for item_id in item_ids if item_id in items}
+
+    def image_digests(self, item_ids) -> dict:
+        """
+        item_id -> MD5 of the item's image. Menu items come from the snapshot;
+        anything else (archived items in order history) is hashed by CraveOn
+        once and cached briefly. Items without an image or row are left out.
+        """
+        items = self.snapshot().items
+        digests = {item_id: items[item_id]['image_md5'] for item_id in item_ids if item_id in items}
+
+        missing = {item_id for item_id in item_ids if item_id not in items}
+        if missing:
+            keys = {item_id: ITEM_IMAGE_MD5_KEY.format(item_id) for item_id in missing}
+            cached = cache.get_many(list(keys.values()))
+            found = {item_id: cached[key] for item_id, key in keys.items() if key in cached}
+            unknown = missing - set(found)
+            if unknown:
+                loaded = dict(CraveOnItem.objects.using('SystemInteg').filter(
+                    item_id__in=unknown
+                ).annotate(image_md5=image_md5()).values_list('item_id', 'image_md5'))
+                # An empty string records "no image", so unknown ids are not looked up again either
+                fresh = {item_id: loaded.get(item_id) or '' for item_id in unknown}
+                cache.set_many({keys[item_id]: digest for item_id, digest in fresh.items()}, ITEM_IMAGE_MD5_TIMEOUT)
+                found.update(fresh)
+            digests.update(found)
+
+        return {item_id: digest for item_id, digest in digests.items() if digest}
+
+    def invalidate(self):
+        """Reload on next use, e.g. after an order found the snapshot out of date."""
+        with self._lock:
+            self._checked_at = 0.0
+        cache.delete(SNAPSHOT_CACHE_KEY)
+        self._start_refresh(force=True)
+
+# Create singleton instance
+menu_catalog = MenuCatalog()
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0005_delete_craveoncategory_delete_craveonitem_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('receipt_number', models.CharField(max_length=50, unique=True)),
+                ('content_hash', models.CharField(db_index=True, max_length=64)),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('booking', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='receipt', to='booking.bookings')),
+            ],
+            options={
+                'db_table': 'booking_receipts',
+            },
+        ),
+    ]
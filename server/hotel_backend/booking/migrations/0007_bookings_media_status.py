@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0006_booking_receipts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookings',
+            name='media_status',
+            field=models.CharField(choices=[('ready', 'Ready'), ('pending', 'Pending'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0007_bookings_media_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CraveOnUserLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('craveon_user_id', models.PositiveIntegerField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='craveon_link', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'craveon_user_links',
+            },
+        ),
+    ]
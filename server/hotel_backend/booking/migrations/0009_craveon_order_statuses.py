@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0008_craveon_user_links'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CraveOnOrderStatus',
+            fields=[
+                ('order_id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(max_length=20)),
+                ('is_open', models.BooleanField(db_index=True, default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='food_order_statuses', to='booking.bookings')),
+            ],
+            options={
+                'db_table': 'craveon_order_statuses',
+            },
+        ),
+    ]
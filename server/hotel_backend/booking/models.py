@@ -1,5 +1,5 @@
 from django.db import models
-from property.models import Rooms, Areas
+from property.models import Rooms, Areas, MEDIA_STATUS_CHOICES
 from user_roles.models import CustomUsers
 from cloudinary.models import CloudinaryField
 from django.contrib.auth import get_user_model
@@ -48,6 +48,7 @@ class Bookings(models.Model):
     payment_status = models.CharField(max_length=20, default='unpaid')
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES, default='gcash')
     payment_proof = CloudinaryField('payment_proof', null=True, blank=True)
+    media_status = models.CharField(max_length=20, choices=MEDIA_STATUS_CHOICES, default='ready')
     payment_date = models.DateTimeField(null=True, blank=True)
     number_of_guests = models.PositiveIntegerField(default=1)
     is_discounted = models.BooleanField(default=False)
@@ -133,6 +134,43 @@ class Reviews(models.Model):
     class Meta:
         db_table = 'reviews'
 
+class BookingReceipt(models.Model):
+    booking = models.OneToOneField(Bookings, on_delete=models.CASCADE, related_name='receipt')
+    receipt_number = models.CharField(max_length=50, unique=True)
+    content_hash = models.CharField(max_length=64, db_index=True)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'booking_receipts'
+
+# Hotel guest -> CraveOn `users.user_id`, kept on the hotel side so orders and
+# reviews are looked up by id instead of by email in CraveOn
+class CraveOnUserLink(models.Model):
+    user = models.OneToOneField(CustomUsers, on_delete=models.CASCADE, related_name='craveon_link')
+    craveon_user_id = models.PositiveIntegerField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'craveon_user_links'
+
+    def __str__(self):
+        return f"{self.user_id} -> CraveOn {self.craveon_user_id}"
+
+# Last CraveOn order status seen by the order status feed; open rows are re-checked each poll
+class CraveOnOrderStatus(models.Model):
+    order_id = models.PositiveIntegerField(primary_key=True)
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='food_order_statuses')
+    status = models.CharField(max_length=20)
+    is_open = models.BooleanField(default=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'craveon_order_statuses'
+
+    def __str__(self):
+        return f"Order {self.order_id} - {self.status}"
+
 # CraveOn Categories model
 class CraveOnCategory(models.Model):
     category_id = models.AutoField(primary_key=True)
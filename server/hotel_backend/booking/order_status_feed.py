@@ -0,0 +1,178 @@
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connections
+from django.db.models import Max
+from django.utils import timezone
+from .craveon_integration import CraveOnIntegration
+from .models import Bookings, CraveOnOrderStatus
+
+logger = logging.getLogger(__name__)
+
+# Orders in these states never change again from the kitchen side
+CLOSED_STATUSES = {'completed', 'cancelled', 'reviewed'}
+
+class OrderStatusFeed:
+    """
+    Follows CraveOn `orders` for hotel bookings and pushes status changes to
+    each guest's `notifications_{user_id}` group, so clients no longer re-run
+    `fetch_food_orders` to notice the kitchen's progress.
+
+    CraveOn's orders table has no change timestamp, so each poll is two kinds
+    of primary key query: a range scan from `CRAVEON_ORDER_FEED_LOOKBACK` ids
+    below the highest order_id seen (new orders, including ones that
+    committed late), and an `IN` lookup of the orders still open in the
+    `CraveOnOrderStatus` mirror. Only one feed should run at a time.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(OrderStatusFeed, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.poll_interval = getattr(settings, 'CRAVEON_ORDER_FEED_INTERVAL', 3)
+            self.batch_size = getattr(settings, 'CRAVEON_ORDER_FEED_BATCH_SIZE', 500)
+            self.lookback = getattr(settings, 'CRAVEON_ORDER_FEED_LOOKBACK', 200)
+            self._high_water = None
+            self._publish_new = True
+            OrderStatusFeed._initialized = True
+
+    def _load_high_water(self):
+        high_water = CraveOnOrderStatus.objects.aggregate(high_water=Max('order_id'))['high_water']
+        # On the very first run the existing order history is mirrored without notifying anyone
+        self._publish_new = high_water is not None
+        self._high_water = high_water or 0
+
+    def _scan_new_orders(self, cursor) -> list:
+        changes = []
+        # Orders are inserted inside a transaction, so a lower order_id can commit after a
+        # higher one; the trailing window picks those up on a later poll
+        position = max(self._high_water - self.lookback, 0)
+        while True:
+            cursor.execute(
+                "SELECT order_id, booking_id, status FROM orders WHERE order_id > %s ORDER BY order_id LIMIT %s",
+                [position, self.batch_size]
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return changes
+
+            mirrored_ids = set(CraveOnOrderStatus.objects.filter(
+                order_id__in=[row[0] for row in rows]
+            ).values_list('order_id', flat=True))
+            rows_to_mirror = [row for row in rows if row[0] not in mirrored_ids]
+            booking_ids = {row[1] for row in rows_to_mirror if row[1]}
+            booking_users = dict(Bookings.objects.filter(id__in=booking_ids).values_list('id', 'user_id'))
+            mirrored = []
+            for order_id, booking_id, order_status in rows_to_mirror:
+                if booking_id not in booking_users:
+                    # Walk-in CraveOn orders, or bookings since deleted from the hotel side
+                    continue
+                mirrored.append(CraveOnOrderStatus(
+                    order_id=order_id,
+                    booking_id=booking_id,
+                    status=order_status,
+                    is_open=order_status.lower() not in CLOSED_STATUSES,
+                ))
+                if self._publish_new:
+                    changes.append((booking_users[booking_id], booking_id, order_id, order_status, None))
+
+            CraveOnOrderStatus.objects.bulk_create(mirrored, ignore_conflicts=True)
+            position = rows[-1][0]
+            self._high_water = max(self._high_water, position)
+            if len(rows) < self.batch_size:
+                return changes
+
+    def _recheck_open_orders(self, cursor) -> list:
+        open_orders = {
+            order_id: (booking_id, user_id, order_status)
+            for order_id, booking_id, user_id, order_status in CraveOnOrderStatus.objects.filter(
+                is_open=True
+            ).values_list('order_id', 'booking_id', 'booking__user_id', 'status')
+        }
+        order_ids = list(open_orders)
+        changes = []
+        updated = []
+        missing = set(order_ids)
+        now = timezone.now()
+        for start in range(0, len(order_ids), self.batch_size):
+            chunk = order_ids[start:start + self.batch_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"SELECT order_id, status FROM orders WHERE order_id IN ({placeholders})", chunk)
+            for order_id, order_status in cursor.fetchall():
+                missing.discard(order_id)
+                booking_id, user_id, previous_status = open_orders[order_id]
+                if order_status == previous_status:
+                    continue
+                updated.append(CraveOnOrderStatus(
+                    order_id=order_id,
+                    status=order_status,
+                    is_open=order_status.lower() not in CLOSED_STATUSES,
+                    updated_at=now,
+                ))
+                changes.append((user_id, booking_id, order_id, order_status, previous_status))
+
+        if updated:
+            CraveOnOrderStatus.objects.bulk_update(updated, ['status', 'is_open', 'updated_at'])
+        if missing:
+            CraveOnOrderStatus.objects.filter(order_id__in=missing).delete()
+        return changes
+
+    def _publish(self, changes: list) -> int:
+        by_booking = {}
+        for user_id, booking_id, order_id, order_status, previous_status in changes:
+            by_booking.setdefault((user_id, booking_id), []).append({
+                'order_id': order_id,
+                'status': order_status,
+                'previous_status': previous_status,
+            })
+
+        channel_layer = get_channel_layer()
+        sent = 0
+        for (user_id, booking_id), orders in by_booking.items():
+            try:
+                async_to_sync(channel_layer.group_send)(f"notifications_{user_id}", {
+                    'type': 'food_order_status',
+                    'booking_id': booking_id,
+                    'orders': orders,
+                })
+                sent += 1
+            except Exception as e:
+                logger.error(f"Error publishing food order status for booking {booking_id}: {str(e)}")
+        return sent
+
+    def poll(self) -> dict:
+        """
+        Read new and changed orders once and publish one event per booking.
+        Raises `CraveOnUnavailable` while the CraveOn circuit is open.
+        """
+        if self._high_water is None:
+            self._load_high_water()
+
+        with connections['SystemInteg'].cursor() as cursor:
+            # Re-check before scanning, so orders first seen in this poll are not read twice
+            status_changes = self._recheck_open_orders(cursor)
+            new_changes = self._scan_new_orders(cursor)
+        self._publish_new = True
+
+        # A completed order becomes reviewable, so the guest's cached review lists are stale
+        closed_user_ids = {
+            change[0] for change in new_changes + status_changes if change[3].lower() in CLOSED_STATUSES
+        }
+        if closed_user_ids:
+            CraveOnIntegration.invalidate_food_review_summary(*closed_user_ids)
+
+        return {
+            'new': len(new_changes),
+            'changed': len(status_changes),
+            'published': self._publish(new_changes + status_changes),
+            'high_water': self._high_water,
+        }
+
+# Create singleton instance
+order_status_feed = OrderStatusFeed()
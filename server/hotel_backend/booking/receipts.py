@@ -0,0 +1,97 @@
+import hashlib
+import json
+from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from property.serializers import AreaSerializer, RoomSerializer
+from .models import BookingReceipt
+from .serializers import BookingSerializer
+
+HOTEL_INFO = {
+    'name': 'Azurea: Hotel Management',
+    'address': 'Brgy. Dayap, Calauan, Laguna',
+    'phone': '+63 912 345 6789',
+    'email': 'azureahotelmanagement@gmail.com'
+}
+
+def _stay_duration(booking):
+    if not (booking.check_in_date and booking.check_out_date):
+        return None
+    check_in = booking.check_in_date
+    check_out = booking.check_out_date
+    if booking.is_venue_booking:
+        # For venues, calculate hours
+        if booking.start_time and booking.end_time:
+            start_datetime = datetime.combine(check_in, booking.start_time)
+            end_datetime = datetime.combine(check_out, booking.end_time)
+            duration_hours = (end_datetime - start_datetime).total_seconds() / 3600
+            return f"{int(duration_hours)} hours"
+        return "1 hour"
+    duration_days = (check_out - check_in).days
+    return f"{duration_days} night{'s' if duration_days != 1 else ''}"
+
+def build_receipt_payload(booking, generated_by=None) -> dict:
+    """E-receipt data for a checked-out booking, in the shape the client renders."""
+    booking_data = BookingSerializer(booking).data
+
+    if booking.is_venue_booking and booking.area:
+        booking_data['area_details'] = AreaSerializer(booking.area).data
+        booking_data['property_type'] = 'Area'
+        booking_data['property_name'] = booking.area.area_name
+        booking_data['property_capacity'] = booking.area.capacity
+    elif booking.room:
+        booking_data['room_details'] = RoomSerializer(booking.room).data
+        booking_data['property_type'] = 'Room'
+        booking_data['property_name'] = booking.room.room_name
+        booking_data['property_capacity'] = booking.room.max_guests
+
+    duration = _stay_duration(booking)
+    if duration:
+        booking_data['duration'] = duration
+
+    generated_at = timezone.now()
+    booking_data['receipt_data'] = {
+        'receipt_number': f"REC-{booking.id}-{generated_at.strftime('%Y%m%d')}",
+        'generated_at': generated_at.isoformat(),
+        'generated_by': f"{generated_by.first_name} {generated_by.last_name}" if generated_by else '',
+        'hotel_info': HOTEL_INFO,
+    }
+
+    total_amount = float(booking.total_price or 0)
+    down_payment = float(booking.down_payment or 0)
+    booking_data['payment_breakdown'] = {
+        'total_amount': total_amount,
+        'down_payment': down_payment,
+        'remaining_balance': total_amount - down_payment,
+        'payment_method': booking.get_payment_method_display(),
+        'payment_status': booking.payment_status
+    }
+
+    # Round-trip so the stored JSON and its hash match what is served
+    return json.loads(json.dumps(booking_data, cls=DjangoJSONEncoder))
+
+def receipt_hash(payload: dict) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), cls=DjangoJSONEncoder)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def get_or_create_receipt(booking, generated_by=None) -> BookingReceipt:
+    """
+    The booking's receipt snapshot, built on first use. Receipts are immutable
+    once stored: later calls return the same payload and hash.
+    """
+    receipt = BookingReceipt.objects.filter(booking=booking).first()
+    if receipt:
+        return receipt
+
+    payload = build_receipt_payload(booking, generated_by)
+    try:
+        with transaction.atomic():
+            return BookingReceipt.objects.create(
+                booking=booking,
+                receipt_number=payload['receipt_data']['receipt_number'],
+                content_hash=receipt_hash(payload),
+                payload=payload,
+            )
+    except IntegrityError:
+        return BookingReceipt.objects.get(booking=booking)
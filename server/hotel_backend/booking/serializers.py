@@ -7,10 +7,10 @@ from property.serializers import AreaSerializer, RoomSerializer
 from .validations.booking import validate_booking_request
 from django.utils import timezone
 from datetime import datetime
+from django.db import transaction
 from django.db.models import Sum
 from django.core.files.uploadedfile import InMemoryUploadedFile, UploadedFile
-import cloudinary.uploader
-import cloudinary
+from admin_dashboard.service.media_uploads import media_upload_worker
 import uuid
 import base64
 
@@ -72,6 +72,7 @@ class BookingSerializer(serializers.ModelSerializer):
             'updated_at',
             'payment_method',
             'payment_proof',
+            'media_status',
             'payment_date',
             'down_payment',
             'phone_number',
@@ -187,14 +188,15 @@ class BookingRequestSerializer(serializers.Serializer):
         errors = {}
         room = None
         
-        payment_method = data.get('payment_method')
-        payment_proof = data.get('payment_proof')
+        payment_method = data.get('paymentMethod')
+        payment_proof = data.get('paymentProof')
         
         if payment_method == 'gcash':
+            # Checked here, before anything is saved: the proof is uploaded after the booking exists
             if not payment_proof:
-                raise serializers.ValidationError({{
+                raise serializers.ValidationError({
                     'payment_proof': "Payment proof is required for GCash payments."
-                }})
+                })
             if not isinstance(payment_proof, (InMemoryUploadedFile, UploadedFile)) and not isinstance(payment_proof, str):
                 raise serializers.ValidationError({
                     'payment_proof': "Please upload a valid file."
@@ -213,18 +215,18 @@ class BookingRequestSerializer(serializers.Serializer):
         
         return data
 
+    def _stage_payment_proof(self, booking, payment_method, payment_proof_file):
+        # The upload itself runs on the media worker; the booking stays media-pending until it lands
+        if payment_method == 'gcash' and payment_proof_file:
+            try:
+                media_upload_worker.stage('payment_proof', booking, payment_proof_file)
+            except Exception as e:
+                raise serializers.ValidationError(f"Error uploading payment proof: {str(e)}")
+
     def create(self, validated_data):
         request = self.context.get('request')
         payment_proof_file = request.FILES.get('paymentProof')
         payment_method = validated_data.get('paymentMethod', 'physical')
-        payment_proof_url = None
-
-        if payment_method == 'gcash':
-            try:
-                upload_result = cloudinary.uploader.upload(payment_proof_file)
-                payment_proof_url = upload_result['secure_url']
-            except Exception as e:
-                raise serializers.ValidationError(f"Error uploading payment proof: {str(e)}")
 
         if request and hasattr(request, 'user') and request.user.is_authenticated:
             user = request.user
@@ -300,25 +302,27 @@ class BookingRequestSerializer(serializers.Serializer):
                 # Don't apply additional discount, just use the provided price
                 total_price = original_price
 
-                booking = Bookings.objects.create(
-                    user=user,
-                    area=area,
-                    room=None,
-                    check_in_date=validated_data['checkIn'],
-                    check_out_date=validated_data['checkOut'],
-                    status=validated_data.get('status', 'pending'),
-                    total_price=total_price,
-                    is_venue_booking=True,
-                    phone_number=validated_data.get('phoneNumber', ''),
-                    time_of_arrival=validated_data.get('arrivalTime'),
-                    start_time=start_time,
-                    end_time=end_time,
-                    number_of_guests=validated_data.get('numberOfGuests', 1),
-                    payment_method=payment_method,
-                    payment_proof=payment_proof_url,
-                    payment_date=timezone.now() if payment_method == 'gcash' else None,
-                    is_discounted=discount_percent > 0,  # Track if discount was applied
-                )
+                # The booking is only kept if its payment proof was staged
+                with transaction.atomic():
+                    booking = Bookings.objects.create(
+                        user=user,
+                        area=area,
+                        room=None,
+                        check_in_date=validated_data['checkIn'],
+                        check_out_date=validated_data['checkOut'],
+                        status=validated_data.get('status', 'pending'),
+                        total_price=total_price,
+                        is_venue_booking=True,
+                        phone_number=validated_data.get('phoneNumber', ''),
+                        time_of_arrival=validated_data.get('arrivalTime'),
+                        start_time=start_time,
+                        end_time=end_time,
+                        number_of_guests=validated_data.get('numberOfGuests', 1),
+                        payment_method=payment_method,
+                        payment_date=timezone.now() if payment_method == 'gcash' else None,
+                        is_discounted=discount_percent > 0,  # Track if discount was applied
+                    )
+                    self._stage_payment_proof(booking, payment_method, payment_proof_file)
                 
                 if user.is_verified != 'verified':
                     user.last_booking_date = timezone.now().date()
@@ -342,24 +346,25 @@ class BookingRequestSerializer(serializers.Serializer):
                 total_price = discounted_price * nights
                 
                 
-                booking = Bookings.objects.create(
-                    user=user,
-                    room=room,
-                    area=None,
-                    check_in_date=validated_data['checkIn'],
-                    check_out_date=validated_data['checkOut'],
-                    status=validated_data.get('status', 'pending'),
-                    special_request=validated_data.get('specialRequests', ''),
-                    is_venue_booking=False,
-                    phone_number=validated_data.get('phoneNumber', ''),
-                    total_price=total_price,
-                    time_of_arrival=validated_data.get('arrivalTime'),
-                    number_of_guests=validated_data.get('numberOfGuests', 1),
-                    payment_method=payment_method,
-                    payment_proof=payment_proof_url,
-                    payment_date=timezone.now() if payment_method == 'gcash' else None,
-                )
-                
+                # The booking is only kept if its payment proof was staged
+                with transaction.atomic():
+                    booking = Bookings.objects.create(
+                        user=user,
+                        room=room,
+                        area=None,
+                        check_in_date=validated_data['checkIn'],
+                        check_out_date=validated_data['checkOut'],
+                        status=validated_data.get('status', 'pending'),
+                        special_request=validated_data.get('specialRequests', ''),
+                        is_venue_booking=False,
+                        phone_number=validated_data.get('phoneNumber', ''),
+                        total_price=total_price,
+                        time_of_arrival=validated_data.get('arrivalTime'),
+                        number_of_guests=validated_data.get('numberOfGuests', 1),
+                        payment_method=payment_method,
+                        payment_date=timezone.now() if payment_method == 'gcash' else None,
+                    )
+                    self._stage_payment_proof(booking, payment_method, payment_proof_file)
                 
                 if user.is_verified != 'verified':
                     user.last_booking_date = timezone.now().date()
@@ -0,0 +1,13 @@
+-- Recommended indexes for the CraveOn database (the SystemInteg alias).
+-- CraveOn's schema is not managed by Django migrations; apply these with
+-- `python manage.py apply_craveon_indexes`, or hand them to the CraveOn DBA.
+
+-- Guest food review summary (CraveOnIntegration.get_food_review_summary):
+-- WHERE user_id = ? ORDER BY ordered_at DESC, with every selected order column
+-- in the index. InnoDB appends the order_id primary key, so the review join
+-- reads no order rows.
+CREATE INDEX idx_orders_user_ordered_at ON orders (user_id, ordered_at, status, total_amount, guest_name, hotel_room_area);
+
+-- Review lookups by order (summary join, review_food_order duplicate check).
+-- `comment` is TEXT and cannot be indexed, so only reviews that exist are read.
+CREATE INDEX idx_reviews_order_id ON reviews (order_id, rating, created_at);
@@ -24,9 +24,12 @@ urlpatterns = [
     
     # For Food Ordering (fetch the API from the other system) -> CraveOn
     path('fetch_foods', views.fetch_foods, name='fetch_foods'),
+    path('foods/<int:item_id>/image', views.food_image, name='food_image'),
     path('place_food_order', views.place_food_order, name='place_food_order'),
     path('fetch_food_orders', views.fetch_food_orders, name='fetch_food_orders'),
     path('review_food_order', views.review_food_order, name='review_food_order'),
     path('user/food_order_reviews', views.get_user_food_order_reviews, name='get_user_food_order_reviews'),
     path('user/reviewable_food_orders', views.get_reviewable_food_orders, name='get_reviewable_food_orders'),
+    path('user/food_order_review_summary', views.get_food_order_review_summary, name='get_food_order_review_summary'),
+    path('craveon/metrics', views.craveon_metrics, name='craveon_metrics'),
 ]
\ No newline at end of file
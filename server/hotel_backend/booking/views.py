@@ -1,8 +1,7 @@
 import json
-import base64
 import logging
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.response import Response
 from .models import Bookings, Reviews, CraveOnItem
 from property.models import Rooms, Areas
@@ -13,15 +12,22 @@ from .serializers import (
     ReviewSerializer,
 )
 from django.utils import timezone
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, AllowAny
 from datetime import datetime
 from django.db import transaction, connections
 from django.db.models import Q
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.http import FileResponse, HttpResponse
 from .craveon_integration import CraveOnIntegration
+from .craveon_guard import CraveOnUnavailable, craveon_guard, craveon_unavailable_response
+from .menu_catalog import menu_catalog
+from .receipts import get_or_create_receipt
+from .food_images import (
+    FOOD_IMAGE_MAX_AGE, content_type_for, food_image_cache, food_image_url, image_version
+)
 from .serializers import CraveOnReviewSerializer
-import base64
-import imghdr
+from admin_dashboard.service.image_processing import normalize_upload
+from hotel_backend.uploads import b64encode_upload, copy_request_data
 import json
 import json
 
@@ -125,7 +131,7 @@ def bookings_list(request):
             
         elif request.method == 'POST':
 
-            request_data = request.data.copy()
+            request_data = copy_request_data(request.data)
             if 'payment_proof' in request.FILES:
                 request_data['payment_proof'] = request.FILES['payment_proof']
             unauthenticated = not (request.user and request.user.is_authenticated)
@@ -629,71 +635,22 @@ def generate_checkout_e_receipt(request, booking_id):
             return Response({"error": "E-Receipt can only be generated for checked-out bookings"}, 
                             status=status.HTTP_400_BAD_REQUEST)
         
-        # Prepare booking data for E-Receipt
-        booking_serializer = BookingSerializer(booking)
-        booking_data = booking_serializer.data
-        
-        if booking.is_venue_booking and booking.area:
-            area_serializer = AreaSerializer(booking.area)
-            booking_data['area_details'] = area_serializer.data
-            booking_data['property_type'] = 'Area'
-            booking_data['property_name'] = booking.area.area_name
-            booking_data['property_capacity'] = booking.area.capacity
-        elif booking.room:
-            room_serializer = RoomSerializer(booking.room)
-            booking_data['room_details'] = room_serializer.data
-            booking_data['property_type'] = 'Room'
-            booking_data['property_name'] = booking.room.room_name
-            booking_data['property_capacity'] = booking.room.max_guests
-        
-        # Calculate stay duration
-        if booking.check_in_date and booking.check_out_date:
-            check_in = booking.check_in_date
-            check_out = booking.check_out_date
-            if booking.is_venue_booking:
-                # For venues, calculate hours
-                if booking.start_time and booking.end_time:
-                    start_datetime = datetime.combine(check_in, booking.start_time)
-                    end_datetime = datetime.combine(check_out, booking.end_time)
-                    duration_hours = (end_datetime - start_datetime).total_seconds() / 3600
-                    booking_data['duration'] = f"{int(duration_hours)} hours"
-                else:
-                    booking_data['duration'] = "1 hour"
-            else:
-                duration_days = (check_out - check_in).days
-                booking_data['duration'] = f"{duration_days} night{'s' if duration_days != 1 else ''}"
-        
-        booking_data['receipt_data'] = {
-            'receipt_number': f"REC-{booking.id}-{timezone.now().strftime('%Y%m%d')}",
-            'generated_at': timezone.now().isoformat(),
-            'generated_by': f"{request.user.first_name} {request.user.last_name}",
-            'hotel_info': {
-                'name': 'Azurea: Hotel Management',
-                'address': 'Brgy. Dayap, Calauan, Laguna',
-                'phone': '+63 912 345 6789',
-                'email': 'azureahotelmanagement@gmail.com'
-            }
-        }
+        # Receipts are snapshotted at checkout; older bookings get theirs built once here
+        receipt = get_or_create_receipt(booking, request.user)
+        etag = f'"{receipt.content_hash}"'
         
-        total_amount = float(booking.total_price or 0)
-        down_payment = float(booking.down_payment or 0)
-        remaining_balance = total_amount - down_payment
-        
-        booking_data['payment_breakdown'] = {
-            'total_amount': total_amount,
-            'down_payment': down_payment,
-            'remaining_balance': remaining_balance,
-            'payment_method': booking.get_payment_method_display(),
-            'payment_status': booking.payment_status
-        }
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({
+                "success": True,
+                "message": "E-Receipt data generated successfully",
+                "data": receipt.payload
+            }, status=status.HTTP_200_OK)
         
-        print(f"Booking E-Receipt Data: {booking_data}")
-        
-        return Response({
-            "success": True,
-            "message": "E-Receipt data generated successfully",
-            "data": booking_data
-        }, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
         return Response({
@@ -705,29 +662,84 @@ def generate_checkout_e_receipt(request, booking_id):
 @permission_classes([IsAuthenticated])
 def fetch_foods(request):
     try:
-        items = CraveOnItem.objects.using('SystemInteg').filter(
-            is_archived=False
-        ).select_related('category')
+        # Served from the menu snapshot; image bytes stay in CraveOn behind the cacheable image endpoint
         data = []
-        for item in items:
-            image_type = imghdr.what(None, h=item.image)
-            mime_type = f"image/{image_type}"
-            image_base64 = ""
-            if item.image:
-                image_base64 = base64.b64encode(item.image).decode('utf-8')
+        for item in menu_catalog.items():
             data.append({
-                "item_id": item.item_id,
-                "name": item.item_name,
-                "price": float(item.price),
-                "image": image_base64,
-                "image_mime": mime_type,
-                "category_id": item.category.category_id if item.category else None,
-                "category_name": item.category.category_name if item.category else "",
+                "item_id": item['item_id'],
+                "name": item['name'],
+                "price": item['price'],
+                "image_url": food_image_url(request, item['item_id'], item['image_md5'], 'card') if item['image_md5'] else None,
+                "image_urls": {
+                    size: food_image_url(request, item['item_id'], item['image_md5'], size)
+                    for size in [*food_image_cache.sizes(), 'original']
+                } if item['image_md5'] else None,
+                "category_id": item['category_id'],
+                "category_name": item['category_name'],
             })
         return Response({
             "message": "Food items fetched successfully.",
             "data": data
         }, status=status.HTTP_200_OK)
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def resolve_food_image(item_id, version, size):
+    """`(version, path)` of an item's rendition; the path is None when it has no image."""
+    # A versioned URL whose rendition is already on disk is served without touching CraveOn
+    path = food_image_cache.lookup(item_id, version, size) if version else None
+    if path is not None:
+        return version, path
+
+    # Unknown versions resolve through the menu snapshot; only items outside it are hashed by CraveOn
+    digest = menu_catalog.image_digests([item_id]).get(item_id)
+    if not digest:
+        return version, None
+
+    # First request for this version: read the BLOB once and render every size
+    return food_image_cache.fetch(
+        item_id, image_version(digest), size,
+        lambda: CraveOnItem.objects.using('SystemInteg').filter(item_id=item_id).values_list('image', flat=True).first()
+    )
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def food_image(request, item_id):
+    try:
+        size = request.query_params.get('size', 'original')
+        if size != 'original' and size not in food_image_cache.sizes():
+            return Response({"error": f"Unknown image size '{size}'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        version, path = resolve_food_image(item_id, request.query_params.get('v'), size)
+        if path is None:
+            return Response({"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        etag = f'"{version}-{size}"'
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            try:
+                image_file = open(path, 'rb')
+            except FileNotFoundError:
+                # Evicted or replaced by another process since the lookup; resolve it once more
+                version, path = resolve_food_image(item_id, version, size)
+                try:
+                    image_file = open(path, 'rb') if path else None
+                except FileNotFoundError:
+                    image_file = None
+                if image_file is None:
+                    return Response({"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+                etag = f'"{version}-{size}"'
+            response = FileResponse(image_file, content_type=content_type_for(path))
+
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={FOOD_IMAGE_MAX_AGE}, immutable'
+        return response
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -771,14 +783,25 @@ def place_food_order(request):
         total_amount = validation_result['total_amount']
 
         try:
-            payment_ss_data = base64.b64encode(payment_ss.read()).decode('utf-8')
+            # Shrink the screenshot first, then encode it chunk by chunk from the streamed temp file
+            payment_ss_data = b64encode_upload(normalize_upload(payment_ss))
         except Exception as e:
             return Response({
                 "error": f"Failed to process payment screenshot: {str(e)}"
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic(using='SystemInteg'):
-            craveon_user_id = CraveOnIntegration.get_or_create_craveon_user(hotel_user, booking)
+        # Linked (and, on a first order, created) before the order transaction opens
+        craveon_user_id = CraveOnIntegration.get_or_create_craveon_user(hotel_user, booking)
+
+        # One guarded call for the whole transaction, so the breaker cannot reject it halfway
+        with craveon_guard.guarded('place_order'), transaction.atomic(using='SystemInteg'):
+            # The cart was priced from the menu snapshot; make sure CraveOn still agrees
+            price_changes = CraveOnIntegration.confirm_cart_prices(validation_result['items'])
+            if price_changes:
+                return Response({
+                    "error": "Some items changed since the menu was loaded: " + "; ".join(price_changes)
+                }, status=status.HTTP_409_CONFLICT)
+
             order_id = CraveOnIntegration.create_craveon_order(
                 craveon_user_id, 
                 total_amount, 
@@ -787,7 +810,7 @@ def place_food_order(request):
                 hotel_user,
                 booking
             )
-            CraveOnIntegration.add_order_items(order_id, cart_items)
+            CraveOnIntegration.add_order_items(order_id, validation_result['items'])
 
         booking.has_food_order = True
         booking.save()
@@ -814,6 +837,8 @@ def place_food_order(request):
                 "status": "Pending"
             }
         }, status=status.HTTP_201_CREATED)
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
     except Exception as e:
         return Response({"error": f"Unexpected error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -821,82 +846,84 @@ def place_food_order(request):
 def fetch_food_orders(request):
     try:        
         booking_id = request.query_params.get('booking_id')
+        user_bookings = Bookings.objects.filter(
+            user=request.user,
+            has_food_order=True
+        ).select_related('room', 'area')
         if booking_id:
-            user_bookings = Bookings.objects.filter(
-                id=booking_id,
-                user=request.user,
-                has_food_order=True
-            )
-        else:
-            user_bookings = Bookings.objects.filter(
-                user=request.user,
-                has_food_order=True
+            user_bookings = user_bookings.filter(id=booking_id)
+
+        bookings_by_id = {booking.id: booking for booking in user_bookings}
+        if not bookings_by_id:
+            return Response({"data": []}, status=status.HTTP_200_OK)
+
+        # Two queries against CraveOn no matter how many bookings or orders the guest has
+        # (plus one, cached, when an order holds items no longer on the menu)
+        with connections['SystemInteg'].cursor() as cursor:
+            booking_placeholders = ', '.join(['%s'] * len(bookings_by_id))
+            cursor.execute(
+                f"SELECT * FROM orders WHERE booking_id IN ({booking_placeholders}) ORDER BY ordered_at DESC",
+                list(bookings_by_id)
             )
+            columns = [col[0] for col in cursor.description]
+            orders = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-        all_orders = []
-        for booking in user_bookings:
-            with connections['SystemInteg'].cursor() as cursor:
+            items_by_order = {order['order_id']: [] for order in orders}
+            if items_by_order:
+                order_placeholders = ', '.join(['%s'] * len(items_by_order))
                 cursor.execute(
-                    "SELECT * FROM orders WHERE booking_id = %s ORDER BY ordered_at DESC",
-                    [booking.id]
+                    f"""
+                    SELECT oi.order_item_id, oi.order_id, oi.item_id, oi.quantity, 
+                            i.item_name AS name, i.price,
+                            c.category_id, c.category_name
+                            FROM order_items oi
+                            JOIN items i ON oi.item_id = i.item_id
+                            LEFT JOIN categories c ON i.category_id = c.category_id
+                            WHERE oi.order_id IN ({order_placeholders})
+                            ORDER BY oi.order_item_id
+                    """,
+                    list(items_by_order)
                 )
-                order_rows = cursor.fetchall()
-                columns = [col[0] for col in cursor.description]
-                for order_row in order_rows:
-                    order = dict(zip(columns, order_row))
+                item_rows = cursor.fetchall()
 
-                    cursor.execute(
-                        """
-                        SELECT oi.order_item_id, oi.order_id, oi.item_id, oi.quantity, 
-                                i.item_name AS name, i.price, i.image, c.category_id, c.category_name
-                                FROM order_items oi
-                                JOIN items i ON oi.item_id = i.item_id
-                                LEFT JOIN categories c ON i.category_id = c.category_id
-                                WHERE oi.order_id = %s
-                        """,
-                        [order['order_id']]
-                    )
-                    item_rows = cursor.fetchall()
-                    
-                    items = []
-                    for item_row in item_rows:
-                        image_base64 = ""
-                        image_mime = "image/jpeg"
-                        if item_row[6]:
-                            image_type = imghdr.what(None, h=item_row[6])
-                            if image_type:
-                                image_mime = f"image/{image_type}"
-                            image_base64 = base64.b64encode(item_row[6]).decode('utf-8')
-                        
-                        items.append({
-                            "order_item_id": item_row[0],
-                            "order_id": item_row[1], 
-                            "item_id": item_row[2],
-                            "quantity": item_row[3],
-                            "name": item_row[4],
-                            "price": float(item_row[5]),
-                            "image": image_base64,
-                            "image_mime": image_mime,
-                            "category_id": item_row[7] if item_row[7] else None,
-                            "category_name": item_row[8] if item_row[8] else ""
-                        })                    
-                    order['items'] = items
-                    order['booking_info'] = {
-                        'id': booking.id,
-                        'room_name': booking.room.room_name if booking.room else None,
-                        'area_name': booking.area.area_name if booking.area else None,
-                        'check_in_date': booking.check_in_date,
-                        'check_out_date': booking.check_out_date,
-                        'is_venue_booking': booking.is_venue_booking
-                    }
-                    order['id'] = order['order_id']
-                    order['total_amount'] = float(order['total_amount'])
-                    order['created_at'] = order['ordered_at']
-                    order['updated_at'] = order.get('updated_at', order['ordered_at'])
-                    all_orders.append(order)
+                # Image digests come from the menu snapshot; CraveOn only hashes archived items
+                digests = menu_catalog.image_digests({item_row[2] for item_row in item_rows})
+                for item_row in item_rows:
+                    digest = digests.get(item_row[2])
+                    items_by_order[item_row[1]].append({
+                        "order_item_id": item_row[0],
+                        "order_id": item_row[1], 
+                        "item_id": item_row[2],
+                        "quantity": item_row[3],
+                        "name": item_row[4],
+                        "price": float(item_row[5]),
+                        "image_url": food_image_url(request, item_row[2], digest, 'thumb') if digest else None,
+                        "category_id": item_row[6] if item_row[6] else None,
+                        "category_name": item_row[7] if item_row[7] else ""
+                    })
+
+        all_orders = []
+        for order in orders:
+            booking = bookings_by_id[order['booking_id']]
+            order['items'] = items_by_order[order['order_id']]
+            order['booking_info'] = {
+                'id': booking.id,
+                'room_name': booking.room.room_name if booking.room else None,
+                'area_name': booking.area.area_name if booking.area else None,
+                'check_in_date': booking.check_in_date,
+                'check_out_date': booking.check_out_date,
+                'is_venue_booking': booking.is_venue_booking
+            }
+            order['id'] = order['order_id']
+            order['total_amount'] = float(order['total_amount'])
+            order['created_at'] = order['ordered_at']
+            order['updated_at'] = order.get('updated_at', order['ordered_at'])
+            all_orders.append(order)
         return Response({
             "data": all_orders,
         }, status=status.HTTP_200_OK)
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
     except Exception as e:
         return Response({
             "error": f"Failed to fetch food orders: {str(e)}"
@@ -921,9 +948,10 @@ def review_food_order(request):
         
         cursor = connections['SystemInteg'].cursor()
         cursor.execute("""
-            SELECT guest_email, status, guest_name, total_amount, hotel_room_area 
-            FROM orders 
-            WHERE order_id = %s
+            SELECT o.user_id, o.status, o.guest_name, o.total_amount, o.hotel_room_area, r.id
+            FROM orders o
+            LEFT JOIN reviews r ON r.order_id = o.order_id
+            WHERE o.order_id = %s
         """, [order_id])
         
         order_result = cursor.fetchone()
@@ -932,9 +960,9 @@ def review_food_order(request):
                 'error': 'Order not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        guest_email, order_status, guest_name, total_amount, hotel_room_area = order_result
+        order_user_id, order_status, guest_name, total_amount, hotel_room_area, existing_review = order_result
         
-        if guest_email != request.user.email:
+        if order_user_id != CraveOnIntegration.get_craveon_user_id(request.user):
             return Response({
                 'error': 'You can only review your own orders'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -944,11 +972,6 @@ def review_food_order(request):
                 'error': 'Only completed orders can be reviewed'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        cursor.execute("""
-            SELECT id FROM reviews WHERE order_id = %s
-        """, [order_id])
-        
-        existing_review = cursor.fetchone()
         if existing_review:
             return Response({
                 'error': 'This order has already been reviewed'
@@ -973,6 +996,7 @@ def review_food_order(request):
                 INSERT INTO reviews (order_id, rating, comment, created_at)
                 VALUES (%s, %s, %s, NOW())
             """, [order_id, rating, comment])
+            review_id = cursor.lastrowid
             
             # Update order status
             cursor.execute("""
@@ -982,8 +1006,7 @@ def review_food_order(request):
             """, [order_id])
             
             cursor.connection.commit()
-            
-            review_id = cursor.lastrowid
+            CraveOnIntegration.invalidate_food_review_summary(request.user.pk)
             
             return Response({
                 'success': True,
@@ -1006,6 +1029,8 @@ def review_food_order(request):
             raise db_error
         finally:
             cursor.close()
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
     except Exception as e:
         return Response({
             'error': f"Failed to review food order: {str(e)}"
@@ -1013,40 +1038,41 @@ def review_food_order(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def get_user_food_order_reviews(request):
+def get_food_order_review_summary(request):
+    """
+    Reviewed and reviewable food orders for the authenticated user in one response.
+    """
     try:
-        cursor = connections['SystemInteg'].cursor()
-        cursor.execute("""
-            SELECT r.id, r.order_id, r.rating, r.comment, r.created_at,
-                    o.total_amount, o.guest_name, o.hotel_room_area, o.ordered_at
-            FROM reviews r
-            JOIN orders o ON r.order_id = o.order_id
-            WHERE o.guest_email = %s
-            ORDER BY r.created_at DESC
-        """, [request.user.email])
-        
-        reviews = []
-        for row in cursor.fetchall():
-            reviews.append({
-                'id': row[0],
-                'order_id': row[1],
-                'rating': row[2],
-                'comment': row[3],
-                'created_at': row[4],
-                'order_details': {
-                    'total_amount': float(row[5]),
-                    'guest_name': row[6],
-                    'hotel_room_area': row[7],
-                    'ordered_at': row[8]
-                }
-            })
+        summary = CraveOnIntegration.get_food_review_summary(request.user)
+        return Response({
+            'success': True,
+            'reviews': summary['reviews'],
+            'reviewable_orders': summary['reviewable_orders'],
+            'reviews_count': len(summary['reviews']),
+            'reviewable_count': len(summary['reviewable_orders'])
+        }, status=status.HTTP_200_OK)
         
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
+    except Exception as e:
+        logger.error(f"Error in get_food_order_review_summary: {str(e)}")
+        return Response({
+            'error': f"Failed to fetch food order reviews: {str(e)}"
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_user_food_order_reviews(request):
+    try:
+        reviews = CraveOnIntegration.get_food_review_summary(request.user)['reviews']
         return Response({
             'success': True,
             'reviews': reviews,
             'count': len(reviews)
         }, status=status.HTTP_200_OK)
         
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
     except Exception as e:
         logger.error(f"Error in get_user_food_order_reviews: {str(e)}")
         return Response({
@@ -1060,39 +1086,30 @@ def get_reviewable_food_orders(request):
     Get all completed food orders that haven't been reviewed yet for the authenticated user.
     """
     try:
-        from django.db import connections
-        
-        cursor = connections['SystemInteg'].cursor()
-        cursor.execute("""
-            SELECT o.order_id, o.total_amount, o.guest_name, o.hotel_room_area, 
-                   o.ordered_at, o.status
-            FROM orders o
-            LEFT JOIN reviews r ON o.order_id = r.order_id
-            WHERE o.guest_email = %s 
-            AND o.status = 'Completed' 
-            AND r.id IS NULL
-            ORDER BY o.ordered_at DESC
-        """, [request.user.email])
-        
-        orders = []
-        for row in cursor.fetchall():
-            orders.append({
-                'order_id': row[0],
-                'total_amount': float(row[1]),
-                'guest_name': row[2],
-                'hotel_room_area': row[3],
-                'ordered_at': row[4],
-                'status': row[5]
-            })
-        
+        orders = CraveOnIntegration.get_food_review_summary(request.user)['reviewable_orders']
         return Response({
             'success': True,
             'reviewable_orders': orders,
             'count': len(orders)
         }, status=status.HTTP_200_OK)
         
+    except CraveOnUnavailable as e:
+        return craveon_unavailable_response(e)
     except Exception as e:
         logger.error(f"Error in get_reviewable_food_orders: {str(e)}")
         return Response({
             'error': f"Failed to fetch reviewable food orders: {str(e)}"
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def craveon_metrics(request):
+    try:
+        # Failure messages can carry CraveOn hosts and SQL
+        if not (request.user.role == 'admin' or request.user.is_staff):
+            return Response({"error": "Only admins can view CraveOn metrics"}, status=status.HTTP_403_FORBIDDEN)
+        return Response({
+            "data": craveon_guard.get_metrics()
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
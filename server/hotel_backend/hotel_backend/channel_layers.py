@@ -0,0 +1,51 @@
+import threading
+from channels_redis.core import RedisChannelLayer
+
+class PooledRedisChannelLayer(RedisChannelLayer):
+    """
+    `RedisChannelLayer` whose per-host pools block for a free connection
+    instead of raising "Too many connections" once `max_connections` is hit.
+    Lets every Daphne/worker process share one Redis with a bounded number of
+    sockets while bursts of `group_send` calls queue up briefly.
+    """
+    def create_pool(self, index):
+        from redis.asyncio import BlockingConnectionPool
+
+        host = self.hosts[index].copy()
+        address = host.pop('address')
+        host.setdefault('timeout', 20)
+        return BlockingConnectionPool.from_url(address, **host)
+
+class FakeRedisChannelLayer(PooledRedisChannelLayer):
+    """
+    Pooled Redis layer backed by an in-process `fakeredis` server. It speaks
+    the same protocol (groups, capacity, expiry, Lua scripts) as the real
+    layer, so tests and local runs exercise the production code path without
+    a Redis service. Every layer instance in the process shares one server.
+    """
+    _server = None
+    _server_lock = threading.Lock()
+
+    def __init__(self, hosts=None, **kwargs):
+        super().__init__(hosts=hosts or [{'address': 'redis://fakeredis:6379/0'}], **kwargs)
+
+    @classmethod
+    def get_server(cls):
+        from fakeredis import FakeServer
+
+        with cls._server_lock:
+            if cls._server is None:
+                cls._server = FakeServer()
+            return cls._server
+
+    def create_pool(self, index):
+        from fakeredis.aioredis import FakeConnection
+        from redis.asyncio import BlockingConnectionPool
+
+        host = self.hosts[index]
+        return BlockingConnectionPool(
+            connection_class=FakeConnection,
+            server=self.get_server(),
+            max_connections=host.get('max_connections') or 50,
+            timeout=host.get('timeout', 20),
+        )
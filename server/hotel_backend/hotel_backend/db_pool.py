@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from collections import deque
+from django.db import OperationalError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_OPTIONS = {
+    'max_size': 10,
+    'max_age': 300,
+    'timeout': 5.0,
+    'pre_ping': True,
+    # Connections returned more recently than this are trusted without a ping
+    'ping_after': 5.0,
+}
+
+class PoolTimeout(OperationalError):
+    pass
+
+class ConnectionPool:
+    """
+    Process-wide pool of raw DB-API connections for one database alias.
+
+    Django still "opens" and "closes" a connection per request or worker task;
+    the pooled backend turns those into a checkout and a checkin here, so the
+    TCP connection and authentication handshake are reused across requests and
+    threads. At most `max_size` connections exist at once and callers wait up
+    to `timeout` seconds for one. Idle connections older than `max_age`
+    seconds are dropped, and a connection idle for more than `ping_after`
+    seconds is pinged before being handed out when `pre_ping` is enabled.
+    """
+    def __init__(self, alias: str, options: dict):
+        self.alias = alias
+        self.max_size = int(options['max_size'])
+        self.max_age = float(options['max_age'])
+        self.timeout = float(options['timeout'])
+        self.pre_ping = bool(options['pre_ping'])
+        self.ping_after = float(options['ping_after'])
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        # (connection, created_at, returned_at), most recently returned last
+        self._idle = deque()
+        self._created_at = {}
+        self._metrics = {
+            'checkouts': 0,
+            'created': 0,
+            'reused': 0,
+            'discarded_expired': 0,
+            'discarded_unhealthy': 0,
+            'timeouts': 0,
+            'waits': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'connect_ms_total': 0.0,
+        }
+
+    def _discard(self, connection, reason: str = None):
+        if reason:
+            with self._lock:
+                self._metrics[f'discarded_{reason}'] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _healthy(self, connection, returned_at: float) -> bool:
+        if not self.pre_ping or time.monotonic() - returned_at < self.ping_after:
+            return True
+        try:
+            if hasattr(connection, 'ping'):
+                connection.ping()
+            else:
+                connection.cursor().execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    def checkout(self, connect):
+        """A pooled connection, or a new one from `connect()` when none is idle."""
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._metrics['timeouts'] += 1
+            logger.warning(f"Database pool '{self.alias}' exhausted after waiting {self.timeout}s")
+            raise PoolTimeout(
+                f"No '{self.alias}' database connection became free within {self.timeout}s "
+                f"(pool size {self.max_size})"
+            )
+        waited_ms = (time.monotonic() - started) * 1000
+
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    break
+                connection, created_at, returned_at = entry
+                if time.monotonic() - created_at > self.max_age:
+                    self._discard(connection, 'expired')
+                elif not self._healthy(connection, returned_at):
+                    self._discard(connection, 'unhealthy')
+                else:
+                    self._record_checkout(waited_ms, reused=True)
+                    self._created_at[id(connection)] = created_at
+                    return connection
+
+            connect_started = time.monotonic()
+            connection = connect()
+            self._created_at[id(connection)] = time.monotonic()
+            self._record_checkout(waited_ms, reused=False, connect_ms=(time.monotonic() - connect_started) * 1000)
+            return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _record_checkout(self, waited_ms: float, reused: bool, connect_ms: float = 0.0):
+        with self._lock:
+            self._metrics['checkouts'] += 1
+            self._metrics['reused' if reused else 'created'] += 1
+            self._metrics['connect_ms_total'] += connect_ms
+            self._metrics['wait_ms_total'] += waited_ms
+            self._metrics['wait_ms_max'] = max(self._metrics['wait_ms_max'], round(waited_ms, 3))
+            if waited_ms >= 1:
+                self._metrics['waits'] += 1
+
+    def checkin(self, connection, reusable: bool = True):
+        """Return a checked-out connection; unusable or expired ones are closed instead."""
+        try:
+            created_at = self._created_at.pop(id(connection), 0.0)
+            if not self.enabled:
+                self._discard(connection)
+                return
+            if not reusable:
+                self._discard(connection, 'unhealthy')
+                return
+            if time.monotonic() - created_at > self.max_age:
+                self._discard(connection, 'expired')
+                return
+            with self._lock:
+                self._idle.append((connection, created_at, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, _, _ in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            checkouts = self._metrics['checkouts']
+            return {
+                'alias': self.alias,
+                'enabled': self.enabled,
+                'max_size': self.max_size,
+                'idle': len(self._idle),
+                'in_use': len(self._created_at),
+                **self._metrics,
+                'wait_ms_total': round(self._metrics['wait_ms_total'], 3),
+                'wait_ms_avg': round(self._metrics['wait_ms_total'] / checkouts, 3) if checkouts else 0.0,
+                'connect_ms_total': round(self._metrics['connect_ms_total'], 3),
+                'connect_ms_avg': (
+                    round(self._metrics['connect_ms_total'] / self._metrics['created'], 3)
+                    if self._metrics['created'] else 0.0
+                ),
+            }
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(alias: str, options: dict = None) -> ConnectionPool:
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(alias, {**DEFAULT_POOL_OPTIONS, **(options or {})})
+        return _pools[alias]
+
+def get_pool_metrics() -> dict:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.alias: pool.get_metrics() for pool in pools}
+
+class PooledConnectionMixin:
+    """
+    DatabaseWrapper mixin that draws raw connections from `ConnectionPool`.
+    Configure with `OPTIONS['pool']` (True or a dict of `DEFAULT_POOL_OPTIONS`
+    overrides), the same place Django's PostgreSQL backend reads its pool
+    settings from. Leave `CONN_MAX_AGE` at 0 so every request hands its
+    connection back to the pool for other threads to use.
+    """
+    def _pool_options(self):
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if not options:
+            return None
+        return {} if options is True else options
+
+    @property
+    def pool(self):
+        options = self._pool_options()
+        return None if options is None else get_pool(self.alias, options)
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None or not pool.enabled:
+            return super().get_new_connection(conn_params)
+        return pool.checkout(lambda: super(PooledConnectionMixin, self).get_new_connection(conn_params))
+
+    def _close(self):
+        pool = self.pool
+        if self.connection is None or pool is None or id(self.connection) not in pool._created_at:
+            return super()._close()
+        # A connection closed mid-transaction is still referenced by this wrapper, and one
+        # that raised errors may be broken; neither goes back to the pool
+        reusable = not self.in_atomic_block and not (self.errors_occurred and not self.is_usable())
+        if reusable and not self.get_autocommit():
+            try:
+                self.connection.rollback()
+            except Exception:
+                reusable = False
+        with self.wrap_database_errors:
+            pool.checkin(self.connection, reusable=reusable)
@@ -0,0 +1,6 @@
+from django.db.backends.mysql import base
+from hotel_backend.db_pool import PooledConnectionMixin
+
+class DatabaseWrapper(PooledConnectionMixin, base.DatabaseWrapper):
+    """MySQL backend that reuses connections from a per-alias pool (see `hotel_backend.db_pool`)."""
+    pass
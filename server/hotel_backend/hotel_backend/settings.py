@@ -138,34 +138,108 @@ PASSWORD_HASHERS = [
 WSGI_APPLICATION = 'hotel_backend.wsgi.application'
 ASGI_APPLICATION = 'hotel_backend.asgi.application'
 
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
+# Channel layer backend: "memory" (single process), "redis" (shared across
+# Daphne/worker processes) or "fakeredis" (Redis protocol in-process, for tests)
+CHANNEL_LAYER_BACKEND = os.getenv('CHANNEL_LAYER_BACKEND', 'memory')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+CHANNEL_LAYER_REDIS_CONFIG = {
+    'hosts': [{
+        'address': REDIS_URL,
+        'max_connections': int(os.getenv('CHANNEL_LAYER_MAX_CONNECTIONS', '50')),
+    }],
+    'prefix': os.getenv('CHANNEL_LAYER_PREFIX', 'azurea'),
+    'capacity': int(os.getenv('CHANNEL_LAYER_CAPACITY', '1000')),
+    'expiry': int(os.getenv('CHANNEL_LAYER_EXPIRY', '60')),
+    'group_expiry': int(os.getenv('CHANNEL_LAYER_GROUP_EXPIRY', '86400')),
 }
 
+if CHANNEL_LAYER_BACKEND == 'redis':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'hotel_backend.channel_layers.PooledRedisChannelLayer',
+            'CONFIG': CHANNEL_LAYER_REDIS_CONFIG,
+        },
+    }
+elif CHANNEL_LAYER_BACKEND == 'fakeredis':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'hotel_backend.channel_layers.FakeRedisChannelLayer',
+            'CONFIG': CHANNEL_LAYER_REDIS_CONFIG,
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+
+# Seconds to gather admin websocket broadcasts before sending the latest one per type
+BROADCAST_COALESCE_WINDOW = float(os.getenv('BROADCAST_COALESCE_WINDOW', '0.25'))
+
+# Booking deltas kept for replay (count and seconds, in the shared cache); reconnects further
+# behind get a full snapshot
+BOOKING_FEED_MAX_REPLAY = int(os.getenv('BOOKING_FEED_MAX_REPLAY', '200'))
+BOOKING_FEED_REPLAY_TTL = int(os.getenv('BOOKING_FEED_REPLAY_TTL', '3600'))
+
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Both aliases draw connections from a per-alias pool (hotel_backend/db_pool.py). CONN_MAX_AGE
+# stays 0 so each request returns its connection to the pool; the pool decides how long
+# connections live, pings ones that sat idle, and caps how many exist at once.
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+DB_POOL_MAX_AGE = int(os.getenv('DB_POOL_MAX_AGE', '300'))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'hotel_backend.pooled_mysql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'pool': {
+                'max_size': int(os.getenv('DB_POOL_SIZE', '20')),
+                'max_age': DB_POOL_MAX_AGE,
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '5')),
+                'pre_ping': DB_POOL_PRE_PING,
+            },
+        },
     },
     'SystemInteg': {
-        "ENGINE": "django.db.backends.mysql",
+        # Pooled MySQL with the CraveOn circuit breaker and concurrency limit (booking/craveon_guard.py)
+        "ENGINE": "booking.craveon_db",
         "NAME": os.getenv('CRAVEON_DB_NAME'),
         "USER": os.getenv('CRAVEON_DB_USER'),
         "PASSWORD": os.getenv('CRAVEON_DB_PASSWORD'),
         "HOST": os.getenv('CRAVEON_DB_HOST'),
         "PORT": os.getenv('CRAVEON_DB_PORT'),
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {
+            "connect_timeout": int(os.getenv('CRAVEON_DB_CONNECT_TIMEOUT', '3')),
+            "read_timeout": int(os.getenv('CRAVEON_DB_READ_TIMEOUT', '5')),
+            "write_timeout": int(os.getenv('CRAVEON_DB_WRITE_TIMEOUT', '5')),
+            "pool": {
+                "max_size": int(os.getenv('CRAVEON_DB_POOL_SIZE', '8')),
+                "max_age": DB_POOL_MAX_AGE,
+                "timeout": float(os.getenv('CRAVEON_DB_POOL_TIMEOUT', '2')),
+                "pre_ping": DB_POOL_PRE_PING,
+            },
+        },
     }
 }
 
+# CraveOn circuit breaker: consecutive failures before opening, seconds before a half-open probe,
+# concurrent CraveOn calls allowed, and seconds a caller waits for a free slot
+CRAVEON_BREAKER_FAILURE_THRESHOLD = int(os.getenv('CRAVEON_BREAKER_FAILURE_THRESHOLD', '5'))
+CRAVEON_BREAKER_RESET_TIMEOUT = int(os.getenv('CRAVEON_BREAKER_RESET_TIMEOUT', '30'))
+CRAVEON_MAX_CONCURRENCY = int(os.getenv('CRAVEON_MAX_CONCURRENCY', '8'))
+CRAVEON_BULKHEAD_WAIT = float(os.getenv('CRAVEON_BULKHEAD_WAIT', '0.5'))
+
 AUTHENTICATION_BACKENDS = [
     'user_roles.backends.MultiDBAuthBackend',
     'django.contrib.auth.backends.ModelBackend',
@@ -176,7 +250,8 @@ DATABASE_ROUTERS = [
     'booking.routers.CraveOnRouter',
 ]
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Override with locmem/console backends locally and in tests
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -184,6 +259,15 @@ EMAIL_USE_SSL = False
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 
+# Email outbox: views enqueue, a worker sends batches over one SMTP connection
+EMAIL_OUTBOX_WORKER = os.getenv('EMAIL_OUTBOX_WORKER', 'True') == 'True'
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '20'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_BASE = int(os.getenv('EMAIL_OUTBOX_RETRY_BASE', '30'))
+EMAIL_OUTBOX_POLL_INTERVAL = int(os.getenv('EMAIL_OUTBOX_POLL_INTERVAL', '15'))
+# Seconds OTP and reset password mails are kept in the outbox, sent or not
+EMAIL_OUTBOX_SENSITIVE_RETENTION = int(os.getenv('EMAIL_OUTBOX_SENSITIVE_RETENTION', '600'))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -222,6 +306,13 @@ STATIC_URL = 'static/'
 
 MEDIA_URL = '/media/'
 
+# Uploads are streamed to temp files chunk by chunk and rejected mid-stream once
+# a file passes FILE_UPLOAD_MAX_FILE_SIZE, so no upload is ever buffered whole in memory
+FILE_UPLOAD_HANDLERS = ['hotel_backend.uploads.SizeCappedTemporaryFileUploadHandler']
+FILE_UPLOAD_CHUNK_SIZE = int(os.getenv('FILE_UPLOAD_CHUNK_SIZE', str(64 * 1024)))
+FILE_UPLOAD_MAX_FILE_SIZE = int(os.getenv('FILE_UPLOAD_MAX_FILE_SIZE', str(10 * 1024 * 1024)))
+FILE_UPLOAD_TEMP_DIR = os.getenv('FILE_UPLOAD_TEMP_DIR') or None
+
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
 CLOUDINARY = {
@@ -244,14 +335,93 @@ cloudinary.config(
     api_secret=os.getenv('API_SECRET')
 )
 
+# Media upload queue: requests stage files locally, a worker pool pushes them to the backend
+# "local" copies files under MEDIA_UPLOAD_LOCAL_ROOT instead of calling Cloudinary (tests, offline dev)
+MEDIA_UPLOAD_BACKEND = os.getenv('MEDIA_UPLOAD_BACKEND', 'cloudinary')
+MEDIA_UPLOAD_WORKER = os.getenv('MEDIA_UPLOAD_WORKER', 'True') == 'True'
+MEDIA_UPLOAD_WORKERS = int(os.getenv('MEDIA_UPLOAD_WORKERS', '8'))
+MEDIA_UPLOAD_MAX_ATTEMPTS = int(os.getenv('MEDIA_UPLOAD_MAX_ATTEMPTS', '5'))
+MEDIA_UPLOAD_RETRY_BASE = int(os.getenv('MEDIA_UPLOAD_RETRY_BASE', '15'))
+MEDIA_UPLOAD_POLL_INTERVAL = int(os.getenv('MEDIA_UPLOAD_POLL_INTERVAL', '10'))
+MEDIA_UPLOAD_TIMEOUT = int(os.getenv('MEDIA_UPLOAD_TIMEOUT', '60'))
+# Files above this go to Cloudinary in chunks of this size (Cloudinary's minimum is 5MB)
+MEDIA_UPLOAD_CHUNK_SIZE = int(os.getenv('MEDIA_UPLOAD_CHUNK_SIZE', str(6 * 1024 * 1024)))
+MEDIA_UPLOAD_STAGING_ROOT = os.getenv('MEDIA_UPLOAD_STAGING_ROOT', os.path.join(BASE_DIR, 'media', 'staging'))
+MEDIA_UPLOAD_LOCAL_ROOT = os.getenv('MEDIA_UPLOAD_LOCAL_ROOT', os.path.join(BASE_DIR, 'media', 'local_uploads'))
+MEDIA_UPLOAD_LOCAL_URL = os.getenv('MEDIA_UPLOAD_LOCAL_URL', 'http://localhost:8000/master/local_media/')
+
+# Uploaded photos are re-encoded without metadata, capped to a maximum edge, and
+# property photos get thumbnail variants ("name:max_edge" pairs)
+IMAGE_NORMALIZE = os.getenv('IMAGE_NORMALIZE', 'True') == 'True'
+IMAGE_MAX_DIMENSION = int(os.getenv('IMAGE_MAX_DIMENSION', '1920'))
+IMAGE_OUTPUT_FORMAT = os.getenv('IMAGE_OUTPUT_FORMAT', 'WEBP')
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', '80'))
+IMAGE_THUMBNAIL_SIZES = {
+    name: int(size) for name, size in
+    (pair.split(':') for pair in os.getenv('IMAGE_THUMBNAIL_SIZES', 'thumb:320,medium:960').split(','))
+}
+
+# CraveOn menu images rendered to disk per item and content hash, evicted least-recently-used by total size
+CRAVEON_IMAGE_CACHE_ROOT = os.getenv('CRAVEON_IMAGE_CACHE_ROOT', os.path.join(BASE_DIR, 'media', 'craveon_images'))
+CRAVEON_IMAGE_CACHE_MAX_BYTES = int(os.getenv('CRAVEON_IMAGE_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+CRAVEON_IMAGE_SIZES = {
+    name: int(size) for name, size in
+    (pair.split(':') for pair in os.getenv('CRAVEON_IMAGE_SIZES', 'thumb:160,card:480,full:1024').split(','))
+}
+
+# CraveOn menu snapshot: seconds between change probes, forced reload age, and how long a
+# request waits on a refresh before falling back to the last-known-good snapshot
+CRAVEON_MENU_PROBE_INTERVAL = int(os.getenv('CRAVEON_MENU_PROBE_INTERVAL', '30'))
+CRAVEON_MENU_MAX_AGE = int(os.getenv('CRAVEON_MENU_MAX_AGE', '600'))
+CRAVEON_MENU_REFRESH_TIMEOUT = float(os.getenv('CRAVEON_MENU_REFRESH_TIMEOUT', '2'))
+
+# CraveOn order status feed (run_order_status_feed): seconds between polls, orders read per query,
+# and how many order ids below the high-water mark are re-scanned for orders that committed late
+CRAVEON_ORDER_FEED_INTERVAL = float(os.getenv('CRAVEON_ORDER_FEED_INTERVAL', '3'))
+CRAVEON_ORDER_FEED_BATCH_SIZE = int(os.getenv('CRAVEON_ORDER_FEED_BATCH_SIZE', '500'))
+CRAVEON_ORDER_FEED_LOOKBACK = int(os.getenv('CRAVEON_ORDER_FEED_LOOKBACK', '200'))
+
+# Per-guest cache of reviewed and reviewable food orders, dropped on review or when an order closes
+CRAVEON_FOOD_REVIEWS_CACHE_TIMEOUT = int(os.getenv('CRAVEON_FOOD_REVIEWS_CACHE_TIMEOUT', '300'))
+
+# PDF rendering process pool (receipts, monthly reports) and where finished files are kept
+PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', '2'))
+PDF_RENDER_ROOT = os.getenv('PDF_RENDER_ROOT', os.path.join(BASE_DIR, 'media', 'pdf_jobs'))
+# Seconds after which a queued job is resubmitted and a running job is treated as interrupted
+PDF_RENDER_STALE_AFTER = int(os.getenv('PDF_RENDER_STALE_AFTER', '600'))
+
 # Cache settings
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,
+# "redis" shares the cache (OTPs, notification presence) across processes
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_REDIS_URL', REDIS_URL),
+            'TIMEOUT': 300,
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 300,
+        }
+    }
+
+# Seconds a notification socket counts as online without a heartbeat
+PRESENCE_TTL = int(os.getenv('PRESENCE_TTL', '90'))
+
+# Seconds a cached unread-notification counter lives before it is recounted
+UNREAD_COUNT_TTL = int(os.getenv('UNREAD_COUNT_TTL', '600'))
+
+# Seconds an authenticated user's row is served from cache; saves and deletes drop it sooner
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', '60'))
+
+# Read notifications older than this are moved to notifications_archive by compact_notifications
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '90'))
 
 CACHE_MIDDLEWARE_ALIAS = 'default'
 CACHE_MIDDLEWARE_SECONDS = 600
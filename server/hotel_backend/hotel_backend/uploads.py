@@ -0,0 +1,63 @@
+import base64
+from django.conf import settings
+from django.http import QueryDict
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+
+# Multiple of 3 so every chunk encodes to base64 without padding
+BASE64_CHUNK_SIZE = 3 * 16 * 1024
+
+class UploadTooLarge(MultiPartParserError):
+    pass
+
+class SizeCappedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams every uploaded file straight to a temporary file in
+    `FILE_UPLOAD_CHUNK_SIZE` pieces, so a request never holds more than one
+    chunk of an upload in memory. A file growing past
+    `FILE_UPLOAD_MAX_FILE_SIZE` is dropped as soon as the limit is crossed
+    instead of after the whole body has been read.
+    """
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.chunk_size = getattr(settings, 'FILE_UPLOAD_CHUNK_SIZE', self.chunk_size)
+        self.max_file_size = getattr(settings, 'FILE_UPLOAD_MAX_FILE_SIZE', None)
+        self.received = 0
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.max_file_size and self.received > self.max_file_size:
+            self.upload_interrupted()
+            raise UploadTooLarge(
+                f"{self.file_name} exceeds the {self.max_file_size // (1024 * 1024)}MB upload limit"
+            )
+        return super().receive_data_chunk(raw_data, start)
+
+def copy_request_data(data):
+    """
+    Mutable copy of `request.data`. `QueryDict.copy()` deep-copies its values,
+    which fails on the temporary files uploads are streamed to, so files are
+    shared with the original instead.
+    """
+    if isinstance(data, QueryDict):
+        copied = QueryDict(mutable=True)
+        for key, values in data.lists():
+            copied.setlist(key, list(values))
+        return copied
+    return data.copy()
+
+def b64encode_upload(uploaded_file) -> str:
+    """Base64 of an uploaded file, read in small chunks rather than all at once."""
+    uploaded_file.seek(0)
+    encoded = []
+    while True:
+        chunk = uploaded_file.read(BASE64_CHUNK_SIZE)
+        if not chunk:
+            break
+        encoded.append(base64.b64encode(chunk).decode('ascii'))
+    uploaded_file.seek(0)
+    return ''.join(encoded)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0002_roomimages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='areas',
+            name='media_status',
+            field=models.CharField(choices=[('ready', 'Ready'), ('pending', 'Pending'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='rooms',
+            name='media_status',
+            field=models.CharField(choices=[('ready', 'Ready'), ('pending', 'Pending'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+    ]
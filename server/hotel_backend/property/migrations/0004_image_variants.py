@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0003_media_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='areaimages',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='roomimages',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
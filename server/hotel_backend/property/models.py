@@ -1,6 +1,13 @@
 from django.db import models
 from cloudinary.models import CloudinaryField
 
+# Set while uploaded images are still waiting in the media upload queue
+MEDIA_STATUS_CHOICES = [
+    ('ready', 'Ready'),
+    ('pending', 'Pending'),
+    ('failed', 'Failed'),
+]
+
 # Create your models here.
 class Amenities(models.Model):
     description = models.TextField(blank=True, null=True)
@@ -45,6 +52,7 @@ class Rooms(models.Model):
     max_guests = models.PositiveIntegerField(default=2, help_text="Maximum number of guests allowed")
     amenities = models.ManyToManyField(Amenities, related_name='rooms', blank=True)
     discount_percent = models.PositiveIntegerField(default=0)
+    media_status = models.CharField(max_length=20, choices=MEDIA_STATUS_CHOICES, default='ready')
     
     class Meta:
         db_table = 'rooms'
@@ -52,6 +60,7 @@ class Rooms(models.Model):
 class RoomImages(models.Model):
     room = models.ForeignKey(Rooms, related_name='images', on_delete=models.CASCADE)
     room_image = CloudinaryField('room_image', null=True, blank=True)
+    variants = models.JSONField(default=dict, blank=True)
     
     class Meta:
         db_table = 'room_images'
@@ -72,6 +81,7 @@ class Areas(models.Model):
         default='available',
     )
     discount_percent = models.PositiveIntegerField(default=0)
+    media_status = models.CharField(max_length=20, choices=MEDIA_STATUS_CHOICES, default='ready')
     
     class Meta:
         db_table = 'areas'
@@ -79,6 +89,7 @@ class Areas(models.Model):
 class AreaImages(models.Model):
     area = models.ForeignKey(Areas, related_name='images', on_delete=models.CASCADE)
     area_image = CloudinaryField('area_image', null=True, blank=True)
+    variants = models.JSONField(default=dict, blank=True)
     
     class Meta:
         db_table = 'area_images'
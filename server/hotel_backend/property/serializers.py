@@ -10,21 +10,24 @@ class AmenitySerializer(serializers.ModelSerializer):
 class RoomImagesSerializer(serializers.ModelSerializer):
     class Meta:
         model = RoomImages
-        fields = ['id', 'room_image']
+        fields = ['id', 'room_image', 'variants']
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         representation['room_image'] = instance.room_image.url if instance.room_image else None
+        # List views use the thumbnail; images uploaded before variants existed fall back to the original
+        representation['thumbnail'] = (instance.variants or {}).get('thumb') or representation['room_image']
         return representation
 
 class AreaImagesSerializer(serializers.ModelSerializer):
     class Meta:
         model = AreaImages
-        fields = ['id', 'area_image']
+        fields = ['id', 'area_image', 'variants']
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         representation['area_image'] = instance.area_image.url if instance.area_image else None
+        representation['thumbnail'] = (instance.variants or {}).get('thumb') or representation['area_image']
         return representation
 
 class RoomSerializer(serializers.ModelSerializer):
@@ -51,7 +54,9 @@ class RoomSerializer(serializers.ModelSerializer):
             'max_guests',
             'amenities',
             'average_rating',
+            'media_status',
         ]
+        read_only_fields = ['media_status']
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -118,7 +123,9 @@ class AreaSerializer(serializers.ModelSerializer):
             'discount_percent',
             'senior_discounted_price',
             'average_rating',
+            'media_status',
         ]
+        read_only_fields = ['media_status']
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -1,7 +1,11 @@
 import jwt
 from django.conf import settings
 from datetime import datetime, timedelta
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from .user_cache import get_cached_user
 
 def generate_customer_jwt(customer, token_type='access'):
     lifetime = timedelta(days=1) if token_type == 'access' else timedelta(days=7)
@@ -43,4 +47,20 @@ class CookieJWTAuthentication(JWTAuthentication):
             return None
         
         validated_token = self.get_validated_token(raw_token)
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        # Revocation checks compare the password hash, which is never cached
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            or api_settings.USER_ID_FIELD != 'id'
+            or api_settings.USER_ID_CLAIM not in validated_token
+        ):
+            return super().get_user(validated_token)
+
+        user = get_cached_user(validated_token[api_settings.USER_ID_CLAIM])
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
\ No newline at end of file
@@ -1,7 +1,10 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from .models import Notification
+from .presence import mark_online, mark_offline, refresh_presence
+from .notification_counters import get_unread_count, set_unread_count
 import json
 import logging
 import traceback
@@ -13,6 +16,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         super().__init__(*args, **kwargs)
         self.user = None
         self.group_name = None
+        self.online_user_id = None
 
     async def connect(self):
         try:
@@ -38,6 +42,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                     'count': count
                 }))
             elif message_type == 'heartbeat':
+                if self.online_user_id:
+                    await sync_to_async(refresh_presence)(self.online_user_id)
                 await self.send(text_data=json.dumps({'type': 'heartbeat_ack'}))
         except json.JSONDecodeError:
             logger.error(f"WS: Invalid JSON recieved: {text_data}")
@@ -69,6 +75,10 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 self.channel_name
             )
+            if self.online_user_id != self.user.id:
+                await self.set_offline()
+                await sync_to_async(mark_online)(self.user.id)
+                self.online_user_id = self.user.id
             await self.send_initial_count()
         except Exception:
             await self.close()
@@ -90,8 +100,14 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             logger.error(f"WS: Error sending initial count: {str(e)}")
 
+    async def set_offline(self):
+        if self.online_user_id:
+            await sync_to_async(mark_offline)(self.online_user_id)
+            self.online_user_id = None
+
     async def disconnect(self, close_code):
         try:
+            await self.set_offline()
             if self.group_name:
                 await self.channel_layer.group_discard(
                     self.group_name,
@@ -119,6 +135,16 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             logger.error(f"WS: Error updating unread count: {str(e)}")
 
+    async def food_order_status(self, event):
+        try:
+            await self.send(text_data=json.dumps({
+                'type': 'food_order_status',
+                'booking_id': event['booking_id'],
+                'orders': event['orders']
+            }))
+        except Exception as e:
+            logger.error(f"WS: Error sending food order status: {str(e)}")
+
     @database_sync_to_async
     def get_user(self, user_id):
         try:
@@ -128,9 +154,10 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        return Notification.objects.filter(user=self.user, is_read=False).count()
+        return get_unread_count(self.user.id)
 
     @database_sync_to_async
     def mark_notifications_read(self):
         Notification.objects.filter(user=self.user, is_read=False).update(is_read=True)
+        set_unread_count(self.user.id, 0)
         return 0
\ No newline at end of file
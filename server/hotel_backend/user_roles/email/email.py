@@ -1,89 +1,80 @@
-from django.core.mail import EmailMultiAlternatives
+from django.core.cache import cache
+from django.template.loader import get_template
+from admin_dashboard.service.outbox import enqueue_email
 import random, os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def send_otp_to_email(email, message):
+OTP_EXPIRATION_TIME = 120
+
+# Repeat requests for the same address and purpose inside this window reuse the queued mail
+OTP_SEND_GUARD_TIME = 30
+
+def generate_otp():
+    return random.randint(100000, 999999)
+
+def _render_otp_email(**context):
+    # Loaded through the cached template loader, so the template is compiled once per process
+    return get_template('email/otp.html').render({'validity': '2 minutes', **context})
+
+def send_otp_to_email(email, message, otp=None):
     try:
-        otp = random.randint(100000, 999999)
+        otp = otp or generate_otp()
         subject = f"Azurea Hotel OTP for Account Verification"
-        otp_message = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-            <head>
-    <meta charset="UTF-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-    <meta http-equiv="X-UA-Compatible" content="ie=edge" />
-    <title>Account Verification OTP</title>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600&display=swap" rel="stylesheet" />
-    </head>
-    <body style="margin: 0; font-family: 'Poppins', sans-serif; background: #ffffff; font-size: 14px;">
-    <div style="max-width: 680px; margin: 0 auto; padding: 45px 30px 60px; background: #f4f7ff; background-image: url(https://archisketch-resources.s3.ap-northeast-2.amazonaws.com/vrstyler/1661497957196_595865/email-template-background-banner); background-repeat: no-repeat; background-size: 800px 452px; background-position: top center; font-size: 14px; color: #434343;">
-        <main>
-        <div style="margin: 0; margin-top: 70px; padding: 92px 30px 115px; background: #ffffff; border-radius: 30px; text-align: center;">
-            <div style="width: 100%; max-width: 489px; margin: 0 auto;">
-            <h1 style="margin: 0; font-size: 24px; font-weight: 500; color: #1f1f1f;">Your OTP for Account Verification</h1>
-            <p style="margin: 0; margin-top: 17px; font-size: 16px; font-weight: 500;">Hey {email},</p>
-            <p style="margin: 0; margin-top: 17px; font-weight: 500; letter-spacing: 0.56px;">
-                Thank you for choosing Azurea Hotel Management. Use the following OTP to complete the procedure to change your email address. OTP is valid for 
-                <span style="font-weight: 600; color: #1f1f1f;">2 minutes</span>. Do not share this code with others.
-            </p>
-            <p style="margin: 0; margin-top: 60px; font-size: 40px; font-weight: 600; letter-spacing: 25px; color: #ba3d4f;">{otp}</p>
-            </div>
-        </div>
-        </main>
-    </div>
-    </body>
-</html>
-"""
+        otp_message = _render_otp_email(
+            title="Account Verification OTP",
+            heading="Your OTP for Account Verification",
+            instructions="Thank you for choosing Azurea Hotel Management. Use the following OTP to complete the procedure to change your email address. OTP is valid for",
+            email=email,
+            otp=otp,
+        )
         email_from = os.getenv('EMAIL_HOST_USER')
-        msg = EmailMultiAlternatives(subject, message, email_from, [email])
-        msg.attach_alternative(otp_message, "text/html")
-        msg.send()
-        
+        enqueue_email(subject, message, [email], html_body=otp_message, from_email=email_from, category='otp')
+
         return otp
     except Exception:
         return None
 
-def send_reset_password(email):
+def send_reset_password(email, otp=None):
     try:
-        otp = random.randint(100000, 999999)
+        otp = otp or generate_otp()
         subject = f"Azurea Hotel Reset Password"
-        message = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-            <head>
-    <meta charset="UTF-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-    <meta http-equiv="X-UA-Compatible" content="ie=edge" />
-    <title>Reset Password OTP</title>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600&display=swap" rel="stylesheet" />
-    </head>
-    <body style="margin: 0; font-family: 'Poppins', sans-serif; background: #ffffff; font-size: 14px;">
-    <div style="max-width: 680px; margin: 0 auto; padding: 45px 30px 60px; background: #f4f7ff; background-image: url(https://archisketch-resources.s3.ap-northeast-2.amazonaws.com/vrstyler/1661497957196_595865/email-template-background-banner); background-repeat: no-repeat; background-size: 800px 452px; background-position: top center; font-size: 14px; color: #434343;">
-        <main>
-        <div style="margin: 0; margin-top: 70px; padding: 92px 30px 115px; background: #ffffff; border-radius: 30px; text-align: center;">
-            <div style="width: 100%; max-width: 489px; margin: 0 auto;">
-            <h1 style="margin: 0; font-size: 24px; font-weight: 500; color: #1f1f1f;">Your OTP for Reset Password</h1>
-            <p style="margin: 0; margin-top: 17px; font-size: 16px; font-weight: 500;">Hey {email},</p>
-            <p style="margin: 0; margin-top: 17px; font-weight: 500; letter-spacing: 0.56px;">
-                Thank you for choosing Azurea Hotel Management. Use the following Reset Password OTP to complete the procedure to reset your password. The Reset Password OTP is valid for 
-                <span style="font-weight: 600; color: #1f1f1f;">2 minutes</span>. Do not share this code with others.
-            </p>
-            <p style="margin: 0; margin-top: 60px; font-size: 40px; font-weight: 600; letter-spacing: 25px; color: #ba3d4f;">{otp}</p>
-            </div>
-        </div>
-        </main>
-    </div>
-    </body>
-</html>
-"""
+        message = _render_otp_email(
+            title="Reset Password OTP",
+            heading="Your OTP for Reset Password",
+            instructions="Thank you for choosing Azurea Hotel Management. Use the following Reset Password OTP to complete the procedure to reset your password. The Reset Password OTP is valid for",
+            email=email,
+            otp=otp,
+        )
         email_from = os.getenv('EMAIL_HOST_USER')
-        msg = EmailMultiAlternatives(subject, message, email_from, [email])
-        msg.attach_alternative(message, "text/html")
-        msg.send()
-        
+        enqueue_email(subject, message, [email], html_body=message, from_email=email_from, category='reset_password')
+
         return otp
     except Exception:
         return None
+
+def issue_otp(email, purpose, send, *args, reuse_existing=False):
+    """
+    Store an OTP under `{email}_{purpose}` and queue its email. The OTP is in
+    the cache before the mail is queued, so verification never races the
+    send. While a send for the same address and purpose is within
+    `OTP_SEND_GUARD_TIME`, the stored OTP is returned without queueing
+    another mail. Returns the OTP, or None when the mail could not be queued.
+    """
+    cache_key = f"{email}_{purpose}"
+    guard_key = f"{cache_key}_sending"
+
+    if not cache.add(guard_key, True, OTP_SEND_GUARD_TIME):
+        existing = cache.get(cache_key)
+        if existing:
+            return existing
+
+    otp = (cache.get(cache_key) if reuse_existing else None) or generate_otp()
+    cache.set(cache_key, otp, OTP_EXPIRATION_TIME)
+
+    if send(email, *args, otp=otp) is None:
+        cache.delete(cache_key)
+        cache.delete(guard_key)
+        return None
+    return otp
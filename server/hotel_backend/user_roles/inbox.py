@@ -0,0 +1,132 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from .models import Notification, ArchivedNotification
+from .notification_counters import adjust_unread_count
+
+# Written by the booking post_save signal before the status-specific message exists
+GENERIC_BOOKING_TYPE = 'booking_update'
+
+def booking_dedupe_key(booking_id: int, status: str) -> str:
+    return f'booking:{booking_id}:{status}'
+
+def record_generic_booking_notification(user, booking, status: str, message: str):
+    """
+    Store the generic status-change row unless this transition already has a
+    notification. Never overwrites a status-specific message.
+    """
+    try:
+        with transaction.atomic():
+            notification, _ = Notification.objects.get_or_create(
+                user=user,
+                dedupe_key=booking_dedupe_key(booking.id, status),
+                defaults={
+                    'message': message,
+                    'notification_type': GENERIC_BOOKING_TYPE,
+                    'booking': booking,
+                }
+            )
+        return notification
+    except IntegrityError:
+        return Notification.objects.filter(user=user, dedupe_key=booking_dedupe_key(booking.id, status)).first()
+
+def upsert_booking_notification(user, booking, status: str, notification_type: str, message: str):
+    """
+    Store the notification for a booking transition, upgrading the generic row
+    for the same transition in place instead of adding a second one. A repeat
+    of an old transition is moved back to the top of the inbox as unread.
+
+    Returns `(notification, created)`.
+    """
+    key = booking_dedupe_key(booking.id, status)
+    with transaction.atomic():
+        existing = Notification.objects.select_for_update().filter(user=user, dedupe_key=key).first()
+        if existing is None:
+            try:
+                with transaction.atomic():
+                    return Notification.objects.create(
+                        user=user,
+                        message=message,
+                        notification_type=notification_type,
+                        booking=booking,
+                        dedupe_key=key,
+                    ), True
+            except IntegrityError:
+                existing = Notification.objects.select_for_update().get(user=user, dedupe_key=key)
+
+        was_read = existing.is_read
+        is_upgrade = existing.notification_type == GENERIC_BOOKING_TYPE
+        existing.message = message
+        existing.notification_type = notification_type
+        existing.booking = booking
+        existing.is_read = False
+        if not is_upgrade:
+            existing.created_at = timezone.now()
+        existing.save(update_fields=['message', 'notification_type', 'booking', 'is_read', 'created_at'])
+
+    if was_read:
+        adjust_unread_count(user.id, 1)
+    return existing, False
+
+def collapse_duplicate_booking_notifications(dry_run: bool = False) -> int:
+    """
+    Delete generic rows written before deduplication existed, when the same
+    booking already has a status-specific notification from the same moment.
+    """
+    window = timedelta(seconds=getattr(settings, 'NOTIFICATION_DUPLICATE_WINDOW', 10))
+    specific = Notification.objects.filter(
+        user=OuterRef('user'),
+        booking=OuterRef('booking'),
+        created_at__gte=OuterRef('created_at') - window,
+        created_at__lte=OuterRef('created_at') + window,
+    ).exclude(notification_type=GENERIC_BOOKING_TYPE)
+
+    duplicates = Notification.objects.filter(
+        notification_type=GENERIC_BOOKING_TYPE,
+        dedupe_key__isnull=True,
+        booking__isnull=False,
+    ).filter(Exists(specific))
+
+    if dry_run:
+        return duplicates.count()
+    deleted, _ = duplicates.delete()
+    return deleted
+
+def archive_read_notifications(days: int = None, batch_size: int = 500, dry_run: bool = False) -> int:
+    """
+    Move read notifications older than `days` into `notifications_archive` in
+    batches, so the live inbox only holds unread and recent rows.
+    """
+    days = days if days is not None else getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 90)
+    cutoff = timezone.now() - timedelta(days=days)
+    expired = Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+    if dry_run:
+        return expired.count()
+
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(expired.order_by('id')[:batch_size])
+            if not batch:
+                break
+
+            ArchivedNotification.objects.bulk_create([
+                ArchivedNotification(
+                    id=notification.id,
+                    user_id=notification.user_id,
+                    message=notification.message,
+                    notification_type=notification.notification_type,
+                    booking_id=notification.booking_id,
+                    is_read=notification.is_read,
+                    created_at=notification.created_at,
+                    dedupe_key=notification.dedupe_key,
+                )
+                for notification in batch
+            ], ignore_conflicts=True)
+            Notification.objects.filter(id__in=[notification.id for notification in batch]).delete()
+        archived += len(batch)
+
+    return archived
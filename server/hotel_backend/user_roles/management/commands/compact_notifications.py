@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from user_roles.inbox import archive_read_notifications, collapse_duplicate_booking_notifications
+
+class Command(BaseCommand):
+    help = 'Collapse duplicate booking notifications and archive old read notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 90),
+            help='Archive read notifications older than this many days'
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would change')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        prefix = "Would remove" if dry_run else "Removed"
+
+        collapsed = collapse_duplicate_booking_notifications(dry_run=dry_run)
+        self.stdout.write(f"{prefix} {collapsed} duplicate booking notifications")
+
+        archived = archive_read_notifications(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            dry_run=dry_run
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Would archive' if dry_run else 'Archived'} {archived} read notifications older than {options['days']} days"
+            )
+        )
@@ -0,0 +1,226 @@
+import asyncio
+import copy
+import multiprocessing
+import queue
+import socket
+import time
+from types import SimpleNamespace
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.module_loading import import_string
+from channels_redis.core import RedisChannelLayer
+from hotel_backend.channel_layers import FakeRedisChannelLayer
+from user_roles.consumers import NotificationConsumer
+
+class LoadTestNotificationConsumer(NotificationConsumer):
+    """`NotificationConsumer` with the unread count lookup stubbed out so the test only measures the channel layer."""
+    async def get_unread_count(self):
+        return 0
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _serve_fake_redis(port):
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(('127.0.0.1', port), server_type='redis')
+    server.serve_forever()
+
+def _use_channel_layer(layer_settings):
+    from channels.layers import channel_layers
+
+    settings.CHANNEL_LAYERS = layer_settings
+    channel_layers.backends.clear()
+
+async def _hold_connections(worker_index, count, users, rounds, timeout, ready_queue):
+    from channels.testing import WebsocketCommunicator
+
+    communicators = []
+
+    async def open_connection(offset):
+        user_id = (worker_index * count + offset) % users + 1
+        communicator = WebsocketCommunicator(LoadTestNotificationConsumer.as_asgi(), '/ws/notifications/')
+        communicator.scope['user'] = SimpleNamespace(id=user_id, is_authenticated=True)
+        connected, _ = await communicator.connect(timeout=timeout)
+        if not connected:
+            return None
+        await communicator.receive_json_from(timeout=timeout)  # initial_count
+        return communicator
+
+    # Open in batches so the event loop is not flooded with handshakes at once
+    for start in range(0, count, 200):
+        opened = await asyncio.gather(*[
+            open_connection(offset) for offset in range(start, min(start + 200, count))
+        ], return_exceptions=True)
+        communicators.extend(c for c in opened if isinstance(c, WebsocketCommunicator))
+
+    ready_queue.put(len(communicators))
+
+    async def collect(communicator):
+        latencies = []
+        for _ in range(rounds):
+            try:
+                message = await communicator.receive_json_from(timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+            latencies.append((time.time() - message['notification']['sent_at']) * 1000)
+        return latencies
+
+    results = await asyncio.gather(*[collect(c) for c in communicators])
+
+    for communicator in communicators:
+        await communicator.disconnect()
+
+    return [latency for latencies in results for latency in latencies]
+
+def _run_worker(worker_index, count, users, rounds, timeout, layer_settings, ready_queue, result_queue):
+    connections.close_all()
+    _use_channel_layer(layer_settings)
+    try:
+        latencies = asyncio.run(_hold_connections(worker_index, count, users, rounds, timeout, ready_queue))
+        result_queue.put({'worker': worker_index, 'latencies': latencies, 'error': None})
+    except Exception as e:
+        result_queue.put({'worker': worker_index, 'latencies': [], 'error': str(e)})
+
+async def _broadcast(users, rounds, interval):
+    from channels.layers import get_channel_layer
+
+    channel_layer = get_channel_layer()
+    send_times = []
+    for round_number in range(rounds):
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            channel_layer.group_send(f'notifications_{user_id}', {
+                'type': 'send_notification',
+                'notification': {
+                    'id': round_number,
+                    'message': 'Load test broadcast',
+                    'sent_at': time.time(),
+                },
+                'unread_count': 0,
+            })
+            for user_id in range(1, users + 1)
+        ])
+        send_times.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return send_times
+
+class Command(BaseCommand):
+    help = 'Hold NotificationConsumer websocket connections across several processes and measure broadcast latency through the shared channel layer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4, help='Worker processes holding connections')
+        parser.add_argument('--connections', type=int, default=500, help='Connections held by each worker')
+        parser.add_argument('--users', type=int, default=None, help='Distinct notification groups (defaults to one per connection)')
+        parser.add_argument('--rounds', type=int, default=10, help='Broadcast rounds sent to every group')
+        parser.add_argument('--interval', type=float, default=0.5, help='Seconds between broadcast rounds')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Seconds to wait for connections and messages')
+        parser.add_argument('--redis-url', default=None, help='Redis server to use instead of the configured channel layer')
+        parser.add_argument('--fake-server', action='store_true', help='Run a local fakeredis TCP server for the test')
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        per_process = options['connections']
+        total = processes * per_process
+        users = options['users'] or total
+        rounds = options['rounds']
+        timeout = options['timeout']
+
+        layer_settings = copy.deepcopy(settings.CHANNEL_LAYERS)
+        fake_server = None
+        redis_url = options['redis_url']
+
+        if options['fake_server']:
+            port = _free_port()
+            fake_server = multiprocessing.Process(target=_serve_fake_redis, args=(port,), daemon=True)
+            fake_server.start()
+            redis_url = f'redis://127.0.0.1:{port}/0'
+            time.sleep(0.5)
+
+        if redis_url:
+            config = copy.deepcopy(getattr(settings, 'CHANNEL_LAYER_REDIS_CONFIG', {}))
+            config['hosts'] = [{'address': redis_url, 'max_connections': config.get('hosts', [{}])[0].get('max_connections')}]
+            layer_settings = {
+                'default': {
+                    'BACKEND': 'hotel_backend.channel_layers.PooledRedisChannelLayer',
+                    'CONFIG': config,
+                },
+            }
+        else:
+            backend = import_string(layer_settings['default']['BACKEND'])
+            if not issubclass(backend, RedisChannelLayer) or issubclass(backend, FakeRedisChannelLayer):
+                raise CommandError(
+                    "The configured channel layer does not span processes. "
+                    "Set CHANNEL_LAYER_BACKEND=redis, or pass --redis-url or --fake-server."
+                )
+
+        ready_queue = multiprocessing.Queue()
+        result_queue = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=_run_worker,
+                args=(index, per_process, users, rounds, timeout, layer_settings, ready_queue, result_queue),
+            )
+            for index in range(processes)
+        ]
+
+        self.stdout.write(f"Opening {total} connections across {processes} processes ({users} groups)...")
+        connect_started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+
+        try:
+            connected = 0
+            for _ in workers:
+                try:
+                    connected += ready_queue.get(timeout=timeout + per_process * 0.05)
+                except queue.Empty:
+                    raise CommandError("Timed out waiting for workers to open their connections")
+            connect_seconds = time.perf_counter() - connect_started
+            self.stdout.write(f"{connected}/{total} connections open after {connect_seconds:.2f}s")
+
+            _use_channel_layer(layer_settings)
+            send_times = asyncio.run(_broadcast(users, rounds, options['interval']))
+
+            latencies = []
+            errors = []
+            for _ in workers:
+                result = result_queue.get(timeout=timeout * 2 + rounds * options['interval'])
+                latencies.extend(result['latencies'])
+                if result['error']:
+                    errors.append(f"worker {result['worker']}: {result['error']}")
+        finally:
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            if fake_server:
+                fake_server.terminate()
+
+        latencies.sort()
+        expected = connected * rounds
+        self.stdout.write(f"Delivered {len(latencies)}/{expected} messages")
+        if send_times:
+            self.stdout.write(f"group_send per round: avg {sum(send_times) / len(send_times):.1f}ms, max {max(send_times):.1f}ms")
+        self.stdout.write(
+            f"Latency p50 {_percentile(latencies, 50):.1f}ms, "
+            f"p95 {_percentile(latencies, 95):.1f}ms, "
+            f"p99 {_percentile(latencies, 99):.1f}ms, "
+            f"max {_percentile(latencies, 100):.1f}ms"
+        )
+        for error in errors:
+            self.stdout.write(self.style.ERROR(error))
+
+        if errors or len(latencies) < expected:
+            self.stdout.write(self.style.WARNING("Some broadcasts were not delivered"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All broadcasts delivered"))
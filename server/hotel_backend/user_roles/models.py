@@ -65,9 +65,34 @@ class Notification(models.Model):
     booking = models.ForeignKey('booking.Bookings', on_delete=models.CASCADE, null=True, blank=True)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True)
     
     class Meta:
         db_table = 'notifications'
+        indexes = [
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notif_user_read_created_idx'),
+            models.Index(fields=['user', 'created_at'], name='notif_user_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'dedupe_key'], name='notif_user_dedupe_key_uniq'),
+        ]
+
+class ArchivedNotification(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(CustomUsers, on_delete=models.CASCADE)
+    message = models.TextField()
+    notification_type = models.CharField(max_length=20)
+    booking_id = models.BigIntegerField(null=True, blank=True)
+    is_read = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'notifications_archive'
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='notif_archive_user_created_idx'),
+        ]
 
 class CraveOnUser(models.Model):
     user_id = models.AutoField(primary_key=True)
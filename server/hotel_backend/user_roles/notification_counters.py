@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.cache import cache
+from .models import Notification
+
+UNREAD_KEY = 'notifications:unread:{}'
+
+def _counter_ttl() -> int:
+    # The counter is rebuilt from the table once it expires, which bounds any drift
+    return getattr(settings, 'UNREAD_COUNT_TTL', 600)
+
+def count_unread_from_db(user_id: int) -> int:
+    return Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+def get_unread_count(user_id: int) -> int:
+    """Cached unread count for the user, recounted from the table on a miss."""
+    key = UNREAD_KEY.format(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = count_unread_from_db(user_id)
+        cache.set(key, count, _counter_ttl())
+    return count
+
+def adjust_unread_count(user_id: int, delta: int):
+    """
+    Apply a change to a warm counter. A cold counter is left alone; the next
+    read recounts it, so it can never start from a wrong base.
+    """
+    key = UNREAD_KEY.format(user_id)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        return
+    if count < 0:
+        cache.delete(key)
+
+def set_unread_count(user_id: int, count: int):
+    cache.set(UNREAD_KEY.format(user_id), count, _counter_ttl())
+
+def reset_unread_count(user_id: int):
+    cache.delete(UNREAD_KEY.format(user_id))
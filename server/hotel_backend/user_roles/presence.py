@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.cache import cache
+
+PRESENCE_KEY = 'presence:user:{}'
+SKIPPED_KEY = 'presence:skipped:{}'
+SENT_KEY = 'presence:sent:{}'
+FANOUT_KINDS = ['send_notification', 'update_unread_count']
+
+def _presence_ttl() -> int:
+    # Refreshed by every heartbeat, so a crashed socket only counts as online for one TTL
+    return getattr(settings, 'PRESENCE_TTL', 90)
+
+def _incr(key: str, delta: int = 1, timeout=None) -> int:
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, max(delta, 0), timeout=timeout)
+        return max(delta, 0)
+
+def mark_online(user_id: int) -> int:
+    """Register one open socket for the user. Returns the user's socket count."""
+    key = PRESENCE_KEY.format(user_id)
+    count = _incr(key, 1, timeout=_presence_ttl())
+    cache.touch(key, _presence_ttl())
+    return count
+
+def mark_offline(user_id: int) -> int:
+    """Drop one open socket for the user. Returns the remaining socket count."""
+    key = PRESENCE_KEY.format(user_id)
+    if cache.get(key) is None:
+        return 0
+    count = _incr(key, -1, timeout=_presence_ttl())
+    if count <= 0:
+        cache.delete(key)
+        return 0
+    return count
+
+def refresh_presence(user_id: int):
+    key = PRESENCE_KEY.format(user_id)
+    if not cache.touch(key, _presence_ttl()):
+        mark_online(user_id)
+
+def is_online(user_id: int) -> bool:
+    return (cache.get(PRESENCE_KEY.format(user_id)) or 0) > 0
+
+def should_fan_out(user_id: int, kind: str = 'send_notification') -> bool:
+    """
+    True when the user has at least one open notification socket. Offline
+    users skip the realtime path entirely; their unread count is computed when
+    `NotificationConsumer` sends `initial_count` on reconnect.
+    """
+    if is_online(user_id):
+        _incr(SENT_KEY.format(kind))
+        return True
+    _incr(SKIPPED_KEY.format(kind))
+    return False
+
+def get_fanout_metrics() -> dict:
+    return {
+        kind: {
+            'sent': cache.get(SENT_KEY.format(kind)) or 0,
+            'skipped': cache.get(SKIPPED_KEY.format(kind)) or 0,
+        }
+        for kind in FANOUT_KINDS
+    }
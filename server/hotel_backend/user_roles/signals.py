@@ -1,15 +1,39 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Notification
+from .models import CustomUsers, Notification
 from .serializers import NotificationSerializer
+from .presence import should_fan_out
+from .notification_counters import adjust_unread_count, get_unread_count
+from .user_cache import invalidate_cached_user
+
+# Profile edits, archiving and password changes all save the user row
+@receiver(post_save, sender=CustomUsers)
+@receiver(post_delete, sender=CustomUsers)
+def invalidate_user_cache(sender, instance, using, **args):
+    user_id = instance.pk
+    invalidate_cached_user(user_id)
+    # A request that reads the row before the transaction commits caches the old
+    # values under the new version, so bump again once the change is visible
+    transaction.on_commit(lambda: invalidate_cached_user(user_id), using=using)
+
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, **args):
+    if created and not instance.is_read:
+        adjust_unread_count(instance.user_id, 1)
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **args):
+    if not instance.is_read:
+        adjust_unread_count(instance.user_id, -1)
 
 @receiver(post_save, sender=Notification)
 def send_notification(sender, instance, created, **args):
-    if created:
+    if created and should_fan_out(instance.user_id):
         channel_layer = get_channel_layer()
-        unread_count = Notification.objects.filter(user=instance.user, is_read=False).count()
+        unread_count = get_unread_count(instance.user_id)
         
         notification_data = NotificationSerializer(instance).data
         
@@ -29,6 +29,7 @@ urlpatterns = [
     
     # Notifications using /guest
     path('guest/notifications', views.get_notifications, name='get_notifications'),
+    path('guest/notifications/unread_count', views.get_unread_notification_count, name='get_unread_notification_count'),
     path('guest/notifications/<int:id>/read', views.mark_notification_read, name='mark_notification_read'),
     path('guest/notifications/read-all', views.mark_all_notifications_read, name='mark_all_notifications_read'),
 ]
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.cache import cache
+from .models import CustomUsers
+
+USER_KEY = 'auth:user:{}'
+USER_VERSION_KEY = 'auth:user_version:{}'
+
+# The password hash stays out of the shared cache; a view that needs it loads it on access
+CACHED_FIELDS = [field.attname for field in CustomUsers._meta.concrete_fields if field.attname != 'password']
+
+def _user_ttl() -> int:
+    return getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+def get_cached_user(user_id):
+    """
+    The user for an authenticated request. Served from cache when the cached
+    row carries the user's current version, otherwise loaded and cached.
+    Returns None if the user does not exist.
+    """
+    key = USER_KEY.format(user_id)
+    version_key = USER_VERSION_KEY.format(user_id)
+    cached = cache.get_many([key, version_key])
+    version = cached.get(version_key, 0)
+    entry = cached.get(key)
+
+    if entry is not None and entry[0] == version:
+        values = entry[1]
+    else:
+        values = CustomUsers.objects.filter(pk=user_id).values_list(*CACHED_FIELDS).first()
+        if values is None:
+            return None
+        # Stamped with the version read before the query, so a save that lands
+        # in between makes this entry stale instead of overwriting fresh data
+        cache.set(key, (version, values), _user_ttl())
+
+    return CustomUsers.from_db('default', CACHED_FIELDS, values)
+
+def invalidate_cached_user(user_id):
+    version_key = USER_VERSION_KEY.format(user_id)
+    cache.add(version_key, 0, None)
+    cache.incr(version_key)
+    cache.delete(USER_KEY.format(user_id))
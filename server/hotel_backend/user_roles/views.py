@@ -7,12 +7,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import CustomUsers, Notification
 from .serializers import CustomUserSerializer, NotificationSerializer
-from .email.email import send_otp_to_email, send_reset_password
+from .email.email import send_otp_to_email, send_reset_password, issue_otp
+from .presence import should_fan_out
+from .notification_counters import get_unread_count, adjust_unread_count, set_unread_count
+from .inbox import booking_dedupe_key, upsert_booking_notification
 from django.core.cache import cache
 from .validation.validation import RegistrationForm
 from datetime import timedelta
 from booking.models import Bookings
 from booking.serializers import BookingSerializer
+from admin_dashboard.service.image_processing import normalize_upload
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from property.serializers import AreaSerializer
 from .google.oauth import google_auth as google_oauth_util
@@ -62,11 +66,14 @@ def create_notification(user, booking, notification_type):
         if not message:
             return None
             
-        notification = Notification.objects.create(
+        notification, _ = Notification.objects.get_or_create(
             user=user,
-            message=message,
-            notification_type=notification_type,
-            booking=booking
+            dedupe_key=booking_dedupe_key(booking.id, notification_type),
+            defaults={
+                'message': message,
+                'notification_type': notification_type,
+                'booking': booking,
+            }
         )
         
         return notification
@@ -86,13 +93,15 @@ def create_booking_notification(user, notification_type, booking_id, message):
         if clean_type not in valid_types:
             clean_type = 'reserved'
         
-        notification = Notification.objects.create(
-            user=user,
-            message=message,
-            notification_type=clean_type,
-            booking=booking
+        # Upgrades the generic row the booking signal wrote for this transition
+        notification, created = upsert_booking_notification(
+            user, booking, booking.status, clean_type, message
         )
         
+        # New rows are pushed by the Notification post_save signal
+        if created or not should_fan_out(user.id):
+            return notification
+
         try:
             channel_layer = get_channel_layer()
             notification_data = NotificationSerializer(notification).data
@@ -102,7 +111,7 @@ def create_booking_notification(user, notification_type, booking_id, message):
                 {
                     "type": "send_notification",
                     "notification": notification_data,
-                    "unread_count": Notification.objects.filter(user=user, is_read=False).count()
+                    "unread_count": get_unread_count(user.id)
                 }
             )
             
@@ -197,7 +206,7 @@ def send_register_otp(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         message = "Your OTP for account verification"
-        otp_generated = send_otp_to_email(email, message)
+        otp_generated = issue_otp(email, purpose, send_otp_to_email, message)
         
         if otp_generated is None:
             return Response({
@@ -206,9 +215,6 @@ def send_register_otp(request):
                 }
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        OTP_EXPIRATION_TIME = 120
-        cache.set(cache_key, otp_generated, OTP_EXPIRATION_TIME)
-        
         return Response({
             "success": "OTP sent for account verification",
             'otp': otp_generated
@@ -323,18 +329,14 @@ def resend_otp(request):
             }, status=status.HTTP_400_BAD_REQUEST)
             
         purpose = "account_verification"
-        cache_key = f"{email}_{purpose}"
         
-        cached_otp = cache.get(cache_key)
-        if cached_otp:
-            otp_to_send = cached_otp
-        else:
-            otp_to_send = send_otp_to_email(email, "Your OTP for account verification")
-            if otp_to_send is None:
-                return Response({
-                    "error": "An error occurred while resending the OTP. Please try again later."
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            cache.set(cache_key, otp_to_send, timeout=120)
+        otp_to_send = issue_otp(
+            email, purpose, send_otp_to_email, "Your OTP for account verification", reuse_existing=True
+        )
+        if otp_to_send is None:
+            return Response({
+                "error": "An error occurred while resending the OTP. Please try again later."
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
         return Response({
             "message": "OTP resent successfully",
@@ -357,16 +359,12 @@ def forgot_password(request):
                 "error": "User does not exist"
             }, status=status.HTTP_404_NOT_FOUND)
         
-        otp = send_reset_password(email)
+        otp = issue_otp(email, "reset_password", send_reset_password)
         if otp is None:
             return Response({
                 "error": "An error occurred while sending the OTP. Please try again later."
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        purpose = "reset_password"
-        cache_key = f"{email}_{purpose}"
-        cache.set(cache_key, otp, timeout=120)
-        
         return Response({
             "message": "OTP sent successfully",
         }, status=status.HTTP_200_OK)
@@ -556,13 +554,9 @@ def google_auth(request):
             return response
         else:
             purpose = "google_account_verification"
-            cache_key = f"{email}_{purpose}"
-            
-            if cache.get(cache_key):
-                cache.delete(cache_key)
             
             message = "Your OTP for Google account verification"
-            otp_generated = send_otp_to_email(email, message)
+            otp_generated = issue_otp(email, purpose, send_otp_to_email, message)
             
             if otp_generated is None:
                 return Response({
@@ -570,7 +564,6 @@ def google_auth(request):
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
             OTP_EXPIRATION_TIME = 120
-            cache.set(cache_key, otp_generated, OTP_EXPIRATION_TIME)
             
             temp_password = str(uuid.uuid4())
             
@@ -847,8 +840,8 @@ def upload_valid_id(request):
             }, status=status.HTTP_400_BAD_REQUEST)
             
         user.valid_id_type = id_type
-        user.valid_id_front = front_id
-        user.valid_id_back = back_id
+        user.valid_id_front = normalize_upload(front_id)
+        user.valid_id_back = normalize_upload(back_id)
         user.is_verified = 'pending'
         user.save()
         
@@ -876,7 +869,7 @@ def get_notifications(request):
         serializer = NotificationSerializer(notifications, many=True)
         return Response({
             'notifications': serializer.data,
-            'unread_count': all_notifications.filter(is_read=False).count(),
+            'unread_count': get_unread_count(request.user.id),
             'has_more': all_notifications.count() > (offset + limit)
         }, status=status.HTTP_200_OK)
     except Exception as e:
@@ -884,21 +877,37 @@ def get_notifications(request):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_unread_notification_count(request):
+    try:
+        return Response({
+            'unread_count': get_unread_count(request.user.id)
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
 def mark_notification_read(request, id):
-    notification = get_object_or_404(Notification, id=id, user=request.user)
-    notification.is_read = True
-    notification.save()
+    # Conditional update, so concurrent requests only decrement the counter once
+    updated = Notification.objects.filter(id=id, user=request.user, is_read=False).update(is_read=True)
+    if updated:
+        adjust_unread_count(request.user.id, -1)
+    else:
+        get_object_or_404(Notification, id=id, user=request.user)
     
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f"notifications_{request.user.id}",
-        {
-            'type': 'update_unread_count',
-            'count': Notification.objects.filter(user=request.user, is_read=False).count()
-        }
-    )
+    if should_fan_out(request.user.id, 'update_unread_count'):
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            f"notifications_{request.user.id}",
+            {
+                'type': 'update_unread_count',
+                'count': get_unread_count(request.user.id)
+            }
+        )
     
     return Response({
         'message': 'Notification marked as read'
@@ -909,15 +918,17 @@ def mark_notification_read(request, id):
 def mark_all_notifications_read(request):
     try:
         Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        set_unread_count(request.user.id, 0)
         
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"notifications_{request.user.id}",
-            {
-                'type': 'update_unread_count',
-                'count': 0
-            }
-        )
+        if should_fan_out(request.user.id, 'update_unread_count'):
+            channel_layer = get_channel_layer()
+            async_to_sync(channel_layer.group_send)(
+                f"notifications_{request.user.id}",
+                {
+                    'type': 'update_unread_count',
+                    'count': 0
+                }
+            )
         return Response({
             'message': 'All notifications marked as read'
         }, status=status.HTTP_200_OK)